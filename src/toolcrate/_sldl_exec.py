@@ -0,0 +1,146 @@
+"""Run slsk-batchdl commands inside the sldl Docker container.
+
+Shared by the queue and wishlist processors. Commands go through the Docker SDK
+when it is installed and the daemon is reachable, and through the docker CLI
+otherwise; either way their output is logged line by line as it arrives.
+"""
+
+import codecs
+import functools
+import os
+import re
+import subprocess
+import threading
+from collections import deque
+
+# Name of the slsk-batchdl container that sldl commands are executed in
+SLDL_CONTAINER = "sldl"
+# Lines of sldl output kept for the error log when a command fails
+_OUTPUT_TAIL_LINES = 200
+# Bytes requested per read from the docker CLI's output pipe
+_PIPE_READ_SIZE = 64 * 1024
+# Log format of each sldl output line: the entry, then the line itself
+OUTPUT_LOG_FORMAT = "[%s] %s"
+# Line breaks as split by universal newlines; sldl redraws progress with a bare \r
+_LINE_BREAK_RE = re.compile(r'\r\n?|\n')
+
+
+def iter_lines(chunks):
+    """Re-split a stream of raw byte chunks into decoded text lines.
+
+    Lines end at \r\n, \r or \n, as with a pipe read in text mode.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        # A trailing \r may be the first half of a \r\n split across chunks
+        held = pending.endswith('\r')
+        *lines, pending = _LINE_BREAK_RE.split(pending[:-1] if held else pending)
+        yield from lines
+        if held:
+            pending += '\r'
+    pending += decoder.decode(b'', final=True)
+    *lines, pending = _LINE_BREAK_RE.split(pending)
+    yield from lines
+    if pending:
+        yield pending
+
+
+def pump_output(lines, entry: str, tail: deque, log):
+    """Log sldl output as it arrives, keeping only a bounded tail.
+
+    Args:
+        lines: Iterable of output lines
+        entry: Entry the output belongs to
+        tail: Bounded deque collecting the most recent lines
+        log: Logger the output lines are written to
+    """
+    for line in lines:
+        line = line.rstrip('\r\n')
+        tail.append(line)
+        log.info(OUTPUT_LOG_FORMAT, entry, line)
+
+
+def connect_sldl_container(client_timeout: float | None, log):
+    """Connect to the sldl container through the Docker SDK.
+
+    Args:
+        client_timeout: Docker API client timeout in seconds, or None for no limit.
+            exec output is read from the API socket until the command exits, so
+            this must outlast the longest command the caller will run.
+        log: Logger for connection diagnostics
+
+    Returns:
+        Tuple of (client, container), or (None, None) if the docker SDK is not
+        installed or the daemon/container cannot be reached. Callers then fall
+        back to the docker CLI.
+    """
+    try:
+        import docker
+    except ImportError:
+        log.debug("docker SDK not installed, using the docker CLI")
+        return None, None
+
+    client = None
+    try:
+        client = docker.from_env(timeout=client_timeout)
+        return client, client.containers.get(SLDL_CONTAINER)
+    except docker.errors.DockerException as e:
+        log.debug("Could not reach %s container via docker SDK, using the docker CLI: %s", SLDL_CONTAINER, e)
+        if client is not None:
+            client.close()
+        return None, None
+
+
+def exec_sldl(container, docker_prefix: list[str], cmd: list[str], entry: str,
+              timeout: float, log) -> tuple[int, deque]:
+    """Run an sldl command inside the sldl container, streaming its output.
+
+    Args:
+        container: Docker SDK container from connect_sldl_container, or None to
+            run the command through the docker CLI
+        docker_prefix: docker CLI arguments placed before cmd
+        cmd: sldl command arguments
+        entry: Entry being processed, used to label the output
+        timeout: Seconds to wait for the command
+        log: Logger the output lines are written to
+
+    Returns:
+        Tuple of (return code, last lines of combined stdout/stderr)
+
+    Raises:
+        subprocess.TimeoutExpired: If the command ran longer than the timeout
+    """
+    tail = deque(maxlen=_OUTPUT_TAIL_LINES)
+    if container is None:
+        proc = subprocess.Popen(
+            docker_prefix + cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0
+        )
+        # Drain the pipe on a helper thread so the timeout can be enforced here.
+        # Large raw reads are split into lines in one pass instead of line by line.
+        chunks = iter(functools.partial(os.read, proc.stdout.fileno(), _PIPE_READ_SIZE), b'')
+        reader = threading.Thread(target=pump_output, args=(iter_lines(chunks), entry, tail, log), daemon=True)
+        reader.start()
+        try:
+            return proc.wait(timeout=timeout), tail
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            reader.join()
+            proc.stdout.close()
+
+    # The exec API has no timeout of its own, so enforce it inside the container
+    api = container.client.api
+    exec_id = api.exec_create(container.id, ["timeout", str(timeout)] + cmd)['Id']
+    pump_output(iter_lines(api.exec_start(exec_id, stream=True)), entry, tail, log)
+    exit_code = api.exec_inspect(exec_id)['ExitCode']
+    if exit_code == 124:
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return exit_code, tail
@@ -189,6 +189,8 @@ def run(ctx):
             click.echo("❌ Queue processing is disabled in configuration")
         elif results['status'] == 'locked':
             click.echo("🔒 Queue processing is already running")
+        elif results['status'] == 'docker_unavailable':
+            click.echo("🐳 The sldl container is not running - start it and try again")
 
     except Exception as e:
         logger.error(f"Error processing queue: {e}")
@@ -232,7 +234,7 @@ def status(ctx):
             click.echo("Current entries: 0 (queue file not found)")
 
         # Check lock status
-        if processor.lock_file_path.exists():
+        if processor.is_locked():
             click.echo()
             click.echo("🔒 Queue processing lock is active")
             try:
@@ -3,9 +3,9 @@
 
 import builtins
 import logging
-import os
 import subprocess
 import tempfile
+from pathlib import Path
 from typing import Any
 
 import click
@@ -33,12 +33,17 @@ def get_current_crontab() -> str:
 def update_crontab(content: str) -> bool:
     """Update the user's crontab with new content."""
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.cron', delete=False) as f:
-            f.write(content)
-            temp_file = f.name
-
-        result = subprocess.run(['crontab', temp_file], capture_output=True, text=True)
-        os.unlink(temp_file)
+        temp_file = None
+        try:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.cron', delete=False) as f:
+                temp_file = f.name
+                f.write(content)
+
+            result = subprocess.run(['crontab', temp_file], capture_output=True, text=True)
+        finally:
+            # Clean up even when writing the file or running crontab fails
+            if temp_file:
+                Path(temp_file).unlink(missing_ok=True)
 
         if result.returncode == 0:
             return True
@@ -836,7 +841,7 @@ def test(ctx):
         click.echo("🧪 Testing wishlist processing...")
 
         processor = WishlistProcessor(config_manager)
-        results = processor.process_all_entries()
+        results = processor.process_all_entries(verbose_results=True)
 
         click.echo()
         click.echo(f"Test Results: {results['status']}")
@@ -904,6 +909,8 @@ def test_queue(ctx):
             click.echo("💡 Use: toolcrate queue add <link>")
         elif results['status'] == 'locked':
             click.echo("🔒 Queue processing is already running")
+        elif results['status'] == 'docker_unavailable':
+            click.echo("🐳 The sldl container is not running - start it and try again")
 
     except Exception as e:
         logger.error(f"Error testing queue processing: {e}")
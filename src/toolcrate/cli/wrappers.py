@@ -27,10 +27,11 @@ def check_dependency(name, binary_name=None):
 def check_docker_image(image_name):
     """Check if a Docker image is available."""
     try:
+        # Only the exit code matters; discard the (large) JSON description
         result = subprocess.run(
             ["docker", "image", "inspect", image_name],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             check=False,
         )
         return result.returncode == 0
@@ -151,7 +152,8 @@ def recreate_slsk_container(root_dir):
         os.chdir(slsk_dir)
 
         # Stop and remove existing containers
-        subprocess.run(["docker", "compose", "down"], check=False, capture_output=True)
+        subprocess.run(["docker", "compose", "down"], check=False,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
         # Start the container
         subprocess.run(["docker", "compose", "up", "-d"], check=True)
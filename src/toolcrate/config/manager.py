@@ -7,45 +7,297 @@ configuration files for integrated tools.
 """
 
 import argparse
+import copy
+import functools
+import io
 import os
+import re
 import sys
+import tempfile
+from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
 # Check if we're in a virtual environment (Poetry or manual)
-# Skip this check in Docker containers or when TOOLCRATE_SKIP_VENV_CHECK is set
-skip_venv_check = (
+# Skip this check in Docker containers or when TOOLCRATE_SKIP_VENV_CHECK is set.
+# An active VIRTUAL_ENV satisfies it outright. Cheap environment lookups run first; the argv/sys.modules and filesystem
+# probes only run when none of them decided the question.
+_SKIP_VENV_CHECK = bool(
+    os.environ.get('VIRTUAL_ENV') or
     os.environ.get('TOOLCRATE_SKIP_VENV_CHECK') or
     os.environ.get('TOOLCRATE_TESTING') or
     os.environ.get('PYTEST_CURRENT_TEST') or
+    os.environ.get('CONTAINER') or   # Generic container indicator
+    os.environ.get('DOCKER_CONTAINER') or  # Another container indicator
     'pytest' in sys.modules or
     'test' in sys.argv[0].lower() or
-    os.path.exists('/.dockerenv') or  # Docker container indicator
-    os.environ.get('CONTAINER') or   # Generic container indicator
-    os.environ.get('DOCKER_CONTAINER')  # Another container indicator
+    os.path.exists('/.dockerenv')  # Docker container indicator
 )
 
-if not skip_venv_check:
-    in_venv = os.environ.get('VIRTUAL_ENV')
-    if not in_venv:
-        print("❌ Virtual environment not active!")
-        print("Please use one of these methods:")
-        print("  uv run python config_manager.py <command>")
-        print("  source .venv/bin/activate && python config_manager.py <command>")
-        print("  make config-<command>")
+if not _SKIP_VENV_CHECK:
+    print("❌ Virtual environment not active!")
+    print("Please use one of these methods:")
+    print("  uv run python config_manager.py <command>")
+    print("  source .venv/bin/activate && python config_manager.py <command>")
+    print("  make config-<command>")
+    sys.exit(1)
+
+
+def _import_yaml():
+    """Import PyYAML on first use.
+
+    Commands that never read or write YAML (e.g. ``--help``) skip loading
+    the libyaml bindings entirely.
+    """
+    try:
+        import yaml
+    except ImportError:
+        print("❌ PyYAML not installed in virtual environment.")
+        print("Install with: pip install PyYAML")
         sys.exit(1)
+    return yaml
 
-try:
-    import yaml
-except ImportError:
-    print("❌ PyYAML not installed in virtual environment.")
-    print("Install with: pip install PyYAML")
-    sys.exit(1)
+
+@functools.cache
+def _round_trip_yaml():
+    """Return a ruamel.yaml round-trip instance matching toolcrate.yaml's layout."""
+    from ruamel.yaml import YAML
+
+    rt_yaml = YAML(typ='rt')
+    rt_yaml.preserve_quotes = True
+    rt_yaml.indent(mapping=2, sequence=4, offset=2)
+    rt_yaml.width = 4096
+    return rt_yaml
+
+
+@functools.lru_cache(maxsize=256)
+def _to_container_path(path_value: str) -> str:
+    """Map a host path to its location inside the Docker container.
+
+    Cached at module scope: the main and wishlist generators convert the same
+    paths, often back-to-back in one process.
+    """
+    # Map host toolcrate paths to container mount points
+    if 'toolcrate/data' in path_value:
+        return '/data' + path_value.split('toolcrate/data')[1]
+    if 'toolcrate/logs' in path_value:
+        return '/data' + path_value.split('toolcrate/logs')[1]
+    if path_value.startswith('/data') or path_value.startswith('/config'):
+        return path_value
+    # Unknown host path — put it under /data using the last path component
+    return '/data/' + path_value.split('/')[-1]
+
+
+def _safe_loader(yaml):
+    """Return libyaml's CSafeLoader when PyYAML was built with it, else SafeLoader."""
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _safe_dumper(yaml):
+    """Return libyaml's CSafeDumper when PyYAML was built with it, else SafeDumper."""
+    return getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+# Generated files are built from many small writes; a large buffer lets them
+# reach the disk in a single flush.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _open_output(path: Path):
+    """Open path for streaming text output through a large write buffer.
+
+    Writes go straight into the binary buffer and are never joined into one
+    string first, so memory stays constant however many profiles are emitted.
+    """
+    return open(path, 'w', encoding='utf-8', newline='\n', buffering=_WRITE_BUFFER_SIZE)
+
+
+def _replace_file(path: Path, data: bytes):
+    """Atomically replace path's contents with data.
+
+    The bytes go to a temp file next to path, which is then swapped in with
+    os.replace, so a crash never leaves a truncated or half-written file.
+    """
+    path = Path(path)
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile('wb', dir=path.parent, delete=False, prefix=f'.{path.name}.') as tmp:
+            tmp_path = tmp.name
+            tmp.write(data)
+        # NamedTemporaryFile is created 0600; keep the file's own permissions
+        try:
+            os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+        tmp_path = None
+    finally:
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+
+
+# Matches the "- <host_path>:/config" and "- <host_path>:/data" volume lines
+_MOUNT_RE = re.compile(r'^\s*-\s*(.+?):/(config|data)\s*$', re.MULTILINE)
+
+# yaml key -> sldl.conf key tables shared by the main and wishlist generators
+_SLDL_DIR_MAPPINGS = {
+    'parent_dir': 'path',
+    'skip_music_dir': 'skip-music-dir',
+    'index_file_path': 'index-path',
+    'm3u_file_path': 'playlist-path',
+    'failed_album_path': 'failed-album-path',
+    'log_file_path': 'log-file'
+}
+
+# The wishlist sets its own download path and index location
+_WISHLIST_DIR_MAPPINGS = {
+    yaml_key: conf_key for yaml_key, conf_key in _SLDL_DIR_MAPPINGS.items()
+    if yaml_key not in ('parent_dir', 'index_file_path')
+}
+
+_SLDL_PREF_MAPPINGS = {
+    'min_bitrate': 'pref-min-bitrate',
+    'max_bitrate': 'pref-max-bitrate',
+    'max_sample_rate': 'pref-max-samplerate',
+    'length_tolerance': 'pref-length-tol'
+}
+
+_SLDL_STRICT_MAPPINGS = {
+    'strict_title': 'strict-title',
+    'strict_album': 'strict-album'
+}
+
+_WISHLIST_STRICT_MAPPINGS = {
+    'strict_title': 'pref-strict-title',
+    'strict_album': 'pref-strict-album'
+}
+
+_SLDL_SEARCH_MAPPINGS = {
+    'concurrent_processes': 'concurrent-downloads',
+    'search_timeout': 'search-timeout',
+    'listen_port': 'listen-port',
+    'max_stale_time': 'max-stale-time',
+    'searches_per_time': 'searches-per-time',
+    'search_renew_time': 'searches-renew-time',
+    'min_shares_aggregate': 'min-shares-aggregate',
+    'aggregate_length_tol': 'aggregate-length-tol'
+}
+
+_WISHLIST_SEARCH_MAPPINGS = {
+    **_SLDL_SEARCH_MAPPINGS,
+    'max_retries_per_track': 'max-retries',
+    'unknown_error_retries': 'unknown-error-retries'
+}
+
+_SLDL_BOOL_MAPPINGS = {
+    'fast_search': 'fast-search',
+    'interactive_mode': 'interactive',
+    'remove_tracks_from_source': 'remove-from-source',
+    'desperate_search': 'desperate',
+    'album': 'album',
+    'aggregate': 'aggregate',
+    'album_art_only': 'album-art-only',
+    'artist_maybe_wrong': 'artist-maybe-wrong',
+    'yt_parse': 'yt-parse',
+    'remove_ft': 'remove-ft',
+    'reverse': 'reverse',
+    'use_ytdlp': 'yt-dlp',
+    'get_deleted': 'get-deleted',
+    'deleted_only': 'deleted-only',
+    'no_browse_folder': 'no-browse-folder',
+    'no_progress': 'no-progress',
+    'write_playlist': 'write-playlist'
+}
+
+_WISHLIST_BOOL_MAPPINGS = {
+    'skip_existing': 'skip-existing',
+    'write_index': 'write-index',
+    'interactive_mode': 'interactive',
+    'remove_tracks_from_source': 'remove-from-source',
+    'desperate_search': 'desperate',
+    'fast_search': 'fast-search',
+    'use_ytdlp': 'yt-dlp',
+    'skip_check_pref_cond': 'skip-check-pref-cond'
+}
+
+_SLDL_STRING_MAPPINGS = {
+    'ytdlp_argument': 'yt-dlp-argument',
+    'parse_title_template': 'parse-title-template'
+}
+
+_DOCKER_COMPOSE_TEMPLATE = """\
+# Docker Compose configuration for ToolCrate
+# Generated from toolcrate.yaml on {ts}
+#
+# Mount paths: {config_mount} → /config, {data_mount} → /data
+# Run from project root directory when using relative paths
+
+services:
+  toolcrate:
+    build:
+      context: ..
+      dockerfile: Dockerfile
+    image: toolcrate:latest
+    container_name: toolcrate
+    environment:
+      - TZ={tz}
+      - PUID={puid}
+      - PGID={pgid}
+      - PYTHONPATH=/app/src
+      - PYTHONUNBUFFERED=1
+    volumes:
+      - {config_mount}:/config
+      - {data_mount}:/data
+    restart: unless-stopped
+    networks:
+      - toolcrate-network
+    working_dir: /app
+    command: ["tail", "-f", "/dev/null"]
+
+  sldl:
+    build:
+      context: ../src/slsk-batchdl
+      dockerfile: Dockerfile
+    image: slsk-batchdl:latest
+    container_name: sldl
+    environment:
+      - TZ={tz}
+      - PUID={puid}
+      - PGID={pgid}
+    volumes:
+      - {config_mount}:/config
+      - {data_mount}:/data
+    restart: unless-stopped
+    networks:
+      - toolcrate-network
+
+networks:
+  toolcrate-network:
+    driver: bridge
+
+volumes:
+  config:
+    driver: local
+    driver_opts:
+      type: none
+      o: bind
+      device: {config_mount}
+  data:
+    driver: local
+    driver_opts:
+      type: none
+      o: bind
+      device: {data_mount}
+"""
 
 
 class ConfigManager:
     """Manages ToolCrate configuration files."""
 
+    # Parsed configs shared by every instance in the process, keyed by path and
+    # validated against the file's (st_mtime_ns, st_size) on each load.
+    _parsed_cache: dict[str, tuple[int, int, dict[str, Any]]] = {}
+
     def __init__(self, config_path: str = "config/toolcrate.yaml"):
         # Import here to avoid circular imports
         from ..cli.wrappers import get_project_root
@@ -71,11 +323,27 @@ class ConfigManager:
             pass
 
     def load_config(self) -> dict[str, Any]:
-        """Load the YAML configuration."""
+        """Load the YAML configuration.
+
+        Repeated loads of an unchanged file are served from an in-process cache
+        (checked with a single stat); callers always get their own copy.
+        """
+        cache_key = str(self.config_path)
         try:
-            with open(self.config_path) as f:
-                self.config = yaml.safe_load(f)
+            st = os.stat(self.config_path)
+        except FileNotFoundError:
+            print(f"❌ Configuration file not found: {self.config_path}")
+            sys.exit(1)
+
+        cached = self._parsed_cache.get(cache_key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            self.config = copy.deepcopy(cached[2])
             return self.config
+
+        yaml = _import_yaml()
+        try:
+            with open(self.config_path, encoding='utf-8') as f:
+                self.config = yaml.load(f, Loader=_safe_loader(yaml))
         except FileNotFoundError:
             print(f"❌ Configuration file not found: {self.config_path}")
             sys.exit(1)
@@ -83,6 +351,13 @@ class ConfigManager:
             print(f"❌ YAML parsing error: {e}")
             sys.exit(1)
 
+        self._parsed_cache[cache_key] = (st.st_mtime_ns, st.st_size, copy.deepcopy(self.config))
+        return self.config
+
+    def _invalidate_cache(self):
+        """Forget the cached parse after writing the config file ourselves."""
+        self._parsed_cache.pop(str(self.config_path), None)
+
     def save_config(self):
         """Save the YAML configuration.
 
@@ -96,34 +371,34 @@ class ConfigManager:
             UserWarning, stacklevel=2
         )
 
-        with open(self.config_path, 'w') as f:
-            yaml.dump(self.config, f, default_flow_style=False, indent=2)
+        yaml = _import_yaml()
+        # Emit into memory with the C dumper and hit the disk with a single write
+        data = yaml.dump(self.config, Dumper=_safe_dumper(yaml), encoding='utf-8',
+                         default_flow_style=False, indent=2)
+        self.config_path.write_bytes(data)
+        self._invalidate_cache()
         print(f"✅ Configuration saved to {self.config_path}")
         print("⚠️  Note: YAML formatting and comments may have been lost.")
 
     def update_cron_section(self, cron_config):
         """Update just the cron section in the YAML file while preserving formatting.
 
-        This is a safer alternative to save_config() for cron updates.
+        This is a safer alternative to save_config() for cron updates. The file
+        is edited with ruamel.yaml's round-trip mode, so comments, key order and
+        quoting elsewhere in the file survive.
         """
-        import re
-
         try:
-            with open(self.config_path) as f:
-                content = f.read()
-
-            # Find the cron section and replace it
-            cron_yaml = yaml.dump({'cron': cron_config}, default_flow_style=False, indent=2)
-            cron_section = cron_yaml.replace('cron:\n', '').rstrip()
-
-            # Use regex to replace the cron section
-            pattern = r'^cron:\s*\n((?:  .*\n)*)'
-            replacement = f'cron:\n{cron_section}\n'
+            rt_yaml = _round_trip_yaml()
+            with open(self.config_path, encoding='utf-8') as f:
+                data = rt_yaml.load(f)
 
-            new_content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
+            data['cron'] = cron_config
 
-            with open(self.config_path, 'w') as f:
-                f.write(new_content)
+            # Render fully in memory first so a failing dump never truncates the file
+            buf = io.StringIO()
+            rt_yaml.dump(data, buf)
+            _replace_file(self.config_path, buf.getvalue().encode('utf-8'))
+            self._invalidate_cache()
 
             # Update our in-memory config
             self.config['cron'] = cron_config
@@ -131,186 +406,85 @@ class ConfigManager:
             print(f"✅ Updated cron section in {self.config_path}")
 
         except Exception as e:
+            # A dump that raises leaves ruamel's emitter half-built, and the shared
+            # instance would render every later document as an empty string
+            _round_trip_yaml.cache_clear()
             print(f"⚠️  Could not update cron section safely: {e}")
             print("💡 Falling back to full config save...")
+            # Never save an unloaded (empty) config over the file
+            if not self.config:
+                self.load_config()
+            self.config['cron'] = cron_config
             self.save_config()
 
+    def _is_up_to_date(self, output_path: Path, marker: str | None = None) -> bool:
+        """Return True if output_path was written after the YAML config was last modified.
+
+        When ``marker`` is given, the file's header must also contain it, so outputs
+        that depend on more than the YAML (e.g. Docker vs native paths) get rebuilt.
+        """
+        try:
+            if output_path.stat().st_mtime_ns <= self.config_path.stat().st_mtime_ns:
+                return False
+        except FileNotFoundError:
+            return False
+
+        if marker is None:
+            return True
+        with open(output_path, encoding='utf-8') as f:
+            header = [f.readline() for _ in range(4)]
+        return marker in header
+
     @staticmethod
     def _resolve_path(path_value: str, docker_mode: bool) -> str:
         """Return path_value unchanged (native) or converted to a container path (Docker)."""
         if not docker_mode:
             return path_value
-        # Docker: map host toolcrate paths to container mount points
-        if 'toolcrate/data' in path_value:
-            return '/data' + path_value.split('toolcrate/data')[1]
-        if 'toolcrate/logs' in path_value:
-            return '/data' + path_value.split('toolcrate/logs')[1]
-        if path_value.startswith('/data') or path_value.startswith('/config'):
-            return path_value
-        # Unknown host path — put it under /data using the last path component
-        return '/data/' + path_value.split('/')[-1]
+        return _to_container_path(path_value)
 
-    def generate_sldl_conf(self):
-        """Generate sldl.conf from YAML configuration."""
-        if not self.config:
-            self.load_config()
+    def generate_sldl_conf(self, force: bool = False):
+        """Generate sldl.conf from YAML configuration.
 
+        Generation is skipped when sldl.conf is newer than toolcrate.yaml,
+        unless ``force`` is set.
+        """
         docker_mode = bool(os.environ.get('TOOLCRATE_USE_DOCKER'))
-
-        slsk_config = self.config.get('slsk_batchdl', {})
-        spotify_config = self.config.get('spotify', {})
-        youtube_config = self.config.get('youtube', {})
+        path_mode = f"# Path mode: {'docker' if docker_mode else 'native'}\n"
 
         sldl_conf_path = self.config_dir / "sldl.conf"
 
-        with open(sldl_conf_path, 'w') as f:
-            f.write("# sldl.conf - Generated from toolcrate.yaml\n")
-            f.write("# This file is automatically generated. Edit toolcrate.yaml instead.\n\n")
-
-            # Authentication
-            if slsk_config.get('username'):
-                f.write(f"username = {slsk_config['username']}\n")
-            if slsk_config.get('password'):
-                f.write(f"password = {slsk_config['password']}\n")
-            f.write("\n")
-
-            # Directories
-            dir_mappings = {
-                'parent_dir': 'path',
-                'skip_music_dir': 'skip-music-dir',
-                'index_file_path': 'index-path',
-                'm3u_file_path': 'playlist-path',
-                'failed_album_path': 'failed-album-path',
-                'log_file_path': 'log-file'
-            }
-
-            for yaml_key, conf_key in dir_mappings.items():
-                if slsk_config.get(yaml_key):
-                    path_value = slsk_config[yaml_key]
-                    if isinstance(path_value, str):
-                        f.write(f"{conf_key} = {self._resolve_path(path_value, docker_mode)}\n")
-                    else:
-                        f.write(f"{conf_key} = {path_value}\n")
-            f.write("\n")
-
-            # Preferred conditions
-            pref_cond = slsk_config.get('preferred_conditions', {})
-            if pref_cond.get('formats'):
-                formats = ','.join(pref_cond['formats'])
-                f.write(f"pref-format = {formats}\n")
-
-            pref_mappings = {
-                'min_bitrate': 'pref-min-bitrate',
-                'max_bitrate': 'pref-max-bitrate',
-                'max_sample_rate': 'pref-max-samplerate',
-                'length_tolerance': 'pref-length-tol'
-            }
-
-            for yaml_key, conf_key in pref_mappings.items():
-                if pref_cond.get(yaml_key) is not None:
-                    f.write(f"{conf_key} = {pref_cond[yaml_key]}\n")
-
-            if pref_cond.get('strict_title'):
-                f.write("strict-title = true\n")
-            if pref_cond.get('strict_album'):
-                f.write("strict-album = true\n")
-            f.write("\n")
-
-            # Search and download settings
-            search_mappings = {
-                'concurrent_processes': 'concurrent-downloads',
-                'search_timeout': 'search-timeout',
-                'listen_port': 'listen-port',
-                'max_stale_time': 'max-stale-time',
-                'searches_per_time': 'searches-per-time',
-                'search_renew_time': 'searches-renew-time',
-                'min_shares_aggregate': 'min-shares-aggregate',
-                'aggregate_length_tol': 'aggregate-length-tol'
-            }
+        if not force and self._is_up_to_date(sldl_conf_path, path_mode):
+            print(f"✅ {sldl_conf_path.name} already up to date")
+            return
 
-            for yaml_key, conf_key in search_mappings.items():
-                if slsk_config.get(yaml_key) is not None:
-                    f.write(f"{conf_key} = {slsk_config[yaml_key]}\n")
-
-            # Boolean flags (using inverted logic for skip/write flags)
-            bool_mappings = {
-                'fast_search': 'fast-search',
-                'interactive_mode': 'interactive',
-                'remove_tracks_from_source': 'remove-from-source',
-                'desperate_search': 'desperate',
-                'album': 'album',
-                'aggregate': 'aggregate',
-                'album_art_only': 'album-art-only',
-                'artist_maybe_wrong': 'artist-maybe-wrong',
-                'yt_parse': 'yt-parse',
-                'remove_ft': 'remove-ft',
-                'reverse': 'reverse',
-                'use_ytdlp': 'yt-dlp',
-                'get_deleted': 'get-deleted',
-                'deleted_only': 'deleted-only',
-                'no_browse_folder': 'no-browse-folder',
-                'no_progress': 'no-progress',
-                'write_playlist': 'write-playlist'
-            }
-
-            for yaml_key, conf_key in bool_mappings.items():
-                if slsk_config.get(yaml_key) is True:
-                    f.write(f"{conf_key} = true\n")
-
-            # Handle inverted boolean flags
-            if not slsk_config.get('skip_existing', True):
-                f.write("no-skip-existing = true\n")
-            if not slsk_config.get('write_index', True):
-                f.write("no-write-index = true\n")
-            f.write("\n")
+        if not self.config:
+            self.load_config()
 
-            # String settings (only write non-empty values)
-            string_mappings = {
-                'ytdlp_argument': 'yt-dlp-argument',
-                'parse_title_template': 'parse-title-template'
-            }
+        self._emit_sldl_conf(
+            sldl_conf_path,
+            title="sldl.conf - Generated from toolcrate.yaml",
+            path_mode=path_mode,
+            docker_mode=docker_mode,
+            merged_config=self.config.get('slsk_batchdl', {}),
+        )
 
-            for yaml_key, conf_key in string_mappings.items():
-                value = slsk_config.get(yaml_key)
-                if value and str(value).strip():
-                    f.write(f"{conf_key} = {value}\n")
+        print(f"✅ Generated sldl.conf at {sldl_conf_path}")
 
-            # API credentials
-            if spotify_config.get('client_id'):
-                f.write(f"spotify-id = {spotify_config['client_id']}\n")
-            if spotify_config.get('client_secret'):
-                f.write(f"spotify-secret = {spotify_config['client_secret']}\n")
-            if youtube_config.get('api_key'):
-                f.write(f"youtube-key = {youtube_config['api_key']}\n")
-            f.write("\n")
+    def generate_wishlist_sldl_conf(self, force: bool = False):
+        """Generate a wishlist-specific sldl.conf from YAML configuration.
 
-            # Profiles
-            profiles = self.config.get('profiles', {})
-            for profile_name, profile_config in profiles.items():
-                f.write(f"[{profile_name}]\n")
-                profile_settings = profile_config.get('settings', {})
-
-                # Handle profile-specific settings
-                if 'preferred_conditions' in profile_settings:
-                    pref = profile_settings['preferred_conditions']
-                    if pref.get('formats'):
-                        formats = ','.join(pref['formats'])
-                        f.write(f"pref-format = {formats}\n")
-                    for yaml_key, conf_key in pref_mappings.items():
-                        if pref.get(yaml_key) is not None:
-                            f.write(f"{conf_key} = {pref[yaml_key]}\n")
-
-                # Handle other profile settings
-                for yaml_key, conf_key in bool_mappings.items():
-                    if profile_settings.get(yaml_key) is True:
-                        f.write(f"{conf_key} = true\n")
+        Generation is skipped when sldl-wishlist.conf is newer than toolcrate.yaml,
+        unless ``force`` is set.
+        """
+        docker_mode = bool(os.environ.get('TOOLCRATE_USE_DOCKER'))
+        path_mode = f"# Path mode: {'docker' if docker_mode else 'native'}\n"
 
-                f.write("\n")
+        sldl_conf_path = self.config_dir / "sldl-wishlist.conf"
 
-        print(f"✅ Generated sldl.conf at {sldl_conf_path}")
+        if not force and self._is_up_to_date(sldl_conf_path, path_mode):
+            print(f"✅ {sldl_conf_path.name} already up to date")
+            return
 
-    def generate_wishlist_sldl_conf(self):
-        """Generate a wishlist-specific sldl.conf from YAML configuration."""
         if not self.config:
             self.load_config()
 
@@ -323,14 +497,33 @@ class ConfigManager:
         merged_config = slsk_config.copy()
         merged_config.update(wishlist_settings)
 
+        self._emit_sldl_conf(
+            sldl_conf_path,
+            title="sldl-wishlist.conf - Generated from toolcrate.yaml for wishlist processing",
+            path_mode=path_mode,
+            docker_mode=docker_mode,
+            merged_config=merged_config,
+            wishlist_config=wishlist_config,
+        )
+
+        print(f"✅ Generated wishlist sldl.conf at {sldl_conf_path}")
+
+    def _emit_sldl_conf(self, out_path: Path, *, title: str, path_mode: str, docker_mode: bool,
+                        merged_config: dict[str, Any], wishlist_config: dict[str, Any] | None = None):
+        """Write an sldl.conf for either the main or the wishlist flow.
+
+        Passing ``wishlist_config`` selects the wishlist layout: an explicit
+        download path, optional global index, necessary conditions, explicit
+        true/false boolean flags and no profiles.
+        """
+        wishlist_mode = wishlist_config is not None
         spotify_config = self.config.get('spotify', {})
         youtube_config = self.config.get('youtube', {})
 
-        sldl_conf_path = self.config_dir / "sldl-wishlist.conf"
-
-        with open(sldl_conf_path, 'w') as f:
-            f.write("# sldl-wishlist.conf - Generated from toolcrate.yaml for wishlist processing\n")
-            f.write("# This file is automatically generated. Edit toolcrate.yaml instead.\n\n")
+        with _open_output(out_path) as f:
+            f.write(f"# {title}\n")
+            f.write("# This file is automatically generated. Edit toolcrate.yaml instead.\n")
+            f.write(path_mode + "\n")
 
             # Authentication
             if merged_config.get('username'):
@@ -339,22 +532,15 @@ class ConfigManager:
                 f.write(f"password = {merged_config['password']}\n")
             f.write("\n")
 
-            docker_mode = bool(os.environ.get('TOOLCRATE_USE_DOCKER'))
-
             # Directories
-            default_download = '/data/library' if docker_mode else str(Path.home() / 'Music' / 'library')
-            download_dir = wishlist_config.get('download_dir', merged_config.get('parent_dir', default_download))
-            if isinstance(download_dir, str):
-                download_dir = self._resolve_path(download_dir, docker_mode)
-            f.write(f"path = {download_dir}\n")
-
-            dir_mappings = {
-                'skip_music_dir': 'skip-music-dir',
-                'm3u_file_path': 'playlist-path',
-                'failed_album_path': 'failed-album-path',
-                'log_file_path': 'log-file'
-            }
-
+            if wishlist_mode:
+                default_download = '/data/library' if docker_mode else str(Path.home() / 'Music' / 'library')
+                download_dir = wishlist_config.get('download_dir', merged_config.get('parent_dir', default_download))
+                if isinstance(download_dir, str):
+                    download_dir = self._resolve_path(download_dir, docker_mode)
+                f.write(f"path = {download_dir}\n")
+
+            dir_mappings = _WISHLIST_DIR_MAPPINGS if wishlist_mode else _SLDL_DIR_MAPPINGS
             for yaml_key, conf_key in dir_mappings.items():
                 if merged_config.get(yaml_key):
                     path_value = merged_config[yaml_key]
@@ -363,84 +549,71 @@ class ConfigManager:
                     else:
                         f.write(f"{conf_key} = {path_value}\n")
 
-            # Index path handling for wishlist
-            if wishlist_config.get('index_in_playlist_folder', True):
-                # Let slsk-batchdl use default behavior (index in playlist folder)
-                pass
-            else:
-                # Use global wishlist index
+            # Index path handling for wishlist: by default slsk-batchdl keeps
+            # the index in the playlist folder, otherwise use a global one
+            if wishlist_mode and not wishlist_config.get('index_in_playlist_folder', True):
                 index_path = '/data/wishlist-index.sldl' if docker_mode else str(
                     Path.home() / '.local' / 'share' / 'toolcrate' / 'wishlist-index.sldl'
                 )
                 f.write(f"index-path = {index_path}\n")
             f.write("\n")
 
-            # Audio quality preferences
-            if 'preferred_conditions' in merged_config:
-                pref = merged_config['preferred_conditions']
-                if pref.get('formats'):
-                    formats_str = ','.join(pref['formats'])
-                    f.write(f"pref-format = {formats_str}\n")
-                if pref.get('min_bitrate'):
-                    f.write(f"pref-min-bitrate = {pref['min_bitrate']}\n")
-                if pref.get('max_bitrate'):
-                    f.write(f"pref-max-bitrate = {pref['max_bitrate']}\n")
-                if pref.get('max_sample_rate'):
-                    f.write(f"pref-max-samplerate = {pref['max_sample_rate']}\n")
-                if pref.get('length_tolerance'):
-                    f.write(f"pref-length-tol = {pref['length_tolerance']}\n")
-                if pref.get('strict_title'):
-                    f.write(f"pref-strict-title = {str(pref['strict_title']).lower()}\n")
-                if pref.get('strict_album'):
-                    f.write(f"pref-strict-album = {str(pref['strict_album']).lower()}\n")
+            # Preferred conditions
+            pref_cond = merged_config.get('preferred_conditions', {})
+            self._write_pref_conditions(f, pref_cond, wishlist_mode=wishlist_mode)
+            if wishlist_mode:
+                for yaml_key, conf_key in _WISHLIST_STRICT_MAPPINGS.items():
+                    if pref_cond.get(yaml_key):
+                        f.write(f"{conf_key} = {str(pref_cond[yaml_key]).lower()}\n")
+            else:
+                for yaml_key, conf_key in _SLDL_STRICT_MAPPINGS.items():
+                    if pref_cond.get(yaml_key):
+                        f.write(f"{conf_key} = true\n")
             f.write("\n")
 
             # Necessary conditions
-            if 'necessary_conditions' in merged_config:
-                nec = merged_config['necessary_conditions']
+            if wishlist_mode:
+                nec = merged_config.get('necessary_conditions', {})
                 if nec.get('formats'):
-                    formats_str = ','.join(nec['formats'])
-                    f.write(f"format = {formats_str}\n")
-            f.write("\n")
+                    formats = ','.join(nec['formats'])
+                    f.write(f"format = {formats}\n")
+                f.write("\n")
 
             # Search and download settings
-            search_mappings = {
-                'concurrent_processes': 'concurrent-downloads',
-                'search_timeout': 'search-timeout',
-                'listen_port': 'listen-port',
-                'max_stale_time': 'max-stale-time',
-                'searches_per_time': 'searches-per-time',
-                'search_renew_time': 'searches-renew-time',
-                'min_shares_aggregate': 'min-shares-aggregate',
-                'aggregate_length_tol': 'aggregate-length-tol',
-                'max_retries_per_track': 'max-retries',
-                'unknown_error_retries': 'unknown-error-retries'
-            }
-
+            search_mappings = _WISHLIST_SEARCH_MAPPINGS if wishlist_mode else _SLDL_SEARCH_MAPPINGS
             for yaml_key, conf_key in search_mappings.items():
                 if merged_config.get(yaml_key) is not None:
                     f.write(f"{conf_key} = {merged_config[yaml_key]}\n")
-            f.write("\n")
 
-            # Boolean settings
-            bool_mappings = {
-                'skip_existing': 'skip-existing',
-                'write_index': 'write-index',
-                'interactive_mode': 'interactive',
-                'remove_tracks_from_source': 'remove-from-source',
-                'desperate_search': 'desperate',
-                'fast_search': 'fast-search',
-                'use_ytdlp': 'yt-dlp',
-                'skip_check_pref_cond': 'skip-check-pref-cond'
-            }
-
-            for yaml_key, conf_key in bool_mappings.items():
-                if yaml_key in merged_config:
-                    value = str(merged_config[yaml_key]).lower()
-                    f.write(f"{conf_key} = {value}\n")
-            f.write("\n")
+            if wishlist_mode:
+                f.write("\n")
+
+                # Boolean settings are written explicitly as true/false
+                for yaml_key, conf_key in _WISHLIST_BOOL_MAPPINGS.items():
+                    if yaml_key in merged_config:
+                        value = str(merged_config[yaml_key]).lower()
+                        f.write(f"{conf_key} = {value}\n")
+                f.write("\n")
+            else:
+                # Boolean flags (using inverted logic for skip/write flags)
+                for yaml_key, conf_key in _SLDL_BOOL_MAPPINGS.items():
+                    if merged_config.get(yaml_key) is True:
+                        f.write(f"{conf_key} = true\n")
+
+                # Handle inverted boolean flags
+                if not merged_config.get('skip_existing', True):
+                    f.write("no-skip-existing = true\n")
+                if not merged_config.get('write_index', True):
+                    f.write("no-write-index = true\n")
+                f.write("\n")
 
-            # API configurations
+                # String settings (only write non-empty values)
+                for yaml_key, conf_key in _SLDL_STRING_MAPPINGS.items():
+                    value = merged_config.get(yaml_key)
+                    if value and str(value).strip():
+                        f.write(f"{conf_key} = {value}\n")
+
+            # API credentials
             if spotify_config.get('client_id'):
                 f.write(f"spotify-id = {spotify_config['client_id']}\n")
             if spotify_config.get('client_secret'):
@@ -448,44 +621,65 @@ class ConfigManager:
             if youtube_config.get('api_key'):
                 f.write(f"youtube-key = {youtube_config['api_key']}\n")
 
-        print(f"✅ Generated wishlist sldl.conf at {sldl_conf_path}")
+            # Profiles (main sldl.conf only)
+            if not wishlist_mode:
+                f.write("\n")
+                profiles = self.config.get('profiles', {})
+                for profile_name, profile_config in profiles.items():
+                    f.write(f"[{profile_name}]\n")
+                    profile_settings = profile_config.get('settings', {})
+
+                    # Handle profile-specific settings
+                    if 'preferred_conditions' in profile_settings:
+                        self._write_pref_conditions(f, profile_settings['preferred_conditions'])
+
+                    # Handle other profile settings
+                    for yaml_key, conf_key in _SLDL_BOOL_MAPPINGS.items():
+                        if profile_settings.get(yaml_key) is True:
+                            f.write(f"{conf_key} = true\n")
+
+                    f.write("\n")
+
+    @staticmethod
+    def _write_pref_conditions(f, pref: dict[str, Any], wishlist_mode: bool = False):
+        """Write pref-format and the numeric pref-* settings.
+
+        The wishlist layout skips falsy values; the main layout only skips unset ones.
+        """
+        if pref.get('formats'):
+            formats = ','.join(pref['formats'])
+            f.write(f"pref-format = {formats}\n")
+        for yaml_key, conf_key in _SLDL_PREF_MAPPINGS.items():
+            value = pref.get(yaml_key)
+            if (value if wishlist_mode else value is not None):
+                f.write(f"{conf_key} = {value}\n")
 
     def validate_config(self):
         """Validate the configuration."""
         if not self.config:
             self.load_config()
 
-        errors = []
-        warnings = []
+        from .schema import config_errors
 
-        # Check required sections
-        required_sections = ['general', 'slsk_batchdl', 'spotify', 'youtube', 'wishlist', 'cron', 'mounts']
-        for section in required_sections:
-            if section not in self.config:
-                errors.append(f"Missing required section: {section}")
+        # Required sections and field types are checked by the schema in one pass
+        errors = config_errors(self.config)
+        warnings = []
 
         # Validate slsk_batchdl settings
-        if 'slsk_batchdl' in self.config:
-            slsk = self.config['slsk_batchdl']
-
+        slsk = self.config.get('slsk_batchdl')
+        if isinstance(slsk, dict):
             if not slsk.get('username'):
                 warnings.append("Soulseek username not configured")
             if not slsk.get('password'):
                 warnings.append("Soulseek password not configured")
 
-            # Check numeric values
-            numeric_fields = ['concurrent_processes', 'search_timeout', 'listen_port']
-            for field in numeric_fields:
-                if field in slsk and not isinstance(slsk[field], int):
-                    errors.append(f"Field {field} must be an integer")
-
         # Validate directory paths
         if 'general' in self.config:
-            for dir_field in ['data_directory', 'log_directory']:
-                if dir_field in self.config['general']:
-                    path = Path(self.config['general'][dir_field])
-                    if not path.exists():
-                        warnings.append(f"Directory does not exist: {path}")
+            paths = [Path(self.config['general'][dir_field])
+                     for dir_field in ['data_directory', 'log_directory']
+                     if dir_field in self.config['general']]
+            for path in self._missing_paths(paths):
+                warnings.append(f"Directory does not exist: {path}")
 
         # Print results
         if errors:
@@ -503,8 +697,39 @@ class ConfigManager:
 
         return len(errors) == 0
 
-    def generate_docker_compose(self):
-        """Generate docker-compose.yml from YAML configuration."""
+    @staticmethod
+    def _missing_paths(paths: list[Path]) -> list[Path]:
+        """Return the paths that do not exist, listing each parent directory once."""
+        by_parent = defaultdict(list)
+        for path in paths:
+            by_parent[path.parent].append(path)
+
+        missing = []
+        for parent, children in by_parent.items():
+            try:
+                with os.scandir(parent) as it:
+                    existing = {entry.name for entry in it}
+            except OSError:
+                existing = set()
+            for path in children:
+                # '.'/'..' never appear in a listing, so check those directly
+                if path.name in existing or (path.name in ('', '.', '..') and path.exists()):
+                    continue
+                missing.append(path)
+        return missing
+
+    def generate_docker_compose(self, force: bool = False):
+        """Generate docker-compose.yml from YAML configuration.
+
+        Generation is skipped when docker-compose.yml is newer than toolcrate.yaml,
+        unless ``force`` is set.
+        """
+        docker_compose_path = self.config_dir / "docker-compose.yml"
+
+        if not force and self._is_up_to_date(docker_compose_path):
+            print(f"✅ {docker_compose_path.name} already up to date")
+            return
+
         if not self.config:
             self.load_config()
 
@@ -520,83 +745,21 @@ class ConfigManager:
         puid = environment.get('PUID', 1000)
         pgid = environment.get('PGID', 1000)
 
-        docker_compose_path = self.config_dir / "docker-compose.yml"
+        import datetime
+        ts = datetime.datetime.now().strftime('%a %b %d %H:%M:%S %Z %Y')
 
-        with open(docker_compose_path, 'w') as f:
-            f.write("# Docker Compose configuration for ToolCrate\n")
-            import datetime
-            f.write(f"# Generated from toolcrate.yaml on {datetime.datetime.now().strftime('%a %b %d %H:%M:%S %Z %Y')}\n")
-            f.write("#\n")
-            f.write(f"# Mount paths: {config_mount} → /config, {data_mount} → /data\n")
-            f.write("# Run from project root directory when using relative paths\n\n")
-
-            f.write("services:\n")
-
-            # ToolCrate main service
-            f.write("  toolcrate:\n")
-            f.write("    build:\n")
-            f.write("      context: ..\n")
-            f.write("      dockerfile: Dockerfile\n")
-            f.write("    image: toolcrate:latest\n")
-            f.write("    container_name: toolcrate\n")
-            f.write("    environment:\n")
-            f.write(f"      - TZ={tz}\n")
-            f.write(f"      - PUID={puid}\n")
-            f.write(f"      - PGID={pgid}\n")
-            f.write("      - PYTHONPATH=/app/src\n")
-            f.write("      - PYTHONUNBUFFERED=1\n")
-            f.write("    volumes:\n")
-            f.write(f"      - {config_mount}:/config\n")
-            f.write(f"      - {data_mount}:/data\n")
-            f.write("    restart: unless-stopped\n")
-            f.write("    networks:\n")
-            f.write("      - toolcrate-network\n")
-            f.write("    working_dir: /app\n")
-            f.write("    command: [\"tail\", \"-f\", \"/dev/null\"]\n\n")
-
-            # SLDL service
-            f.write("  sldl:\n")
-            f.write("    build:\n")
-            f.write("      context: ../src/slsk-batchdl\n")
-            f.write("      dockerfile: Dockerfile\n")
-            f.write("    image: slsk-batchdl:latest\n")
-            f.write("    container_name: sldl\n")
-            f.write("    environment:\n")
-            f.write(f"      - TZ={tz}\n")
-            f.write(f"      - PUID={puid}\n")
-            f.write(f"      - PGID={pgid}\n")
-            f.write("    volumes:\n")
-            f.write(f"      - {config_mount}:/config\n")
-            f.write(f"      - {data_mount}:/data\n")
-            f.write("    restart: unless-stopped\n")
-            f.write("    networks:\n")
-            f.write("      - toolcrate-network\n\n")
-
-            f.write("networks:\n")
-            f.write("  toolcrate-network:\n")
-            f.write("    driver: bridge\n\n")
-
-            f.write("volumes:\n")
-            f.write("  config:\n")
-            f.write("    driver: local\n")
-            f.write("    driver_opts:\n")
-            f.write("      type: none\n")
-            f.write("      o: bind\n")
-            f.write(f"      device: {config_mount}\n")
-            f.write("  data:\n")
-            f.write("    driver: local\n")
-            f.write("    driver_opts:\n")
-            f.write("      type: none\n")
-            f.write("      o: bind\n")
-            f.write(f"      device: {data_mount}\n")
+        docker_compose_path.write_text(
+            _DOCKER_COMPOSE_TEMPLATE.format(
+                ts=ts, tz=tz, puid=puid, pgid=pgid,
+                config_mount=config_mount, data_mount=data_mount,
+            ),
+            encoding='utf-8', newline='\n',
+        )
 
         print(f"✅ Generated docker-compose.yml at {docker_compose_path}")
 
     def check_mount_changes(self):
         """Check if mount paths have changed and rebuild containers if needed."""
-        if not self.config:
-            self.load_config()
-
         docker_compose_path = self.config_dir / "docker-compose.yml"
 
         if not docker_compose_path.exists():
@@ -604,9 +767,17 @@ class ConfigManager:
             self.generate_docker_compose()
             return
 
+        # docker-compose.yml written after the last config edit cannot have stale mounts
+        if self._is_up_to_date(docker_compose_path):
+            print("✅ Mount paths unchanged (by mtime), no container rebuild needed")
+            return
+
+        if not self.config:
+            self.load_config()
+
         # Read current docker-compose.yml to check mount paths
         try:
-            with open(docker_compose_path) as f:
+            with open(docker_compose_path, encoding='utf-8') as f:
                 current_compose = f.read()
 
             # Get current mount paths from config
@@ -615,7 +786,8 @@ class ConfigManager:
             data_mount = mounts.get('data', {}).get('host_path', './data')
 
             # Check if mount paths in docker-compose.yml match current config
-            if f"- {config_mount}:/config" in current_compose and f"- {data_mount}:/data" in current_compose:
+            current_mounts = {(m.group(2), m.group(1)) for m in _MOUNT_RE.finditer(current_compose)}
+            if current_mounts == {('config', config_mount), ('data', data_mount)}:
                 print("✅ Mount paths unchanged, no container rebuild needed")
                 return
 
@@ -627,19 +799,19 @@ class ConfigManager:
                 print("🛑 Stopping existing containers...")
                 subprocess.run([
                     "docker-compose", "-f", str(docker_compose_path), "down"
-                ], check=False, capture_output=True)
+                ], check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
                 # Remove containers if they exist
                 for container in ["toolcrate", "sldl"]:
                     subprocess.run([
                         "docker", "rm", "-f", container
-                    ], check=False, capture_output=True)
+                    ], check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
             except Exception as e:
                 print(f"⚠️  Warning: Could not stop containers: {e}")
 
             # Generate new docker-compose.yml
-            self.generate_docker_compose()
+            self.generate_docker_compose(force=True)
 
             print("✅ Containers will use new mount paths on next startup")
             print(f"💡 To start containers: docker-compose -f {docker_compose_path} up -d")
@@ -647,7 +819,7 @@ class ConfigManager:
         except Exception as e:
             print(f"❌ Error checking mount changes: {e}")
             print("🔄 Regenerating docker-compose.yml...")
-            self.generate_docker_compose()
+            self.generate_docker_compose(force=True)
 
 
 def main():
@@ -655,6 +827,8 @@ def main():
     parser = argparse.ArgumentParser(description="ToolCrate Configuration Manager")
     parser.add_argument("--config", "-c", default="config/toolcrate.yaml",
                        help="Path to the YAML configuration file")
+    parser.add_argument("--force", "-f", action="store_true",
+                       help="Regenerate output files even if they are up to date")
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
@@ -689,20 +863,23 @@ def main():
         sys.exit(0 if is_valid else 1)
 
     elif args.command == "generate-sldl":
-        config_manager.generate_sldl_conf()
+        config_manager.generate_sldl_conf(force=args.force)
 
     elif args.command == "generate-wishlist-sldl":
-        config_manager.generate_wishlist_sldl_conf()
+        config_manager.generate_wishlist_sldl_conf(force=args.force)
 
     elif args.command == "generate-docker":
-        config_manager.generate_docker_compose()
+        config_manager.generate_docker_compose(force=args.force)
 
     elif args.command == "check-mounts":
         config_manager.check_mount_changes()
 
     elif args.command == "show":
         config = config_manager.load_config()
-        print(yaml.dump(config, default_flow_style=False, indent=2))
+        yaml = _import_yaml()
+        # Let the emitter write straight to stdout instead of building the document string first
+        yaml.dump(config, sys.stdout, Dumper=_safe_dumper(yaml), default_flow_style=False, indent=2)
+        print()
 
 
 if __name__ == "__main__":
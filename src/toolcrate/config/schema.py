@@ -0,0 +1,49 @@
+"""Pydantic schema for toolcrate.yaml.
+
+Imported lazily by ``ConfigManager.validate_config`` so commands that never
+validate do not pay for building the validators.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, StrictInt, ValidationError
+
+
+class SlskBatchdlSection(BaseModel):
+    model_config = ConfigDict(extra='allow')
+    # Optional, but an explicit null is rejected like any other non-integer
+    concurrent_processes: StrictInt = 2
+    search_timeout: StrictInt = 6000
+    listen_port: StrictInt = 49998
+
+
+class ToolcrateConfig(BaseModel):
+    """Top-level sections that must be present; their contents are free-form unless modelled."""
+    model_config = ConfigDict(extra='allow')
+    general: Any
+    slsk_batchdl: SlskBatchdlSection
+    spotify: Any
+    youtube: Any
+    wishlist: Any
+    cron: Any
+    mounts: Any
+
+
+def config_errors(config: dict[str, Any]) -> list[str]:
+    """Validate config in one pass and return human-readable error messages."""
+    try:
+        ToolcrateConfig.model_validate(config)
+    except ValidationError as e:
+        return [_format_error(err) for err in e.errors()]
+    return []
+
+
+def _format_error(err: dict[str, Any]) -> str:
+    loc = err['loc']
+    if err['type'] == 'missing' and len(loc) == 1:
+        return f"Missing required section: {loc[0]}"
+    if err['type'].startswith('int_') and loc[0] == 'slsk_batchdl' and len(loc) == 2:
+        return f"Field {loc[1]} must be an integer"
+    return f"{'.'.join(str(part) for part in loc)}: {err['msg']}"
@@ -25,9 +25,12 @@ class MatchResult:
     failure_reason: str
 
 
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
 def _norm(s: str) -> str:
     s = unicodedata.normalize("NFKD", s).lower()
-    s = re.sub(r"[^a-z0-9]+", " ", s).strip()
+    s = _NON_ALNUM.sub(" ", s).strip()
     return s
 
 
@@ -3,7 +3,7 @@
 Three responsibilities:
   1. Build sldl args from a SourceList + settings (`build_command`).
   2. Run sldl as a subprocess and stream its progress lines.
-  3. Parse sldl's CSV index file into structured rows.
+  3. Parse sldl's CSV index file into structured rows, streaming it from disk.
 
 The line/index parsers are pure functions and tested independently of any
 real sldl binary. The runner is integration-tested with a mock binary.
@@ -14,9 +14,10 @@ from __future__ import annotations
 import asyncio
 import csv
 import io
+import itertools
 import os
 import re
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable, Iterator
 from dataclasses import dataclass
 
 _STATE_MAP = {
@@ -45,25 +46,68 @@ class SldlProgressEvent:
     detail: str = ""
 
 
-def parse_index_csv(text: str) -> list[SldlIndexEntry]:
-    rows: list[SldlIndexEntry] = []
-    reader = csv.reader(io.StringIO(text))
-    for row in reader:
-        if not row or len(row) < 6:
+# Index columns toolcrate reads, by header name, and their positions in an
+# index written without a header row
+_INDEX_COLUMNS = ("filepath", "artist", "title", "length", "state", "failurereason")
+_DEFAULT_INDEX_POSITIONS = (0, 1, 2, 3, 5, 6)
+
+
+def _parse_index_rows(reader: Iterable[list[str]]) -> Iterator[SldlIndexEntry]:
+    *required, reason_pos = _DEFAULT_INDEX_POSITIONS
+    min_len = max(required) + 1
+    rows = iter(reader)
+    for first in rows:
+        if first:
+            break
+    else:
+        return
+    # Only the first row can be the header, so data rows are never lowercased
+    header = [name.strip().lower() for name in first]
+    if header[0] == "filepath":
+        # Header row: resolve the columns by name once, then read rows positionally
+        if all(name in header for name in _INDEX_COLUMNS[:5]):
+            *required, reason_pos = (
+                header.index(name) if name in header else -1 for name in _INDEX_COLUMNS
+            )
+            min_len = max(required) + 1
+    else:
+        rows = itertools.chain((first,), rows)
+    for row in rows:
+        if len(row) < min_len:
             continue
-        file_path = row[0].strip()
-        artist = row[1].strip()
-        title = row[2].strip()
-        length_raw = row[3].strip()
+        file_path, artist, title, length_raw, state_raw = (row[i].strip() for i in required)
         try:
             length = int(length_raw) if length_raw else None
         except ValueError:
             length = None
-        state_raw = row[5].strip()
         state = _STATE_MAP.get(state_raw, "unknown")
-        failure_reason = row[6].strip() if len(row) >= 7 else ""
-        rows.append(SldlIndexEntry(file_path, artist, title, length, state, failure_reason))
-    return rows
+        failure_reason = row[reason_pos].strip() if 0 <= reason_pos < len(row) else ""
+        yield SldlIndexEntry(file_path, artist, title, length, state, failure_reason)
+
+
+def parse_index_csv(text: str) -> list[SldlIndexEntry]:
+    return list(_parse_index_rows(csv.reader(io.StringIO(text))))
+
+
+def has_index(path: str) -> bool:
+    """True if sldl wrote a non-empty index file at ``path``."""
+    try:
+        return os.stat(path).st_size > 0
+    except FileNotFoundError:
+        return False
+
+
+def iter_index_file(path: str) -> Iterator[SldlIndexEntry]:
+    """Stream entries from an sldl index file without reading it all at once.
+
+    A missing file (sldl never wrote one) yields nothing.
+    """
+    try:
+        f = open(path, newline="")
+    except FileNotFoundError:
+        return
+    with f:
+        yield from _parse_index_rows(csv.reader(f))
 
 
 _SEARCHING = re.compile(r"^Searching:\s*(.+)$")
@@ -71,9 +115,13 @@ _DOWNLOADING = re.compile(r"^Downloading:\s*(.+?)(?:\s+--\s+(.+))?$")
 _SUCCEEDED = re.compile(r"^Succeeded:\s*(.+)$")
 _FAILED = re.compile(r"^Failed:\s*(.+?)(?:\s+--\s+(.+))?$")
 _SUMMARY = re.compile(r"^Done\.\s*(.+)$")
+# Every pattern above is anchored on one of these; most sldl output matches none
+_PROGRESS_PREFIXES = ("Searching:", "Downloading:", "Succeeded:", "Failed:", "Done.")
 
 
 def parse_progress_line(line: str) -> SldlProgressEvent | None:
+    if not line.startswith(_PROGRESS_PREFIXES):
+        return None
     line = line.rstrip("\r\n")
     if m := _SEARCHING.match(line):
         return SldlProgressEvent(kind="searching", track_label=m.group(1).strip())
@@ -25,7 +25,8 @@ from .events import Event, EventBus
 from .reconcile import match_index_to_tracks
 from .sldl_adapter import (
     build_command,
-    parse_index_csv,
+    has_index,
+    iter_index_file,
     parse_progress_line,
     stream_sldl,
 )
@@ -108,39 +109,36 @@ class SyncService:
                             data={"id": job_id, "progress": {"message": ev.kind, "track": ev.track_label}},
                         ))
 
-            try:
-                index_text = Path(index_path).read_text()
-            except FileNotFoundError:
-                index_text = ""
-            index = parse_index_csv(index_text)
-
-        # Reconcile: load tracks for this list and match.
-        async with self._sf() as session:
-            tracks = (await session.execute(
-                select(TrackEntry).where(TrackEntry.source_list_id == list_id)
-            )).scalars().all()
-            results = match_index_to_tracks(index, tracks)
-            for r in results:
-                if r.track_id is None:
-                    continue
-                new_status = _INDEX_TO_TRACK_STATUS.get(r.state, "pending")
-                d = Download(
-                    track_entry_id=r.track_id,
-                    job_id=job_id,
-                    status=new_status if new_status in {"done", "failed"} else "partial",
-                    file_path=r.file_path or None,
-                    sldl_match_path=r.file_path or None,
-                    error=r.failure_reason or None,
-                    finished_at=datetime.now(timezone.utc),
-                )
-                session.add(d)
-                await session.flush()
-                await session.execute(
-                    update(TrackEntry)
-                    .where(TrackEntry.id == r.track_id)
-                    .values(download_status=new_status, download_id=d.id)
-                )
-            await session.commit()
+            # Reconcile: load tracks for this list and match them against the index,
+            # streamed from disk while the temp dir still exists. Without an index
+            # there is nothing to reconcile, so skip loading the tracks at all.
+            if has_index(index_path):
+                async with self._sf() as session:
+                    tracks = (await session.execute(
+                        select(TrackEntry).where(TrackEntry.source_list_id == list_id)
+                    )).scalars().all()
+                    results = match_index_to_tracks(iter_index_file(index_path), tracks)
+                    for r in results:
+                        if r.track_id is None:
+                            continue
+                        new_status = _INDEX_TO_TRACK_STATUS.get(r.state, "pending")
+                        d = Download(
+                            track_entry_id=r.track_id,
+                            job_id=job_id,
+                            status=new_status if new_status in {"done", "failed"} else "partial",
+                            file_path=r.file_path or None,
+                            sldl_match_path=r.file_path or None,
+                            error=r.failure_reason or None,
+                            finished_at=datetime.now(timezone.utc),
+                        )
+                        session.add(d)
+                        await session.flush()
+                        await session.execute(
+                            update(TrackEntry)
+                            .where(TrackEntry.id == r.track_id)
+                            .values(download_status=new_status, download_id=d.id)
+                        )
+                    await session.commit()
 
         await self._src.update(list_id, {
             "last_synced_at": datetime.now(timezone.utc),
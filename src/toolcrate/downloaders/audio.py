@@ -1,68 +1,102 @@
+import copy
+import functools
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit, urlunsplit
 
 from yt_dlp import YoutubeDL
 
 logger = logging.getLogger(__name__)
 
+# Base domains served by each platform's downloader; any subdomain matches too
+_YT_DOMAINS = ('youtube.com', 'youtu.be')
+_SC_DOMAINS = ('soundcloud.com',)
+
+
+def _host_matches(host: str, domains: tuple[str, ...]) -> bool:
+    """Return True if host is one of domains or a subdomain of one."""
+    return any(host == d or host.endswith('.' + d) for d in domains)
+
+
+def _normalize_url(url: str) -> str:
+    """Canonical cache key for a URL: lowercased scheme and host, no fragment."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ''))
+
+
+@functools.lru_cache(maxsize=256)
+def _extract_info_cached(url: str) -> dict[str, Any]:
+    """Run the yt-dlp extractor for a normalized URL, once per process.
+
+    Lazy playlist entries are materialized so the cached result can be reused.
+    Failures are not cached.
+    """
+    ydl_opts = {
+        'quiet': True,
+        'no_warnings': True,
+    }
+    with YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False, process=False)
+    if 'entries' in info:
+        info['entries'] = list(info['entries'])
+    return info
+
+
 class AudioDownloader:
     """High-quality audio downloader for YouTube and SoundCloud."""
 
-    def __init__(self, output_path: str = "downloads", quality: str = "320"):
+    # yt-dlp output template appended to the download directory
+    _outtmpl_suffix = '%(title)s.%(ext)s'
+
+    def __init__(self, output_path: str = "downloads", quality: str = "320", concurrency: int = 4):
         """
         Initialize the audio downloader.
 
         Args:
             output_path: Base directory to save downloaded files
             quality: Audio quality in kbps (default: "320")
+            concurrency: Maximum playlist tracks downloaded at once, capped at
+                the CPU count since each track is transcoded by ffmpeg
         """
         self.base_output_path = Path(output_path).expanduser()
         self.quality = quality
+        self.concurrency = max(1, min(concurrency, os.cpu_count() or 1))
 
-    def _get_playlist_info(self, url: str, platform: str) -> tuple[str, bool]:
+    def _extract_info(self, url: str) -> dict[str, Any]:
         """
-        Extract playlist name and check if URL is a playlist.
+        Resolve metadata for a URL without downloading or expanding playlist entries.
+
+        The result is handed to ``YoutubeDL.process_ie_result`` for the actual
+        download, so the extractor only runs once per URL. Results are cached per
+        process by normalized URL, so repeated links are only probed once.
 
         Args:
-            url: URL to check
-            platform: Either "youtube" or "soundcloud"
+            url: URL to resolve
 
         Returns:
-            Tuple of (playlist_name, is_playlist)
+            Unprocessed yt-dlp info dict (a private copy the caller may modify)
         """
-        try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,
-            }
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                if 'entries' in info:  # It's a playlist
-                    playlist_name = info.get('title', 'Unknown Playlist')
-                    return playlist_name, True
-                else:  # Single track
-                    return info.get('title', 'Unknown Track'), False
-        except Exception as e:
-            logger.error(f"Failed to get playlist info: {e}")
-            return "Unknown", False
+        return copy.deepcopy(_extract_info_cached(_normalize_url(url)))
 
-    def _get_output_path(self, url: str, platform: str) -> Path:
+    def _get_output_path(self, info: dict[str, Any]) -> Path:
         """
         Determine the output path based on whether it's a playlist or single track.
 
         Args:
-            url: URL to download
-            platform: Either "youtube" or "soundcloud"
+            info: yt-dlp info dict from _extract_info()
 
         Returns:
             Path object for the output directory
         """
-        playlist_name, is_playlist = self._get_playlist_info(url, platform)
-        if is_playlist:
-            # Create a sanitized playlist name for the directory
-            safe_name = "".join(c for c in playlist_name if c.isalnum() or c in (' ', '-', '_')).strip()
+        if 'entries' in info:  # It's a playlist
+            playlist_name = info.get('title', 'Unknown Playlist')
+            # Create a sanitized playlist name for the directory: drop every distinct
+            # disallowed character in one str.translate pass
+            bad = {ord(c): None for c in set(playlist_name) if not (c.isalnum() or c in ' -_')}
+            safe_name = playlist_name.translate(bad).strip()
             return self.base_output_path / safe_name
         else:
             return self.base_output_path
@@ -89,11 +123,87 @@ class AudioDownloader:
                 'preferredcodec': 'mp3',
                 'preferredquality': self.quality,
             }],
-            'outtmpl': str(output_path / '%(title)s.%(ext)s'),
+            'outtmpl': os.path.join(output_path, self._outtmpl_suffix),
             'quiet': False,
             'no_warnings': False,
         }
 
+    def _download(self, url: str, platform: str) -> Path:
+        """
+        Extract metadata once, then download into the matching output directory.
+
+        Args:
+            url: URL to download
+            platform: Either "youtube" or "soundcloud"
+
+        Returns:
+            Playlist directory or path of the downloaded track
+        """
+        info = self._extract_info(url)
+        output_path = self._get_output_path(info)
+        self._ensure_output_directory(output_path)
+
+        ydl_opts = self._get_ydl_opts(platform, output_path)
+
+        if 'entries' in info and self.concurrency > 1:
+            num_tracks = self._download_entries(info['entries'], ydl_opts)
+            logger.info("✅ Successfully downloaded playlist with %s tracks", num_tracks)
+            return output_path
+
+        with YoutubeDL(ydl_opts) as ydl:
+            info = ydl.process_ie_result(info, download=True)
+            if 'entries' in info:  # Playlist
+                num_tracks = len([entry for entry in info['entries'] if entry is not None])
+                logger.info("✅ Successfully downloaded playlist with %s tracks", num_tracks)
+                return output_path
+            else:  # Single track
+                title = info.get('title', 'Unknown Title')
+                logger.info("✅ Successfully downloaded: %s", title)
+                return output_path / f"{title}.mp3"
+
+    def _download_entries(self, entries, ydl_opts: dict[str, Any]) -> int:
+        """
+        Download playlist entries concurrently, one YoutubeDL instance per track.
+
+        Args:
+            entries: Unprocessed playlist entries from _extract_info()
+            ydl_opts: Options from _get_ydl_opts() for the playlist directory
+
+        Returns:
+            Number of tracks downloaded successfully
+
+        Raises:
+            RuntimeError: If the playlist has tracks but none could be downloaded
+        """
+        # Longest tracks first (flat entries carry 'duration' when the site reports
+        # it), so one long track starting last doesn't keep the pool waiting on it
+        entries = sorted((entry for entry in entries if entry is not None),
+                         key=lambda entry: entry.get('duration') or 0, reverse=True)
+        urls = [entry.get('url') or entry.get('webpage_url') for entry in entries]
+        urls = [url for url in urls if url]
+
+        # The pool already runs one ffmpeg per CPU; keep each transcode on a
+        # single thread so they don't oversubscribe the cores
+        ydl_opts = {**ydl_opts, 'postprocessor_args': {'extractaudio+ffmpeg_o': ['-threads', '1']}}
+
+        def download_one(entry_url: str) -> bool:
+            try:
+                with YoutubeDL(ydl_opts) as ydl:
+                    return ydl.download([entry_url]) == 0
+            except Exception as e:
+                logger.error("❌ Failed to download playlist entry %s: %s", entry_url, e)
+                return False
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(download_one, urls))
+
+        num_tracks = sum(results)
+        if urls and not num_tracks:
+            raise RuntimeError(f"none of the {len(urls)} playlist tracks could be downloaded")
+        if num_tracks < len(urls):
+            logger.warning("⚠️  %s of %s playlist tracks failed", len(urls) - num_tracks, len(urls))
+        return num_tracks
+
     def download_youtube(self, url: str) -> Path | None:
         """
         Download audio from YouTube URL.
@@ -104,24 +214,11 @@ class AudioDownloader:
         Returns:
             Path to downloaded file(s) or None if download failed
         """
-        logger.info(f"🎥 Downloading from YouTube: {url}")
+        logger.info("🎥 Downloading from YouTube: %s", url)
         try:
-            output_path = self._get_output_path(url, 'youtube')
-            self._ensure_output_directory(output_path)
-
-            ydl_opts = self._get_ydl_opts('youtube', output_path)
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                if 'entries' in info:  # Playlist
-                    num_tracks = len([entry for entry in info['entries'] if entry is not None])
-                    logger.info(f"✅ Successfully downloaded playlist with {num_tracks} tracks")
-                    return output_path
-                else:  # Single video
-                    title = info.get('title', 'Unknown Title')
-                    logger.info(f"✅ Successfully downloaded: {title}")
-                    return output_path / f"{title}.mp3"
+            return self._download(url, 'youtube')
         except Exception as e:
-            logger.error(f"❌ Failed to download from YouTube {url}: {e}")
+            logger.error("❌ Failed to download from YouTube %s: %s", url, e)
             return None
 
     def download_soundcloud(self, url: str) -> Path | None:
@@ -134,24 +231,11 @@ class AudioDownloader:
         Returns:
             Path to downloaded file(s) or None if download failed
         """
-        logger.info(f"🎵 Downloading from SoundCloud: {url}")
+        logger.info("🎵 Downloading from SoundCloud: %s", url)
         try:
-            output_path = self._get_output_path(url, 'soundcloud')
-            self._ensure_output_directory(output_path)
-
-            ydl_opts = self._get_ydl_opts('soundcloud', output_path)
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                if 'entries' in info:  # Playlist
-                    num_tracks = len([entry for entry in info['entries'] if entry is not None])
-                    logger.info(f"✅ Successfully downloaded playlist with {num_tracks} tracks")
-                    return output_path
-                else:  # Single track
-                    title = info.get('title', 'Unknown Title')
-                    logger.info(f"✅ Successfully downloaded: {title}")
-                    return output_path / f"{title}.mp3"
+            return self._download(url, 'soundcloud')
         except Exception as e:
-            logger.error(f"❌ Failed to download from SoundCloud {url}: {e}")
+            logger.error("❌ Failed to download from SoundCloud %s: %s", url, e)
             return None
 
     def download(self, url: str) -> Path | None:
@@ -164,10 +248,12 @@ class AudioDownloader:
         Returns:
             Path to downloaded file(s) or None if download failed
         """
-        url_lower = url.lower()
-        if 'youtube.com' in url_lower or 'youtu.be' in url_lower:
+        # Only the host is lowercased; links pasted without a scheme still parse as a netloc
+        parts = urlsplit(url if '//' in url else f'//{url}')
+        host = (parts.hostname or '').lower()
+        if _host_matches(host, _YT_DOMAINS):
             return self.download_youtube(url)
-        elif 'soundcloud.com' in url_lower:
+        elif _host_matches(host, _SC_DOMAINS):
             return self.download_soundcloud(url)
         else:
             logger.error("❌ Unsupported URL format. Please provide a YouTube or SoundCloud link.")
@@ -6,23 +6,38 @@ for each link and removing processed entries from the queue.
 """
 
 import logging
+import os
+import shlex
 import subprocess
 import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 if sys.platform == "win32":
     fcntl = None
 else:
     import fcntl
-from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .._sldl_exec import SLDL_CONTAINER, connect_sldl_container, exec_sldl
+
 logger = logging.getLogger(__name__)
 
+# Per-entry timeout in seconds
+_ENTRY_TIMEOUT = 3600
+# Local-time timestamp format for the lock and backup files
+_DT_FMT = "%Y-%m-%dT%H:%M:%S"
+
 
 class QueueProcessor:
     """Processes download queue entries using slsk-batchdl in Docker."""
 
+    # Backup file handle, opened on the first backup of a run and closed when the run ends
+    _backup_file = None
+
     def __init__(self, config_manager):
         """Initialize the queue processor.
 
@@ -38,6 +53,14 @@ class QueueProcessor:
         self.lock_file_path = Path(config_manager.config_dir) / self.queue_config.get('lock_file', 'config/.queue-lock').replace('config/', '')
         self.backup_file_path = Path(config_manager.config_dir) / self.queue_config.get('backup_file', 'config/download-queue-processed.txt').replace('config/', '')
 
+        # The sldl flags only depend on the queue config, so build them once
+        self._sldl_prefix = ["sldl", "-c", "/config/sldl.conf"]
+        self._sldl_suffix = self._build_sldl_suffix()
+        self._docker_prefix = ["docker", "exec", "-i", SLDL_CONTAINER]
+
+        # Docker SDK handle for the sldl container, set for the duration of process_all_entries
+        self._sldl_container = None
+
         # Ensure queue file exists
         self.queue_file_path.parent.mkdir(parents=True, exist_ok=True)
         if not self.queue_file_path.exists():
@@ -47,23 +70,34 @@ class QueueProcessor:
     def acquire_lock(self) -> object | None:
         """Acquire a file lock to prevent concurrent processing.
 
+        The lock file is never unlinked, so every process locks the same inode
+        and a stale path can never be locked by two processes at once. The
+        queue file itself is not locked because remove_processed_entries
+        replaces it with a new inode.
+
         Returns:
             File handle if lock acquired, None if lock could not be acquired
         """
         if fcntl is None:
             logger.warning("Queue processing not supported on Windows (requires fcntl)")
             return None
+        lock_file = None
         try:
-            lock_file = open(self.lock_file_path, 'w')
+            # Append mode so a failed attempt never truncates the holder's info
+            lock_file = open(self.lock_file_path, 'a', encoding='utf-8')
             fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            lock_file.write(f"Queue processing started at {datetime.now().isoformat()}\n")
-            lock_file.flush()
-            logger.info("Acquired queue processing lock")
-            return lock_file
         except OSError as e:
+            if lock_file is not None:
+                lock_file.close()
             logger.warning(f"Could not acquire queue lock: {e}")
             return None
 
+        lock_file.truncate(0)
+        lock_file.write(f"Queue processing started at {time.strftime(_DT_FMT)}\n")
+        lock_file.flush()
+        logger.info("Acquired queue processing lock")
+        return lock_file
+
     def release_lock(self, lock_file):
         """Release the file lock.
 
@@ -74,12 +108,29 @@ class QueueProcessor:
             try:
                 fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
                 lock_file.close()
-                if self.lock_file_path.exists():
-                    self.lock_file_path.unlink()
                 logger.info("Released queue processing lock")
             except Exception as e:
                 logger.warning(f"Error releasing lock: {e}")
 
+    def is_locked(self) -> bool:
+        """Check whether a queue run currently holds the processing lock.
+
+        Returns:
+            True if another open lock file handle holds the lock
+        """
+        if fcntl is None:
+            return False
+        try:
+            with open(self.lock_file_path, encoding='utf-8') as f:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return True
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        except FileNotFoundError:
+            pass
+        return False
+
     def read_queue_entries(self) -> list[str]:
         """Read and parse entries from the download queue file.
 
@@ -91,15 +142,9 @@ class QueueProcessor:
             return []
 
         try:
+            # Filter out empty lines and comments while streaming the file
             with open(self.queue_file_path, encoding='utf-8') as f:
-                lines = f.readlines()
-
-            # Filter out empty lines and comments
-            entries = []
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    entries.append(line)
+                entries = [s for s in (line.strip() for line in f) if s and not s.startswith('#')]
 
             logger.info(f"Found {len(entries)} entries in queue file")
             return entries
@@ -108,46 +153,95 @@ class QueueProcessor:
             logger.error(f"Error reading queue file {self.queue_file_path}: {e}")
             return []
 
-    def build_sldl_command(self, entry: str) -> list[str]:
-        """Build the sldl command for a queue entry.
-
-        Args:
-            entry: URL or search term to download
+    def _build_sldl_suffix(self) -> list[str]:
+        """Build the sldl arguments that follow the entry, shared by every entry.
 
         Returns:
-            List of command arguments for sldl
+            List of command arguments derived from the queue configuration
         """
-        # Base command with standard config file
-        cmd = ["sldl", "-c", "/config/sldl.conf"]
-
-        # Add the entry (URL or search term)
-        cmd.append(entry)
-
         # Override download directory to downloads (not library)
         download_dir = self.queue_config.get('download_dir', '/data/downloads')
-        cmd.extend(["-p", download_dir])
+        suffix = ["-p", download_dir]
 
         # Add queue-specific flags from settings
         queue_settings = self.queue_config.get('settings', {})
 
         if queue_settings.get('skip_existing', True):
             # Skip existing files (default for queue)
-            cmd.append("--skip-existing")
+            suffix.append("--skip-existing")
 
         if queue_settings.get('desperate_search', False):
             # Use relaxed matching if enabled
-            cmd.append("--desperate")
+            suffix.append("--desperate")
 
         if queue_settings.get('use_ytdlp', True):
             # Enable yt-dlp fallback
-            cmd.append("--yt-dlp")
+            suffix.append("--yt-dlp")
 
         # Add timeout if specified
         search_timeout = queue_settings.get('search_timeout')
         if search_timeout:
-            cmd.extend(["--search-timeout", str(search_timeout)])
+            suffix.extend(["--search-timeout", str(search_timeout)])
 
-        return cmd
+        return suffix
+
+    def build_sldl_command(self, entry: str) -> list[str]:
+        """Build the sldl command for a queue entry.
+
+        Args:
+            entry: URL or search term to download
+
+        Returns:
+            List of command arguments for sldl
+        """
+        return [*self._sldl_prefix, entry, *self._sldl_suffix]
+
+    def _connect_sldl_container(self):
+        """Connect to the sldl container through the Docker SDK.
+
+        Returns:
+            Tuple of (client, container), or (None, None) to fall back to the docker CLI
+        """
+        # sldl can be silent for long stretches, so the client timeout must
+        # outlast the per-entry timeout
+        return connect_sldl_container(_ENTRY_TIMEOUT + 60, logger)
+
+    def _sldl_running(self) -> bool:
+        """Check once whether the sldl container is up before processing entries.
+
+        Returns:
+            True if the sldl container is running
+        """
+        container = self._sldl_container
+        if container is not None:
+            # Fetched with the container on connect, so no extra round-trip
+            return container.status == 'running'
+        try:
+            result = subprocess.run(
+                ["docker", "inspect", "-f", "{{.State.Running}}", SLDL_CONTAINER],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"docker inspect failed: {e}")
+            return False
+        return result.returncode == 0 and result.stdout.strip() == 'true'
+
+    def _exec_sldl(self, cmd: list[str], entry: str) -> tuple[int, deque]:
+        """Run an sldl command inside the sldl container, streaming its output.
+
+        Args:
+            cmd: sldl command arguments
+            entry: Queue entry being processed, used to label the output
+
+        Returns:
+            Tuple of (return code, last lines of combined stdout/stderr)
+
+        Raises:
+            subprocess.TimeoutExpired: If the command ran longer than the entry timeout
+        """
+        return exec_sldl(self._sldl_container, self._docker_prefix, cmd, entry, _ENTRY_TIMEOUT, logger)
 
     def process_queue_entry(self, entry: str) -> bool:
         """Process a single queue entry.
@@ -165,31 +259,23 @@ class QueueProcessor:
             cmd = self.build_sldl_command(entry)
 
             # Execute via docker
-            docker_cmd = [
-                "docker", "exec", "-i", "sldl"
-            ] + cmd
+            docker_cmd = self._docker_prefix + cmd
 
-            logger.info(f"Executing: {' '.join(docker_cmd)}")
+            # Only pay for quoting the command line when it is actually logged
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Executing: %s", shlex.join(docker_cmd))
 
-            # Run the command
-            result = subprocess.run(
-                docker_cmd,
-                capture_output=True,
-                text=True,
-                timeout=3600  # 1 hour timeout per entry
-            )
+            # Run the command; output is logged line by line while it runs
+            returncode, tail = self._exec_sldl(cmd, entry)
 
-            if result.returncode == 0:
+            if returncode == 0:
                 logger.info(f"Successfully processed queue entry: {entry}")
-                if result.stdout:
-                    logger.info(f"Command output: {result.stdout}")
                 return True
             else:
-                logger.error(f"Failed to process queue entry: {entry}")
-                logger.error(f"Return code: {result.returncode}")
-                logger.error(f"Error output: {result.stderr}")
-                logger.error(f"Standard output: {result.stdout}")
-                logger.error(f"Command executed: {' '.join(docker_cmd)}")
+                logger.error("Failed to process queue entry: %s", entry)
+                logger.error("Return code: %s", returncode)
+                logger.error("Last %d lines of output:\n%s", len(tail), "\n".join(tail))
+                logger.error("Command executed: %s", shlex.join(docker_cmd))
                 return False
 
         except subprocess.TimeoutExpired:
@@ -209,13 +295,24 @@ class QueueProcessor:
             return
 
         try:
-            with open(self.backup_file_path, 'a', encoding='utf-8') as f:
-                timestamp = datetime.now().isoformat()
-                f.write(f"# Processed at {timestamp}\n{entry}\n\n")
+            if self._backup_file is None:
+                # Kept open for the rest of the run instead of reopened per entry
+                self._backup_file = open(self.backup_file_path, 'a', encoding='utf-8')
+            timestamp = time.strftime(_DT_FMT)
+            self._backup_file.write(f"# Processed at {timestamp}\n{entry}\n\n")
             logger.debug(f"Backed up processed entry: {entry}")
         except Exception as e:
             logger.warning(f"Failed to backup processed entry: {e}")
 
+    def _close_backup_file(self):
+        """Flush and close the backup file opened by backup_processed_entry()."""
+        if self._backup_file is not None:
+            try:
+                self._backup_file.close()
+            except Exception as e:
+                logger.warning(f"Failed to close backup file: {e}")
+            self._backup_file = None
+
     def remove_processed_entries(self, processed_entries: list[str]):
         """Remove processed entries from the queue file.
 
@@ -225,31 +322,37 @@ class QueueProcessor:
         if not processed_entries:
             return
 
+        processed = frozenset(processed_entries)
+        tmp_path = None
+
         try:
-            # Read current queue file
-            with open(self.queue_file_path, encoding='utf-8') as f:
-                lines = f.readlines()
-
-            # Remove processed entries while preserving comments and formatting
-            remaining_lines = []
-            for line in lines:
-                stripped_line = line.strip()
-                if stripped_line in processed_entries:
-                    # Skip this line (remove it)
-                    logger.debug(f"Removing processed entry: {stripped_line}")
-                    continue
-                else:
-                    # Keep this line
-                    remaining_lines.append(line)
-
-            # Write back the remaining lines
-            with open(self.queue_file_path, 'w', encoding='utf-8') as f:
-                f.writelines(remaining_lines)
+            # Stream the queue into a temp file next to it, then swap it in
+            # atomically so a crash never leaves a half-written queue
+            with open(self.queue_file_path, encoding='utf-8') as src, \
+                    tempfile.NamedTemporaryFile('w', dir=self.queue_file_path.parent, delete=False,
+                                                encoding='utf-8', prefix=f'.{self.queue_file_path.name}.') as dst:
+                tmp_path = dst.name
+                for line in src:
+                    stripped_line = line.strip()
+                    if stripped_line in processed:
+                        # Skip this line (remove it)
+                        logger.debug(f"Removing processed entry: {stripped_line}")
+                        continue
+                    # Keep comments, formatting and unprocessed entries
+                    dst.write(line)
+
+            # NamedTemporaryFile is created 0600; keep the queue's own permissions
+            os.chmod(tmp_path, self.queue_file_path.stat().st_mode & 0o7777)
+            os.replace(tmp_path, self.queue_file_path)
+            tmp_path = None
 
             logger.info(f"Removed {len(processed_entries)} processed entries from queue file")
 
         except Exception as e:
             logger.error(f"Error removing processed entries from queue file: {e}")
+        finally:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
 
     def process_all_entries(self) -> dict[str, Any]:
         """Process all entries in the download queue.
@@ -267,6 +370,7 @@ class QueueProcessor:
             logger.warning("Could not acquire queue processing lock - another process may be running")
             return {'status': 'locked', 'processed': 0, 'failed': 0}
 
+        docker_client = None
         try:
             entries = self.read_queue_entries()
 
@@ -276,25 +380,39 @@ class QueueProcessor:
 
             logger.info(f"Starting to process {len(entries)} queue entries")
 
+            # One daemon connection for the whole batch instead of a docker CLI process per entry
+            docker_client, self._sldl_container = self._connect_sldl_container()
+
+            # Fail fast instead of letting every entry fail against a stopped container
+            if not self._sldl_running():
+                logger.error(f"The {SLDL_CONTAINER} container is not running - leaving {len(entries)} entries queued")
+                return {'status': 'docker_unavailable', 'processed': 0, 'failed': 0}
+
             processed = 0
             failed = 0
             processed_entries = []
-            results = []
-
-            for entry in entries:
-                success = self.process_queue_entry(entry)
-                if success:
-                    processed += 1
-                    processed_entries.append(entry)
-                    # Backup the processed entry
-                    self.backup_processed_entry(entry)
-                else:
-                    failed += 1
-
-                results.append({
-                    'entry': entry,
-                    'success': success
-                })
+            successes = [False] * len(entries)
+
+            # Entries are independent downloads, but every sldl run logs in to the same
+            # Soulseek account, so entries run one at a time unless max_concurrency opts in.
+            # Results and backups are handled on this thread only, so no locking is needed.
+            max_workers = max(1, int(self.queue_config.get('settings', {}).get('max_concurrency', 1)))
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(entries))) as executor:
+                futures = {executor.submit(self.process_queue_entry, entry): i for i, entry in enumerate(entries)}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    entry = entries[i]
+                    successes[i] = future.result()
+                    if successes[i]:
+                        processed += 1
+                        processed_entries.append(entry)
+                        # Backup the processed entry
+                        self.backup_processed_entry(entry)
+                    else:
+                        failed += 1
+
+            # Backups must be on disk before the entries leave the queue
+            self._close_backup_file()
 
             # Remove successfully processed entries from queue file
             if processed_entries:
@@ -307,10 +425,17 @@ class QueueProcessor:
                 'processed': processed,
                 'failed': failed,
                 'total': len(entries),
-                'results': results
+                'results': [
+                    {'entry': entry, 'success': success}
+                    for entry, success in zip(entries, successes, strict=True)
+                ]
             }
 
         finally:
+            self._close_backup_file()
+            if docker_client is not None:
+                docker_client.close()
+            self._sldl_container = None
             self.release_lock(lock_file)
 
 
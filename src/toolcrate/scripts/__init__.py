@@ -1,10 +1,28 @@
 """Scripts package for toolcrate utilities."""
 
-# This file is intentionally empty to make the directory a proper Python package.
-
-# Import key modules for easy access
-from .cron_manager import (
-    add_identify_tracks_cron,
-    list_identify_tracks_crons,
-    remove_identify_tracks_cron,
-)
+import importlib
+
+# Key functions for easy access, imported from their submodules on first use so
+# that importing e.g. toolcrate.scripts.process_wishlist does not load cron_manager
+_LAZY = {
+    'add_identify_tracks_cron': 'cron_manager',
+    'list_identify_tracks_crons': 'cron_manager',
+    'remove_identify_tracks_cron': 'cron_manager',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    # Cache as a real module global so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
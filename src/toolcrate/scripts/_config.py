@@ -0,0 +1,66 @@
+"""Shared toolcrate.conf reader for the cron and wishlist scripts."""
+
+import logging
+import os
+import re
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# A `key = value` line; keys can't start with '#', surrounding whitespace is dropped
+_CFG_RE = re.compile(r"^[ \t]*([^#=\s][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.MULTILINE)
+
+# Defaults for keys missing from the config file, expanded once at import
+_DEFAULT_CONFIG = {
+    "download-path": os.path.expanduser("~/Music/downloads/sldl"),
+    "wishlist": os.path.expanduser("~/Music/downloads/sldl/wishlist.txt"),
+    "dj-sets": os.path.expanduser("~/Music/downloads/sldl/dj-sets.txt"),
+}
+
+# Parsed config files keyed by absolute path: (st_mtime_ns, st_size, config)
+_CONFIG_CACHE: dict[str, tuple[int, int, dict]] = {}
+
+def invalidate_config_cache():
+    """Forget every cached config file so the next read re-parses it."""
+    _CONFIG_CACHE.clear()
+
+def read_config_file(config_file=None, warn_missing=False):
+    """Read configuration from a config file.
+
+    Args:
+        config_file: Path to config file. If None or missing, the defaults are returned.
+        warn_missing: Log a missing config file as a warning rather than at debug level.
+
+    Returns:
+        Dict with configuration values.
+    """
+    config = _DEFAULT_CONFIG.copy()
+
+    try:
+        st = os.stat(config_file) if config_file else None
+    except OSError:
+        st = None
+
+    if st is not None:
+        # Reuse the parsed result while the file's mtime and size are unchanged
+        cache_key = os.path.abspath(config_file)
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return dict(cached[2])
+
+        logger.info(f"Reading configuration from {config_file}")
+        # One regex scan yields every key = value pair; comments and blank lines never match
+        for key, value in _CFG_RE.findall(Path(config_file).read_text()):
+            # Expand user paths (~/...)
+            if key in ["download-path", "wishlist", "dj-sets"] and '~' in value:
+                value = os.path.expanduser(value)
+
+            config[key] = value
+
+        _CONFIG_CACHE[cache_key] = (st.st_mtime_ns, st.st_size, dict(config))
+    elif warn_missing:
+        logger.warning(f"Config file {config_file} not found, using defaults")
+    else:
+        logger.debug("Config file not found, using defaults")
+
+    return config
@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 """Manage cron jobs for toolcrate commands."""
 
+import functools
 import logging
 import os
+import re
 import shutil
 import subprocess
-import tempfile
 from pathlib import Path
 
+from . import _config
+from ._config import invalidate_config_cache
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -16,29 +20,81 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def find_command_path(command):
-    """Find the full path to a command executable."""
+@functools.lru_cache(maxsize=32)
+def find_command_path(command: str) -> str | None:
+    """Find the full path to a command executable.
+
+    The PATH lookup is cached for the life of the process.
+    """
     return shutil.which(command)
 
-def check_crontab_for_job(job_identifier):
-    """Check if a job with the given identifier already exists in crontab."""
+def _read_crontab():
+    """Read the current user's crontab once.
+
+    The crontab is returned as raw bytes: callers only search and split it, so
+    decoding is left to the places that display it.
+
+    Returns:
+        The crontab bytes, or None if the user has no crontab or it can't be read.
+    """
     try:
         result = subprocess.run(
             ["crontab", "-l"],
             capture_output=True,
-            text=True,
             check=False
         )
-
-        if result.returncode != 0:
-            # No crontab for user or other error
-            return False
-
-        # Check if the job identifier exists in the crontab
-        return job_identifier in result.stdout
     except Exception as e:
         logger.error(f"Error checking crontab: {e}")
+        return None
+
+    if result.returncode != 0:
+        # No crontab for user or other error
+        return None
+    return result.stdout
+
+def _install_crontab(content):
+    """Replace the current user's crontab, piping the new content (bytes) to `crontab -`."""
+    subprocess.run(
+        ["crontab", "-"],
+        input=content,
+        check=True
+    )
+
+def check_crontab_for_jobs(job_identifiers):
+    """Check several job identifiers against a single read of the crontab.
+
+    Returns:
+        Dict mapping each identifier to whether it appears in the crontab.
+    """
+    current_crontab = _read_crontab() or b""
+    return {job_id: job_id.encode() in current_crontab for job_id in job_identifiers}
+
+def check_crontab_for_job(job_identifier):
+    """Check if a job with the given identifier already exists in crontab."""
+    current_crontab = _read_crontab()
+    # Empty or missing crontab: nothing to search
+    if not current_crontab:
         return False
+    return job_identifier.encode() in current_crontab
+
+@functools.lru_cache(maxsize=8)
+def _find_project_config(start: str) -> Path | None:
+    """Find the nearest toolcrate.conf at or above ``start``.
+
+    The parent walk is cached per starting directory for the life of the process.
+    """
+    current_dir = Path(start)
+    while current_dir != current_dir.parent:
+        if (current_dir / "toolcrate.conf").exists():
+            return current_dir / "toolcrate.conf"
+        current_dir = current_dir.parent
+    return None
+
+def reset_caches():
+    """Clear the command path and config caches (mainly for tests)."""
+    find_command_path.cache_clear()
+    _find_project_config.cache_clear()
+    invalidate_config_cache()
 
 def read_config_file(config_file=None):
     """Read configuration from a config file.
@@ -49,12 +105,6 @@ def read_config_file(config_file=None):
     Returns:
         Dict with configuration values.
     """
-    config = {
-        "download-path": os.path.expanduser("~/Music/downloads/sldl"),
-        "wishlist": os.path.expanduser("~/Music/downloads/sldl/wishlist.txt"),
-        "dj-sets": os.path.expanduser("~/Music/downloads/sldl/dj-sets.txt"),
-    }
-
     if config_file is None:
         # Look for config in the home directory first, then project root
         home_config = os.path.expanduser("~/.config/toolcrate/toolcrate.conf")
@@ -62,37 +112,9 @@ def read_config_file(config_file=None):
             config_file = home_config
         else:
             # Try to find project root
-            current_dir = Path.cwd()
-            while current_dir != current_dir.parent:
-                if (current_dir / "toolcrate.conf").exists():
-                    config_file = current_dir / "toolcrate.conf"
-                    break
-                current_dir = current_dir.parent
-
-    if config_file and os.path.exists(config_file):
-        logger.info(f"Reading configuration from {config_file}")
-        with open(config_file) as f:
-            for line in f:
-                line = line.strip()
-                # Skip comments and empty lines
-                if not line or line.startswith('#'):
-                    continue
-
-                # Parse key-value pairs
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # Expand user paths (~/...)
-                    if key in ["download-path", "wishlist", "dj-sets"] and '~' in value:
-                        value = os.path.expanduser(value)
-
-                    config[key] = value
-    else:
-        logger.debug("Config file not found, using defaults")
+            config_file = _find_project_config(os.getcwd())
 
-    return config
+    return _config.read_config_file(config_file)
 
 def add_identify_tracks_cron(file_type, frequency="hourly"):
     """Add a cron job to run identify-tracks with the specified file type and frequency.
@@ -107,8 +129,11 @@ def add_identify_tracks_cron(file_type, frequency="hourly"):
     # Job identifier for comments in crontab
     job_id = f"# toolcrate-identify-{file_type}"
 
+    # Read the crontab once; it is both checked and extended below
+    current_crontab = _read_crontab() or b""
+
     # Check if the job already exists
-    if check_crontab_for_job(job_id):
+    if job_id.encode() in current_crontab:
         print(f"A cron job for identify-{file_type} already exists. Remove it first if you want to change it.")
         return False
 
@@ -132,37 +157,13 @@ def add_identify_tracks_cron(file_type, frequency="hourly"):
     # Create the full cron command
     cron_cmd = f"{schedule} {toolcrate_path} identify-tracks --file-type {file_type} download > /tmp/toolcrate-identify-{file_type}.log 2>&1"
 
-    # Get current crontab
     try:
-        result = subprocess.run(
-            ["crontab", "-l"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        # Build the new crontab in memory
+        if current_crontab and not current_crontab.endswith(b'\n'):
+            current_crontab += b'\n'
 
-        current_crontab = result.stdout if result.returncode == 0 else ""
-
-        # Create a temporary file with the new crontab
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp:
-            if current_crontab:
-                temp.write(current_crontab)
-                if not current_crontab.endswith('\n'):
-                    temp.write('\n')
-
-            # Add the new job with comments
-            temp.write(f"{job_id}\n")
-            temp.write(f"{cron_cmd}\n")
-            temp_path = temp.name
-
-        # Install the new crontab
-        subprocess.run(
-            ["crontab", temp_path],
-            check=True
-        )
-
-        # Remove the temporary file
-        os.unlink(temp_path)
+        # Add the new job with comments
+        _install_crontab(current_crontab + f"{job_id}\n{cron_cmd}\n".encode())
 
         print(f"Successfully added cron job to run identify-tracks for {file_type} {frequency}:")
         print(f"Schedule: {schedule}")
@@ -187,8 +188,11 @@ def add_download_wishlist_cron(frequency="hourly"):
     # Job identifier for comments in crontab
     job_id = "# toolcrate-download-wishlist"
 
+    # Read the crontab once; it is both checked and extended below
+    current_crontab = _read_crontab() or b""
+
     # Check if the job already exists
-    if check_crontab_for_job(job_id):
+    if job_id.encode() in current_crontab:
         print("A cron job for download-wishlist already exists. Remove it first if you want to change it.")
         return False
 
@@ -219,37 +223,13 @@ def add_download_wishlist_cron(frequency="hourly"):
     # Create the full cron command
     cron_cmd = f"{schedule} {toolcrate_path} sldl --links-file {wishlist_path} > /tmp/toolcrate-download-wishlist.log 2>&1"
 
-    # Get current crontab
     try:
-        result = subprocess.run(
-            ["crontab", "-l"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-
-        current_crontab = result.stdout if result.returncode == 0 else ""
-
-        # Create a temporary file with the new crontab
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp:
-            if current_crontab:
-                temp.write(current_crontab)
-                if not current_crontab.endswith('\n'):
-                    temp.write('\n')
+        # Build the new crontab in memory
+        if current_crontab and not current_crontab.endswith(b'\n'):
+            current_crontab += b'\n'
 
-            # Add the new job with comments
-            temp.write(f"{job_id}\n")
-            temp.write(f"{cron_cmd}\n")
-            temp_path = temp.name
-
-        # Install the new crontab
-        subprocess.run(
-            ["crontab", temp_path],
-            check=True
-        )
-
-        # Remove the temporary file
-        os.unlink(temp_path)
+        # Add the new job with comments
+        _install_crontab(current_crontab + f"{job_id}\n{cron_cmd}\n".encode())
 
         print(f"Successfully added cron job to download wishlist items {frequency}:")
         print(f"Schedule: {schedule}")
@@ -263,6 +243,18 @@ def add_download_wishlist_cron(frequency="hourly"):
         print(f"Error setting up cron job: {e}")
         return False
 
+# A "# toolcrate-<job>" marker line and the cron command on the line after it
+_JOB_RE = re.compile(r"^[ \t]*# toolcrate-(\S+)[ \t\r]*\n(.+)", re.MULTILINE)
+
+def _without_job(lines, job_id):
+    """Yield crontab lines, dropping each job_id marker line and the command after it."""
+    lines = iter(lines)
+    for line in lines:
+        if job_id in line:
+            next(lines, None)
+            continue
+        yield line
+
 def remove_scheduled_job(job_type):
     """Remove a cron job for the specified type.
 
@@ -290,46 +282,20 @@ def remove_scheduled_job(job_type):
             print(f"Unknown job type: {job_type}")
             return False
 
+    # Read the crontab once; it is both checked and filtered below
+    current_crontab = _read_crontab()
+
     # Check if the job exists
-    if not check_crontab_for_job(job_id):
+    job_id = job_id.encode()
+    if current_crontab is None or job_id not in current_crontab:
         print(f"No cron job found for {job_type}.")
         return False
 
-    # Get current crontab
     try:
-        result = subprocess.run(
-            ["crontab", "-l"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-
-        current_crontab = result.stdout
-
-        # Create a temporary file with the modified crontab
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp:
-            # Skip the job we want to remove and the line after it
-            lines = current_crontab.splitlines()
-            i = 0
-            while i < len(lines):
-                if job_id in lines[i]:
-                    # Skip this line and the next (the actual command)
-                    i += 2
-                    continue
-
-                temp.write(lines[i] + '\n')
-                i += 1
-
-            temp_path = temp.name
-
-        # Install the new crontab
-        subprocess.run(
-            ["crontab", temp_path],
-            check=True
-        )
-
-        # Remove the temporary file
-        os.unlink(temp_path)
+        # Build the modified crontab in memory, skipping the job we want to
+        # remove and the line after it
+        kept = list(_without_job(current_crontab.splitlines(), job_id))
+        _install_crontab(b'\n'.join(kept) + b'\n' if kept else b'')
 
         print(f"Successfully removed cron job for {job_type}.")
         return True
@@ -346,61 +312,49 @@ def list_scheduled_jobs():
         bool: True if successful, False otherwise
     """
     try:
-        result = subprocess.run(
-            ["crontab", "-l"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        current_crontab = _read_crontab()
 
-        if result.returncode != 0:
+        if current_crontab is None:
             print("No crontab found for current user.")
             return True
 
-        current_crontab = result.stdout
+        # Most crontabs carry no toolcrate jobs; skip decoding and splitting them
+        if b"# toolcrate-" not in current_crontab:
+            print("No toolcrate scheduled jobs found.")
+            return True
 
-        # Look for toolcrate jobs
+        # Look for toolcrate jobs: one scan pairs each marker with its command line
         found = False
-        lines = current_crontab.splitlines()
-        i = 0
 
         print("Toolcrate scheduled jobs:")
         print("----------------------------------")
 
-        while i < len(lines):
-            line = lines[i]
-            if "# toolcrate-" in line and i + 1 < len(lines):
-                job_type = line.replace("# toolcrate-", "").strip()
-                cron_cmd = lines[i + 1]
-
-                # Extract schedule
-                schedule_parts = cron_cmd.split()[:5]
-                schedule = " ".join(schedule_parts)
-
-                # Format job type for display
-                if job_type == "identify-wishlist":
-                    display_type = "Identify tracks (wishlist)"
-                    command_type = "identify-tracks --file-type wishlist"
-                elif job_type == "identify-dj-sets":
-                    display_type = "Identify tracks (DJ sets)"
-                    command_type = "identify-tracks --file-type dj-sets"
-                elif job_type == "download-wishlist":
-                    display_type = "Download wishlist items"
-                    command_type = "download-wishlist"
-                else:
-                    display_type = job_type
-                    command_type = job_type
-
-                print(f"Type: {display_type}")
-                print(f"Job Type (for removal): {command_type}")
-                print(f"Schedule: {schedule}")
-                print(f"Command: {' '.join(cron_cmd.split()[5:])}")
-                print("----------------------------------")
-
-                found = True
-                i += 2
+        for job_type, cron_cmd in _JOB_RE.findall(current_crontab.decode(errors="replace")):
+            # Extract schedule
+            schedule_parts = cron_cmd.split()[:5]
+            schedule = " ".join(schedule_parts)
+
+            # Format job type for display
+            if job_type == "identify-wishlist":
+                display_type = "Identify tracks (wishlist)"
+                command_type = "identify-tracks --file-type wishlist"
+            elif job_type == "identify-dj-sets":
+                display_type = "Identify tracks (DJ sets)"
+                command_type = "identify-tracks --file-type dj-sets"
+            elif job_type == "download-wishlist":
+                display_type = "Download wishlist items"
+                command_type = "download-wishlist"
             else:
-                i += 1
+                display_type = job_type
+                command_type = job_type
+
+            print(f"Type: {display_type}")
+            print(f"Job Type (for removal): {command_type}")
+            print(f"Schedule: {schedule}")
+            print(f"Command: {' '.join(cron_cmd.split()[5:])}")
+            print("----------------------------------")
+
+            found = True
 
         if not found:
             print("No toolcrate scheduled jobs found.")
@@ -2,13 +2,18 @@
 """Process wishlist or DJ sets file and run shazam-tool on each entry."""
 
 import argparse
+import functools
 import logging
 import os
+import re
 import subprocess
 import sys
+import tempfile
 import time
 from pathlib import Path
 
+from . import _config
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -17,8 +22,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1)
 def get_project_root():
-    """Get the project root directory."""
+    """Get the project root directory.
+
+    The location of this module doesn't change, so the walk runs once per process.
+    """
     # Start from the current file's directory
     current_dir = Path(os.path.dirname(os.path.abspath(__file__)))
 
@@ -31,6 +40,9 @@ def get_project_root():
     # Fallback to package directory
     return Path(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+# Error output that indicates the upstream service is throttling us
+_RATE_LIMIT_RE = re.compile(r"\b429\b|rate[ -]?limit|too many requests", re.IGNORECASE)
+
 def read_config_file(config_file=None):
     """Read configuration from a config file.
 
@@ -40,39 +52,153 @@ def read_config_file(config_file=None):
     Returns:
         Dict with configuration values.
     """
-    config = {
-        "download-path": os.path.expanduser("~/Music/downloads/sldl"),
-        "wishlist": os.path.expanduser("~/Music/downloads/sldl/wishlist.txt"),
-        "dj-sets": os.path.expanduser("~/Music/downloads/sldl/dj-sets.txt"),
-    }
-
     if config_file is None:
         config_file = get_project_root() / "toolcrate.conf"
 
-    if os.path.exists(config_file):
-        logger.info(f"Reading configuration from {config_file}")
-        with open(config_file) as f:
-            for line in f:
-                line = line.strip()
-                # Skip comments and empty lines
-                if not line or line.startswith('#'):
-                    continue
-
-                # Parse key-value pairs
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
+    return _config.read_config_file(config_file, warn_missing=True)
 
-                    # Expand user paths (~/...)
-                    if key in ["download-path", "wishlist", "dj-sets"] and '~' in value:
-                        value = os.path.expanduser(value)
+def _run_command(cmd, show_output):
+    """Run one shazam-tool command for a single item.
 
-                    config[key] = value
-    else:
-        logger.warning(f"Config file {config_file} not found, using defaults")
+    Args:
+        cmd: Full toolcrate shazam-tool command line
+        show_output: Show the tool's output on the terminal instead of logging it
 
-    return config
+    Returns:
+        CompletedProcess with the exit code (and stderr when not shown)
+    """
+    if show_output:
+        # Show real-time output for DJ sets
+        return subprocess.run(
+            cmd,
+            text=True,
+            check=False  # Don't raise exception on non-zero exit
+        )
+
+    # Run silently for wishlist: stdout is streamed to the debug log (or
+    # discarded when debug is off) and stderr is spooled to a temp file,
+    # so neither is held in memory
+    log_stdout = logger.isEnabledFor(logging.DEBUG)
+    with tempfile.TemporaryFile(mode='w+') as stderr_file:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE if log_stdout else subprocess.DEVNULL,
+            stderr=stderr_file,
+            text=True,
+            bufsize=1
+        )
+        if log_stdout:
+            with proc.stdout:
+                for line in proc.stdout:
+                    logger.debug(f"Command output: {line.rstrip()}")
+        returncode = proc.wait()
+
+        # Only read stderr back when it is going to be logged
+        stderr = ""
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+    return subprocess.CompletedProcess(cmd, returncode, stderr=stderr)
+
+def _is_rate_limited(result, show_output):
+    """Decide whether a failed item looks like upstream rate limiting.
+
+    Output shown on the terminal is not captured, so there every failure is
+    treated as a possible throttle.
+    """
+    if result.returncode == 0:
+        return False
+    if show_output:
+        return True
+    return _RATE_LIMIT_RE.search(result.stderr or "") is not None
+
+@functools.lru_cache(maxsize=1)
+def _batch_supported():
+    """Check once per process whether `toolcrate shazam-tool` has the batch worker."""
+    try:
+        result = subprocess.run(
+            ["toolcrate", "shazam-tool", "--help"],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0 and re.search(r"^\s+batch\b", result.stdout, re.MULTILINE) is not None
+
+class _ShazamWorker:
+    """A single `toolcrate shazam-tool batch` process that items are fed to over stdin."""
+
+    # Set once the worker stops reporting statuses; it must not be fed more items
+    dead = False
+
+    def __init__(self, command, extra_args, show_output):
+        # The tool's output arrives on the worker's stderr: straight to the
+        # terminal for DJ sets, otherwise into a temp file that is sliced per item
+        self._output = None if show_output else tempfile.TemporaryFile()
+        self.proc = subprocess.Popen(
+            ["toolcrate", "shazam-tool", "batch", command, *extra_args],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._output,
+            text=True,
+            bufsize=1
+        )
+
+    def _output_size(self):
+        return os.fstat(self._output.fileno()).st_size if self._output is not None else 0
+
+    def run(self, item):
+        """Process one item and wait for its exit code.
+
+        Returns:
+            CompletedProcess with the item's exit code and, for failures, its
+            output as stderr; None if the item could not be handed to the worker
+        """
+        start = self._output_size()
+        try:
+            self.proc.stdin.write(f"{item}\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            self.dead = True
+            return None
+        status = self.proc.stdout.readline()
+        if not status.strip().lstrip('-').isdigit():
+            # The worker already has the item and may still finish it, so it is
+            # failed here rather than handed back to be run (and downloaded) twice
+            self.dead = True
+            return subprocess.CompletedProcess(
+                self.proc.args, 1, stderr=f"shazam-tool batch worker stopped without a status for {item}"
+            )
+        returncode = int(status)
+
+        stderr = ""
+        if self._output is not None and (returncode != 0 or logger.isEnabledFor(logging.DEBUG)):
+            end = self._output_size()
+            output = os.pread(self._output.fileno(), end - start, start).decode('utf-8', errors='replace')
+            for line in output.splitlines():
+                logger.debug(f"Command output: {line}")
+            if returncode != 0:
+                stderr = output
+        return subprocess.CompletedProcess(self.proc.args, returncode, stderr=stderr)
+
+    def close(self):
+        """Stop the worker once its queue of items is done."""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        self.proc.wait()
+        if self._output is not None:
+            self._output.close()
+
+def _iter_items(file_path):
+    """Yield the stripped, non-empty, non-comment lines of a wishlist file."""
+    with open(file_path) as f:
+        for line in f:
+            if (item := line.strip()) and not item.startswith('#'):
+                yield item
 
 def process_file(args):
     """Process each line in the specified file with shazam-tool."""
@@ -108,74 +234,88 @@ def process_file(args):
     logger.info(f"Processing {file_type_name} from {file_path}")
     logger.info(f"Log file: {log_file}")
 
-    # Read the file
-    with open(file_path) as f:
-        lines = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+    # Count the items up front for progress display, then stream them again
+    # below rather than holding the whole file in memory
+    total = sum(1 for _ in _iter_items(file_path))
 
-    logger.info(f"Found {len(lines)} items in {file_type_name}")
+    logger.info(f"Found {total} items in {file_type_name}")
 
     success_count = 0
     failed_count = 0
+    sleep_for = 0
+
+    # Feed every item to one long-running shazam-tool worker when the installed
+    # toolcrate supports it, instead of starting toolcrate once per item
+    worker = None
+    if args.command and _batch_supported():
+        worker = _ShazamWorker(args.command, args.extra_args or [], show_output)
+
+    try:
+        for i, item in enumerate(_iter_items(file_path)):
+            logger.info(f"Processing item {i+1}/{total}: {item}")
+            try:
+                if show_output:
+                    print(f"\n=== Processing item {i+1}/{total}: {item} ===")
 
-    for i, item in enumerate(lines):
-        logger.info(f"Processing item {i+1}/{len(lines)}: {item}")
-        try:
-            # Run toolcrate shazam-tool command
-            cmd = ["toolcrate", "shazam-tool"]
-
-            # Add additional arguments if provided
-            if args.command:
-                cmd.append(args.command)
-
-            # Add the item from file
-            cmd.append(item)
-
-            # Add any additional arguments
-            if args.extra_args:
-                cmd.extend(args.extra_args)
-
-            logger.info(f"Running command: {' '.join(cmd)}")
-
-            # Execute the command
-            if show_output:
-                # Show real-time output for DJ sets
-                print(f"\n=== Processing item {i+1}/{len(lines)}: {item} ===")
-                result = subprocess.run(
-                    cmd,
-                    text=True,
-                    check=False  # Don't raise exception on non-zero exit
-                )
-                # Log the return code
-                logger.info(f"Command exited with code: {result.returncode}")
-            else:
-                # Capture output silently for wishlist
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    check=False  # Don't raise exception on non-zero exit
-                )
-                # Log detailed output
-                logger.debug(f"Command output: {result.stdout}")
-
-            if result.returncode == 0:
-                logger.info(f"Successfully processed: {item}")
-                success_count += 1
-            else:
-                logger.error(f"Failed to process: {item}")
-                if not show_output and hasattr(result, 'stderr'):
-                    logger.error(f"Error: {result.stderr}")
-                failed_count += 1
+                result = None
+                if worker is not None:
+                    result = worker.run(item)
+                    if worker.dead:
+                        logger.warning("shazam-tool batch worker exited, running remaining items one by one")
+                        # Waits for the worker, so nothing it still holds overlaps the fallback runs
+                        worker.close()
+                        worker = None
 
-            # Add delay between requests to avoid rate limiting
-            if i < len(lines) - 1:  # Don't delay after the last item
-                if show_output:
-                    print(f"Waiting {args.delay} seconds before next item...")
-                time.sleep(args.delay)
+                if result is None:
+                    # Run toolcrate shazam-tool command
+                    cmd = ["toolcrate", "shazam-tool"]
 
-        except Exception as e:
-            logger.error(f"Error processing item {item}: {e}")
-            failed_count += 1
+                    # Add additional arguments if provided
+                    if args.command:
+                        cmd.append(args.command)
+
+                    # Add the item from file
+                    cmd.append(item)
+
+                    # Add any additional arguments
+                    if args.extra_args:
+                        cmd.extend(args.extra_args)
+
+                    logger.info(f"Running command: {' '.join(cmd)}")
+                    result = _run_command(cmd, show_output)
+
+                if show_output:
+                    # Log the return code
+                    logger.info(f"Command exited with code: {result.returncode}")
+
+                if result.returncode == 0:
+                    logger.info(f"Successfully processed: {item}")
+                    success_count += 1
+                else:
+                    logger.error(f"Failed to process: {item}")
+                    if not show_output and hasattr(result, 'stderr'):
+                        logger.error(f"Error: {result.stderr}")
+                    failed_count += 1
+
+                # Only pause when the service is throttling: the delay doubles (from
+                # --delay up to 8x --delay) after a rate-limited item and halves
+                # after each success
+                if _is_rate_limited(result, show_output):
+                    sleep_for = min(max(sleep_for * 2, args.delay), args.delay * 8)
+                elif result.returncode == 0:
+                    sleep_for //= 2
+
+                if sleep_for and i < total - 1:  # Don't delay after the last item
+                    if show_output:
+                        print(f"Waiting {sleep_for} seconds before next item...")
+                    time.sleep(sleep_for)
+
+            except Exception as e:
+                logger.error(f"Error processing item {item}: {e}")
+                failed_count += 1
+    finally:
+        if worker is not None:
+            worker.close()
 
     # Print summary
     logger.info(f"Processing complete: {success_count} succeeded, {failed_count} failed")
@@ -192,7 +332,8 @@ def main():
     parser.add_argument("command", nargs="?", default="download",
                        help="Shazam-tool command to run (default: download)")
     parser.add_argument("--delay", type=int, default=5,
-                       help="Delay in seconds between processing items (default: 5)")
+                       help="Initial delay in seconds after a rate-limited item, doubled up to 8x "
+                            "while throttling continues (default: 5)")
     parser.add_argument("extra_args", nargs="*",
                        help="Additional arguments to pass to the shazam-tool command")
 
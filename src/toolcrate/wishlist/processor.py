@@ -1,20 +1,85 @@
 #!/usr/bin/env python3
 """Wishlist processor for ToolCrate scheduled downloads."""
 
+import hashlib
 import logging
+import logging.handlers
 import os
+import re
+import shlex
 import subprocess
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
+from .._sldl_exec import (
+    OUTPUT_LOG_FORMAT,
+    SLDL_CONTAINER,
+    connect_sldl_container,
+    exec_sldl,
+)
 from ..config.manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Shared sldl index used when indexes are not kept in each playlist folder
+_GLOBAL_INDEX_PATH = "/data/wishlist-index.sldl"
+# Per-entry timeout in seconds
+_ENTRY_TIMEOUT = 3600
+# List file handed to sldl in batch mode, written to the config dir mounted at /config
+_BATCH_FILE_NAME = "wishlist-batch.txt"
+# Bytes read from the end of sldl.log for the post-run summary
+_LOG_TAIL_BYTES = 64 * 1024
+# sldl.log lines the summary cares about, classified in a single search.
+# Note: slsk-batchdl has a typo "Succeded"
+_LOG_SUMMARY_RE = re.compile(
+    r"(?P<ok>Succee?ded:)|(?P<fail>Failed:|SearchAndDownloadException)|(?P<done>Completed: (?=.*succeeded))"
+)
+# Log records buffered by the command-line entry point before they are written
+_LOG_BUFFER_RECORDS = 512
+# Example content for a newly created wishlist file
+_WISHLIST_TEMPLATE = (
+    b"# ToolCrate Wishlist File\n"
+    b"# Add playlist URLs or search terms, one per line\n"
+    b"# Examples:\n"
+    b"# https://open.spotify.com/playlist/your-playlist-id\n"
+    b"# https://youtube.com/playlist?list=your-playlist-id\n"
+    b"# \"Artist Name - Song Title\"\n"
+    b"# artist:\"Artist Name\" album:\"Album Name\"\n"
+    b"\n"
+)
+
+
+def _list_line(entry: str) -> str:
+    """Render an entry as one line of an sldl list file.
+
+    sldl splits list lines on whitespace into input, conditions and preferred
+    conditions, so the entry is quoted as a single input unless it is already
+    written in quoted list syntax.
+    """
+    if len(entry) >= 2 and entry.startswith('"') and entry.endswith('"'):
+        return entry
+    return '"' + entry.replace('"', '\\"') + '"'
+
+
+class _ProgressFlushingHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that batches sldl output lines but writes anything else out at once."""
+
+    def shouldFlush(self, record):
+        return super().shouldFlush(record) or record.msg != OUTPUT_LOG_FORMAT
+
 
 class WishlistProcessor:
     """Processes wishlist.txt file for scheduled downloads."""
 
+    # Resolved wishlist path and whether it is known to exist, computed on first use
+    _wishlist_path: Path | None = None
+    _wishlist_ensured = False
+    # Docker SDK handle for the sldl container, set for the duration of process_all_entries
+    _sldl_container = None
+
     def __init__(self, config_manager: ConfigManager | None = None):
         """Initialize the wishlist processor.
 
@@ -25,119 +90,179 @@ class WishlistProcessor:
         self.config = self.config_manager.config
         self.wishlist_config = self.config.get('wishlist', {})
 
+        # Concurrent runs must not share the global index file, so each entry gets its own
+        self._per_entry_index = (
+            not self.wishlist_config.get('index_in_playlist_folder', True)
+            and self._max_concurrency() > 1
+            and not self.wishlist_config.get('batch_mode', False)
+        )
+
+        # The sldl flags only depend on the wishlist config, so build them once
+        self._sldl_prefix = ["sldl", "-c", "/config/sldl-wishlist.conf"]
+        self._sldl_suffix = self._build_sldl_suffix()
+        self._docker_prefix = ["docker", "exec", "-i", SLDL_CONTAINER]
+
+    def _max_concurrency(self) -> int:
+        """Number of wishlist entries allowed to run at once.
+
+        Every sldl run logs in to the same Soulseek account, so entries run one
+        at a time unless ``settings.max_concurrency`` opts in.
+        """
+        return max(1, int(self.wishlist_config.get('settings', {}).get('max_concurrency', 1)))
+
     def get_wishlist_file_path(self) -> Path:
         """Get the path to the wishlist file."""
-        wishlist_path = self.wishlist_config.get('file_path', 'config/wishlist.txt')
-        if not os.path.isabs(wishlist_path):
-            # Make relative to project root
-            project_root = self.config_manager.config_dir.parent
-            return project_root / wishlist_path
-        return Path(wishlist_path)
+        if self._wishlist_path is None:
+            wishlist_path = self.wishlist_config.get('file_path', 'config/wishlist.txt')
+            if not os.path.isabs(wishlist_path):
+                # Make relative to project root
+                project_root = self.config_manager.config_dir.parent
+                self._wishlist_path = project_root / wishlist_path
+            else:
+                self._wishlist_path = Path(wishlist_path)
+        return self._wishlist_path
 
     def ensure_wishlist_file_exists(self) -> Path:
         """Ensure the wishlist file exists, create if it doesn't."""
         wishlist_path = self.get_wishlist_file_path()
+        if self._wishlist_ensured:
+            return wishlist_path
 
         if not wishlist_path.exists():
             # Create the file with example content
             wishlist_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(wishlist_path, 'w') as f:
-                f.write("# ToolCrate Wishlist File\n")
-                f.write("# Add playlist URLs or search terms, one per line\n")
-                f.write("# Examples:\n")
-                f.write("# https://open.spotify.com/playlist/your-playlist-id\n")
-                f.write("# https://youtube.com/playlist?list=your-playlist-id\n")
-                f.write("# \"Artist Name - Song Title\"\n")
-                f.write("# artist:\"Artist Name\" album:\"Album Name\"\n")
-                f.write("\n")
-            logger.info(f"Created wishlist file at {wishlist_path}")
+            wishlist_path.write_bytes(_WISHLIST_TEMPLATE)
+            logger.info("Created wishlist file at %s", wishlist_path)
 
+        self._wishlist_ensured = True
         return wishlist_path
 
-    def read_wishlist_entries(self) -> list[str]:
-        """Read and parse wishlist entries from the file."""
+    def iter_wishlist_entries(self) -> Iterator[str]:
+        """Yield wishlist entries from the file as it is read.
+
+        Yields:
+            Non-empty, non-comment lines of the wishlist, stripped
+        """
         wishlist_path = self.ensure_wishlist_file_exists()
+        # Checked once, so the per-line debug message costs nothing when it is off
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-        entries = []
         try:
             with open(wishlist_path, encoding='utf-8') as f:
                 for line_num, line in enumerate(f, 1):
                     line = line.strip()
                     # Skip empty lines and comments
-                    if line and not line.startswith('#'):
-                        entries.append(line)
-                        logger.debug(f"Added wishlist entry from line {line_num}: {line}")
+                    if line and line[0] != '#':
+                        if debug:
+                            logger.debug("Added wishlist entry from line %d: %s", line_num, line)
+                        yield line
         except Exception as e:
-            logger.error(f"Error reading wishlist file {wishlist_path}: {e}")
+            logger.error("Error reading wishlist file %s: %s", wishlist_path, e)
             raise
 
-        logger.info(f"Found {len(entries)} entries in wishlist")
+    def read_wishlist_entries(self) -> list[str]:
+        """Read and parse wishlist entries from the file."""
+        entries = list(self.iter_wishlist_entries())
+        logger.info("Found %d entries in wishlist", len(entries))
         return entries
 
-    def build_sldl_command(self, entry: str) -> list[str]:
-        """Build the sldl command for a wishlist entry.
-
-        Args:
-            entry: The wishlist entry (URL or search term)
+    def _build_sldl_suffix(self) -> list[str]:
+        """Build the sldl arguments that follow the entry, shared by every entry.
 
         Returns:
-            List of command arguments for sldl
+            List of command arguments derived from the wishlist configuration
         """
-        # Base command with wishlist-specific config file
-        cmd = ["sldl", "-c", "/config/sldl-wishlist.conf"]
-
-        # Add the entry (URL or search term)
-        cmd.append(entry)
-
         # Override download directory to library
         download_dir = self.wishlist_config.get('download_dir', '/data/library')
-        cmd.extend(["-p", download_dir])
+        suffix = ["-p", download_dir]
 
         # Set index file location
         if self.wishlist_config.get('index_in_playlist_folder', True):
             # Use default behavior - index in playlist folder
             # slsk-batchdl will automatically place index in the playlist folder
             pass
-        else:
-            # Use a global wishlist index
-            cmd.extend(["--index-path", "/data/wishlist-index.sldl"])
+        elif not self._per_entry_index:
+            # Use a global wishlist index (per-entry indexes are added in build_sldl_command)
+            suffix.extend(["--index-path", _GLOBAL_INDEX_PATH])
 
         # Add wishlist-specific flags
         wishlist_settings = self.wishlist_config.get('settings', {})
 
         if not wishlist_settings.get('skip_existing', False):
             # Don't skip existing files - check them for better quality
-            cmd.append("--no-skip-existing")
+            suffix.append("--no-skip-existing")
 
         if wishlist_settings.get('skip_check_pref_cond', True):
             # Continue searching for preferred conditions even if file exists
-            cmd.append("--skip-check-pref-cond")
+            suffix.append("--skip-check-pref-cond")
 
         if wishlist_settings.get('desperate_search', True):
             # Use relaxed matching
-            cmd.append("--desperate")
+            suffix.append("--desperate")
 
         if wishlist_settings.get('use_ytdlp', True):
             # Enable yt-dlp fallback
-            cmd.append("--yt-dlp")
+            suffix.append("--yt-dlp")
 
         # Add timeout if specified
         search_timeout = wishlist_settings.get('search_timeout')
         if search_timeout:
-            cmd.extend(["--search-timeout", str(search_timeout)])
+            suffix.extend(["--search-timeout", str(search_timeout)])
 
         # Add max retries if specified
         max_retries = wishlist_settings.get('max_retries_per_track')
         if max_retries:
-            cmd.extend(["--max-retries", str(max_retries)])
+            suffix.extend(["--max-retries", str(max_retries)])
 
         # Enable fast search if configured
         if wishlist_settings.get('fast_search', False):
-            cmd.append("--fast-search")
+            suffix.append("--fast-search")
+
+        return suffix
+
+    def build_sldl_command(self, entry: str) -> list[str]:
+        """Build the sldl command for a wishlist entry.
 
-        logger.debug(f"Built sldl command: {' '.join(cmd)}")
+        Args:
+            entry: The wishlist entry (URL or search term)
+
+        Returns:
+            List of command arguments for sldl
+        """
+        cmd = [*self._sldl_prefix, entry, *self._sldl_suffix]
+        if self._per_entry_index:
+            # Named after the entry so the same entry reuses its index across runs
+            digest = hashlib.sha1(entry.encode('utf-8')).hexdigest()[:12]
+            cmd.extend(["--index-path", f"/data/wishlist-index-{digest}.sldl"])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Built sldl command: %s", ' '.join(cmd))
         return cmd
 
+    def _connect_sldl_container(self):
+        """Connect to the sldl container through the Docker SDK.
+
+        Returns:
+            Tuple of (client, container), or (None, None) to fall back to the docker CLI
+        """
+        # A whole batch runs as one exec, so the client gets no timeout at all
+        return connect_sldl_container(None, logger)
+
+    def _exec_sldl(self, cmd: list[str], entry: str, timeout: float | None = None) -> tuple[int, deque]:
+        """Run an sldl command inside the sldl container, streaming its output.
+
+        Args:
+            cmd: sldl command arguments
+            entry: Wishlist entry being processed, used to label the output
+            timeout: Seconds to wait for the command, defaults to the per-entry timeout
+
+        Returns:
+            Tuple of (return code, last lines of combined stdout/stderr)
+
+        Raises:
+            subprocess.TimeoutExpired: If the command ran longer than the timeout
+        """
+        return exec_sldl(self._sldl_container, self._docker_prefix, cmd, entry, timeout or _ENTRY_TIMEOUT, logger)
+
     def process_wishlist_entry(self, entry: str) -> bool:
         """Process a single wishlist entry.
 
@@ -147,50 +272,94 @@ class WishlistProcessor:
         Returns:
             True if successful, False otherwise
         """
-        logger.info(f"Processing wishlist entry: {entry}")
+        logger.info("Processing wishlist entry: %s", entry)
 
         try:
             # Build the command
             cmd = self.build_sldl_command(entry)
 
             # Execute via docker
-            docker_cmd = [
-                "docker", "exec", "-i", "sldl"
-            ] + cmd
-
-            logger.info(f"Executing: {' '.join(docker_cmd)}")
-
-            # Run the command
-            result = subprocess.run(
-                docker_cmd,
-                capture_output=True,
-                text=True,
-                timeout=3600  # 1 hour timeout per entry
-            )
-
-            if result.returncode == 0:
-                logger.info(f"Successfully processed wishlist entry: {entry}")
-                if result.stdout:
-                    logger.info(f"Command output: {result.stdout}")
+            docker_cmd = self._docker_prefix + cmd
+
+            # Only pay for quoting the command line when it is actually logged
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Executing: %s", shlex.join(docker_cmd))
+
+            # Run the command; output is logged line by line while it runs
+            returncode, tail = self._exec_sldl(cmd, entry)
+
+            if returncode == 0:
+                logger.info("Successfully processed wishlist entry: %s", entry)
                 return True
             else:
-                logger.error(f"Failed to process wishlist entry: {entry}")
-                logger.error(f"Return code: {result.returncode}")
-                logger.error(f"Error output: {result.stderr}")
-                logger.error(f"Standard output: {result.stdout}")
-                logger.error(f"Command executed: {' '.join(docker_cmd)}")
+                logger.error("Failed to process wishlist entry: %s", entry)
+                logger.error("Return code: %s", returncode)
+                logger.error("Last %d lines of output:\n%s", len(tail), "\n".join(tail))
+                logger.error("Command executed: %s", shlex.join(docker_cmd))
                 return False
 
         except subprocess.TimeoutExpired:
-            logger.error(f"Timeout processing wishlist entry: {entry}")
+            logger.error("Timeout processing wishlist entry: %s", entry)
             return False
         except Exception as e:
-            logger.error(f"Error processing wishlist entry {entry}: {e}")
+            logger.error("Error processing wishlist entry %s: %s", entry, e)
             return False
 
-    def process_all_entries(self) -> dict[str, Any]:
+    def process_wishlist_batch(self, entries: list[str]) -> bool:
+        """Process every wishlist entry with a single sldl invocation.
+
+        The entries are written to a list file in the config directory, which
+        the sldl container sees under /config, and passed to sldl as list
+        input. This saves a docker exec and an sldl startup and login per entry.
+
+        Args:
+            entries: The wishlist entries to process
+
+        Returns:
+            True if sldl completed successfully, False otherwise
+        """
+        logger.info("Processing %d wishlist entries in one batch", len(entries))
+
+        batch_path = self.config_manager.config_dir / _BATCH_FILE_NAME
+        try:
+            batch_path.write_text("".join(f"{_list_line(entry)}\n" for entry in entries), encoding='utf-8')
+
+            cmd = [*self.build_sldl_command(f"/config/{_BATCH_FILE_NAME}"), "--input-type", "list"]
+            docker_cmd = self._docker_prefix + cmd
+
+            # Only pay for quoting the command line when it is actually logged
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Executing: %s", shlex.join(docker_cmd))
+
+            # The batch gets the same time budget as running the entries one by one
+            returncode, tail = self._exec_sldl(cmd, "batch", timeout=_ENTRY_TIMEOUT * len(entries))
+
+            if returncode == 0:
+                logger.info("Successfully processed %d wishlist entries", len(entries))
+                return True
+            else:
+                logger.error("Failed to process wishlist batch")
+                logger.error("Return code: %s", returncode)
+                logger.error("Last %d lines of output:\n%s", len(tail), "\n".join(tail))
+                logger.error("Command executed: %s", shlex.join(docker_cmd))
+                return False
+
+        except subprocess.TimeoutExpired:
+            logger.error("Timeout processing wishlist batch")
+            return False
+        except Exception as e:
+            logger.error("Error processing wishlist batch: %s", e)
+            return False
+        finally:
+            batch_path.unlink(missing_ok=True)
+
+    def process_all_entries(self, verbose_results: bool = False) -> dict[str, Any]:
         """Process all entries in the wishlist.
 
+        Args:
+            verbose_results: Include a per-entry ``{'entry', 'success'}`` list under
+                ``results``. Otherwise ``results`` is empty and only the counts are set.
+
         Returns:
             Dictionary with processing results
         """
@@ -198,39 +367,46 @@ class WishlistProcessor:
             logger.info("Wishlist processing is disabled")
             return {'status': 'disabled', 'processed': 0, 'failed': 0}
 
-        # Generate wishlist-specific sldl.conf before processing
-        try:
-            self.config_manager.generate_wishlist_sldl_conf()
-            logger.info("Generated wishlist-specific sldl.conf")
-        except Exception as e:
-            logger.error(f"Failed to generate wishlist sldl.conf: {e}")
-            return {'status': 'config_error', 'processed': 0, 'failed': 0}
-
         entries = self.read_wishlist_entries()
 
         if not entries:
             logger.info("No entries found in wishlist")
             return {'status': 'empty', 'processed': 0, 'failed': 0}
 
-        logger.info(f"Starting to process {len(entries)} wishlist entries")
+        # Generate wishlist-specific sldl.conf only once there is work for it
+        try:
+            self.config_manager.generate_wishlist_sldl_conf()
+            logger.info("Generated wishlist-specific sldl.conf")
+        except Exception as e:
+            logger.error("Failed to generate wishlist sldl.conf: %s", e)
+            return {'status': 'config_error', 'processed': 0, 'failed': 0}
 
-        processed = 0
-        failed = 0
-        results = []
+        logger.info("Starting to process %d wishlist entries", len(entries))
 
-        for entry in entries:
-            success = self.process_wishlist_entry(entry)
-            if success:
-                processed += 1
+        # One daemon connection for the whole run instead of a docker CLI process per entry
+        docker_client, self._sldl_container = self._connect_sldl_container()
+        try:
+            if self.wishlist_config.get('batch_mode', False):
+                # One sldl run covers every entry, so they all share its outcome
+                successes = [self.process_wishlist_batch(entries)] * len(entries)
             else:
-                failed += 1
+                successes = [False] * len(entries)
+
+                # Entries are independent sldl runs, serial unless max_concurrency opts in.
+                # Results are collected on this thread only, so no locking is needed.
+                with ThreadPoolExecutor(max_workers=min(self._max_concurrency(), len(entries))) as executor:
+                    futures = {executor.submit(self.process_wishlist_entry, entry): i for i, entry in enumerate(entries)}
+                    for future in as_completed(futures):
+                        successes[futures[future]] = future.result()
+        finally:
+            if docker_client is not None:
+                docker_client.close()
+            self._sldl_container = None
 
-            results.append({
-                'entry': entry,
-                'success': success
-            })
+        processed = sum(successes)
+        failed = len(entries) - processed
 
-        logger.info(f"Wishlist processing complete: {processed} successful, {failed} failed")
+        logger.info("Wishlist processing complete: %d successful, %d failed", processed, failed)
 
         # Show recent log summary
         self._show_log_summary()
@@ -240,7 +416,10 @@ class WishlistProcessor:
             'processed': processed,
             'failed': failed,
             'total': len(entries),
-            'results': results
+            'results': [
+                {'entry': entry, 'success': success}
+                for entry, success in zip(entries, successes, strict=True)
+            ] if verbose_results else []
         }
 
     def _show_log_summary(self):
@@ -252,11 +431,16 @@ class WishlistProcessor:
                 logger.debug("No sldl.log file found")
                 return
 
-            # Read the last 50 lines of the log file
-            with open(log_path) as f:
-                lines = f.readlines()
+            # Read only the end of the log, which grows without bound
+            with open(log_path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size == 0:
+                    return
+                f.seek(max(0, size - _LOG_TAIL_BYTES))
+                tail = f.read().decode('utf-8', errors='replace')
 
-            recent_lines = lines[-50:] if len(lines) > 50 else lines
+            # Examine the last 50 lines
+            recent_lines = tail.splitlines()[-50:]
 
             # Extract key information
             downloads = []
@@ -264,33 +448,33 @@ class WishlistProcessor:
             failed_count = 0
 
             for line in recent_lines:
-                line = line.strip()
-                if "Succeeded:" in line or "Succeded:" in line:  # Note: slsk-batchdl has a typo "Succeded"
+                m = _LOG_SUMMARY_RE.search(line)
+                if not m:
+                    continue
+                if m.lastgroup == 'ok':
                     # Extract filename from log line
                     if "\\..\\" in line:
-                        filename = line.split("\\..\\")[-1].split(" [")[0]
+                        filename = line.split("\\..\\")[-1].split(" [")[0].strip()
                         downloads.append(f"✅ {filename}")
                         completed_count += 1
-                elif "Failed:" in line or "SearchAndDownloadException" in line:
+                elif m.lastgroup == 'fail':
                     failed_count += 1
-                elif "Completed:" in line and "succeeded" in line:
+                else:
                     # Extract final summary
-                    parts = line.split("Completed: ")
-                    if len(parts) > 1:
-                        summary = parts[1]
-                        logger.info(f"📊 Final summary: {summary}")
+                    summary = line[m.end():].strip()
+                    logger.info("📊 Final summary: %s", summary)
 
             # Show recent downloads
             if downloads:
                 logger.info("🎵 Recent successful downloads:")
                 for download in downloads[-10:]:  # Show last 10 downloads
-                    logger.info(f"   {download}")
+                    logger.info("   %s", download)
 
             if completed_count > 0 or failed_count > 0:
-                logger.info(f"📈 Session stats: {completed_count} succeeded, {failed_count} failed")
+                logger.info("📈 Session stats: %d succeeded, %d failed", completed_count, failed_count)
 
         except Exception as e:
-            logger.debug(f"Could not read log summary: {e}")
+            logger.debug("Could not read log summary: %s", e)
 
 
 def main():
@@ -305,18 +489,24 @@ def main():
 
     args = parser.parse_args()
 
-    # Setup logging
+    # Setup logging. sldl output is logged line by line, so those records are
+    # buffered and written in batches; progress, warnings and errors are
+    # written out immediately along with anything buffered before them.
     log_level = logging.DEBUG if args.verbose else logging.INFO
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    log_buffer = _ProgressFlushingHandler(
+        capacity=_LOG_BUFFER_RECORDS, flushLevel=logging.WARNING, target=stream_handler
     )
+    logging.basicConfig(level=log_level, handlers=[log_buffer])
 
     try:
         config_manager = ConfigManager(args.config)
         processor = WishlistProcessor(config_manager)
 
         results = processor.process_all_entries()
+        # Write out the run's logs before the summary that follows them
+        log_buffer.flush()
 
         print(f"Wishlist processing {results['status']}")
         if results['status'] == 'completed':
@@ -324,7 +514,7 @@ def main():
             print(f"Failed: {results['failed']}/{results['total']}")
 
     except Exception as e:
-        logger.error(f"Error in wishlist processing: {e}")
+        logger.error("Error in wishlist processing: %s", e)
         exit(1)
 
 
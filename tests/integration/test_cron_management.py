@@ -75,6 +75,16 @@ class TestCronManagement(unittest.TestCase):
         except ImportError:
             self.skipTest("Schedule module not available")
 
+    @patch('subprocess.run', side_effect=OSError("crontab not installed"))
+    def test_crontab_writing_cleans_up_on_error(self, mock_subprocess):
+        """Test the temp file is removed even when crontab can't be run."""
+        from toolcrate.cli.schedule import update_crontab
+
+        self.assertFalse(update_crontab(self.test_cron_content))
+
+        temp_file = mock_subprocess.call_args[0][0][1]
+        self.assertFalse(Path(temp_file).exists())
+
     @patch('toolcrate.cli.schedule.get_current_crontab')
     def test_toolcrate_job_removal(self, mock_get_crontab):
         """Test removing existing ToolCrate jobs from crontab."""
@@ -225,9 +225,10 @@ class TestQueueWorkflow(unittest.TestCase):
         except ImportError as e:
             self.fail(f"Could not import QueueProcessor: {e}")
 
+    @patch('toolcrate.queue.processor.QueueProcessor._sldl_running', return_value=True)
     @patch('toolcrate.queue.processor.QueueProcessor.read_queue_entries')
     @patch('toolcrate.queue.processor.QueueProcessor.process_queue_entry')
-    def test_queue_processor_handles_urls(self, mock_process_entry, mock_read_entries):
+    def test_queue_processor_handles_urls(self, mock_process_entry, mock_read_entries, mock_sldl_running):
         """Test that queue processor handles URLs properly."""
         # Mock reading entries
         mock_read_entries.return_value = [
@@ -1,5 +1,6 @@
 """Tests for mount path change detection and container rebuilding."""
 
+import os
 import tempfile
 from pathlib import Path
 from unittest.mock import patch
@@ -40,6 +41,12 @@ class TestMountDetection:
         import shutil
         shutil.rmtree(self.temp_dir)
 
+    def _make_config_newer(self):
+        """Backdate docker-compose.yml so the config counts as edited after it."""
+        docker_compose_path = self.config_dir / "docker-compose.yml"
+        config_mtime = (self.config_dir / "toolcrate.yaml").stat().st_mtime_ns
+        os.utime(docker_compose_path, ns=(config_mtime, config_mtime - 1_000_000_000))
+
     def test_generate_docker_compose(self):
         """Test docker-compose.yml generation."""
         self.config_manager.generate_docker_compose()
@@ -181,3 +188,35 @@ class TestMountDetection:
 
             print_calls = [str(call) for call in mock_print.call_args_list]
             assert any("Warning: Could not stop containers" in call for call in print_calls)
+
+    def test_mount_changed_in_one_service_only(self):
+        """A stale mount in any service triggers a rebuild."""
+        self.config_manager.generate_docker_compose()
+
+        docker_compose_path = self.config_dir / "docker-compose.yml"
+        content = docker_compose_path.read_text()
+        # Only the first (toolcrate) service keeps the old data mount
+        docker_compose_path.write_text(content.replace("- ./data:/data", "- ./old-data:/data", 1))
+        self._make_config_newer()
+
+        with patch('builtins.print') as mock_print, \
+             patch('subprocess.run'):
+            self.config_manager.check_mount_changes()
+
+            print_calls = [str(call) for call in mock_print.call_args_list]
+            assert any("Mount paths changed" in call for call in print_calls)
+
+    def test_mount_check_skips_read_when_compose_newer(self):
+        """No file read happens when docker-compose.yml is newer than the config."""
+        self.config_manager.generate_docker_compose()
+        docker_compose_path = self.config_dir / "docker-compose.yml"
+        config_mtime = (self.config_dir / "toolcrate.yaml").stat().st_mtime_ns
+        os.utime(docker_compose_path, ns=(config_mtime, config_mtime + 1_000_000_000))
+
+        with patch('builtins.print') as mock_print, \
+             patch('builtins.open') as mock_open:
+            self.config_manager.check_mount_changes()
+
+            mock_open.assert_not_called()
+            print_calls = [str(call) for call in mock_print.call_args_list]
+            assert any("Mount paths unchanged (by mtime)" in call for call in print_calls)
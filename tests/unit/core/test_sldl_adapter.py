@@ -2,6 +2,8 @@
 from pathlib import Path
 
 from toolcrate.core.sldl_adapter import (
+    has_index,
+    iter_index_file,
     parse_index_csv,
     parse_progress_line,
 )
@@ -20,6 +22,55 @@ def test_parse_index_csv_returns_one_row_per_track():
     assert rows[1].failure_reason == "NoSuitableFileFound"
 
 
+def test_parse_index_csv_resolves_columns_from_header():
+    text = (
+        "filepath,artist,album,title,length,tracktype,state,failurereason\n"
+        "/m/a.mp3,Daft Punk,Discovery,One More Time,320,0,1,\n"
+        ",Daft Punk,,Around the World,,0,2,NoSuitableFileFound\n"
+    )
+    rows = parse_index_csv(text)
+    assert [(r.artist, r.title, r.length_sec, r.state) for r in rows] == [
+        ("Daft Punk", "One More Time", 320, "downloaded"),
+        ("Daft Punk", "Around the World", None, "failed"),
+    ]
+    assert rows[1].failure_reason == "NoSuitableFileFound"
+
+
+def test_parse_index_csv_header_matched_in_any_case():
+    text = (
+        "\n"
+        "filePath,Artist,Album,TITLE,Length,TrackType,State,FailureReason\n"
+        "/m/a.mp3,Daft Punk,Discovery,One More Time,320,0,1,\n"
+    )
+    rows = parse_index_csv(text)
+    assert [(r.file_path, r.title, r.state) for r in rows] == [
+        ("/m/a.mp3", "One More Time", "downloaded"),
+    ]
+
+
+def test_parse_index_csv_without_header_keeps_first_row():
+    text = "/m/a.mp3,Daft Punk,One More Time,320,0,1,\n"
+    assert [r.title for r in parse_index_csv(text)] == ["One More Time"]
+
+
+def test_iter_index_file_streams_same_rows():
+    path = FIX / "sldl_index_sample.csv"
+    assert list(iter_index_file(str(path))) == parse_index_csv(path.read_text())
+
+
+def test_iter_index_file_missing_yields_nothing(tmp_path):
+    assert list(iter_index_file(str(tmp_path / "index.sldl"))) == []
+
+
+def test_has_index(tmp_path):
+    path = tmp_path / "index.sldl"
+    assert not has_index(str(path))
+    path.write_text("")
+    assert not has_index(str(path))
+    path.write_text(",A,B,1,1,2,NoSuitableFileFound\n")
+    assert has_index(str(path))
+
+
 def test_parse_progress_line_searching():
     ev = parse_progress_line("Searching: Daft Punk - One More Time")
     assert ev is not None
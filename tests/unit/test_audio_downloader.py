@@ -0,0 +1,166 @@
+"""Unit tests for the yt-dlp based audio downloader."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from toolcrate.downloaders.audio import AudioDownloader, _extract_info_cached
+
+
+@pytest.fixture
+def ydl_cls():
+    """Patch YoutubeDL; every instance shares one mock context manager."""
+    _extract_info_cached.cache_clear()
+    with patch("toolcrate.downloaders.audio.YoutubeDL") as cls:
+        ydl = MagicMock()
+        cls.return_value.__enter__.return_value = ydl
+        yield cls, ydl
+    _extract_info_cached.cache_clear()
+
+
+class TestDownload:
+    def test_single_track_extracts_once(self, tmp_path, ydl_cls):
+        cls, ydl = ydl_cls
+        raw = {"title": "Song", "id": "abc"}
+        ydl.extract_info.return_value = raw
+        ydl.process_ie_result.return_value = {"title": "Song"}
+
+        result = AudioDownloader(str(tmp_path)).download("https://youtu.be/abc")
+
+        assert result == tmp_path / "Song.mp3"
+        ydl.extract_info.assert_called_once_with("https://youtu.be/abc", download=False, process=False)
+        ydl.process_ie_result.assert_called_once_with(raw, download=True)
+        assert cls.call_args_list[-1].args[0]["outtmpl"] == str(tmp_path / "%(title)s.%(ext)s")
+
+    def test_playlist_downloads_into_sanitized_directory(self, tmp_path, ydl_cls):
+        cls, ydl = ydl_cls
+        ydl.extract_info.return_value = {"title": "Best/Of: 2024!", "entries": iter([])}
+        ydl.process_ie_result.return_value = {"title": "Best/Of: 2024!", "entries": [{"id": 1}, None, {"id": 2}]}
+
+        result = AudioDownloader(str(tmp_path), concurrency=1).download("https://soundcloud.com/a/sets/b")
+
+        assert result == tmp_path / "BestOf 2024"
+        assert result.is_dir()
+
+    def test_repeated_url_extracted_once(self, tmp_path, ydl_cls):
+        _, ydl = ydl_cls
+        ydl.extract_info.return_value = {"title": "Set", "entries": iter([{"url": "u1"}])}
+        downloader = AudioDownloader(str(tmp_path))
+
+        first = downloader._extract_info("https://SoundCloud.com/a/sets/b#t=1")
+        first["entries"].clear()
+        second = downloader._extract_info("https://soundcloud.com/a/sets/b")
+
+        ydl.extract_info.assert_called_once()
+        assert second["entries"] == [{"url": "u1"}]
+
+    def test_extraction_failure_returns_none(self, tmp_path, ydl_cls):
+        _, ydl = ydl_cls
+        ydl.extract_info.side_effect = Exception("boom")
+
+        assert AudioDownloader(str(tmp_path)).download("https://www.youtube.com/watch?v=x") is None
+        ydl.process_ie_result.assert_not_called()
+
+    def test_unsupported_url(self, tmp_path, ydl_cls):
+        cls, _ = ydl_cls
+
+        assert AudioDownloader(str(tmp_path)).download("https://example.com/track") is None
+        cls.assert_not_called()
+
+    @pytest.mark.parametrize("url, method", [
+        ("https://Music.YouTube.com/watch?v=x", "download_youtube"),
+        ("youtu.be/abc", "download_youtube"),
+        ("https://m.soundcloud.com/artist/track?in=youtube.com", "download_soundcloud"),
+        ("https://on.soundcloud.com/AbCdE", "download_soundcloud"),
+    ])
+    def test_dispatches_on_host(self, tmp_path, url, method):
+        downloader = AudioDownloader(str(tmp_path))
+
+        with patch.object(downloader, method, return_value=tmp_path) as target:
+            assert downloader.download(url) == tmp_path
+
+        target.assert_called_once_with(url)
+
+    def test_platform_name_outside_host_is_unsupported(self, tmp_path, ydl_cls):
+        cls, _ = ydl_cls
+
+        assert AudioDownloader(str(tmp_path)).download("https://example.com/?ref=youtube.com") is None
+        cls.assert_not_called()
+
+    def test_lookalike_domain_is_unsupported(self, tmp_path, ydl_cls):
+        cls, _ = ydl_cls
+
+        assert AudioDownloader(str(tmp_path)).download("https://notsoundcloud.com/a/b") is None
+        cls.assert_not_called()
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("  Mix: Vol.1 / Ünïcødé — 2024 ", "Mix Vol1  Ünïcødé  2024"),
+    ("keep-these_chars", "keep-these_chars"),
+    ("?!*", ""),
+])
+def test_playlist_directory_name_sanitized(tmp_path, title, expected):
+    path = AudioDownloader(str(tmp_path))._get_output_path({"title": title, "entries": []})
+
+    assert path == tmp_path / expected
+
+
+class TestConcurrentPlaylist:
+    def test_entries_downloaded_in_pool(self, tmp_path, ydl_cls):
+        _, ydl = ydl_cls
+        ydl.extract_info.return_value = {
+            "title": "Mix",
+            "entries": [{"url": "https://youtu.be/1"}, None, {"webpage_url": "https://youtu.be/2"}],
+        }
+        ydl.download.return_value = 0
+
+        with patch("toolcrate.downloaders.audio.os.cpu_count", return_value=8):
+            downloader = AudioDownloader(str(tmp_path), concurrency=4)
+        result = downloader.download("https://www.youtube.com/playlist?list=x")
+
+        assert result == tmp_path / "Mix"
+        downloaded = sorted(call.args[0][0] for call in ydl.download.call_args_list)
+        assert downloaded == ["https://youtu.be/1", "https://youtu.be/2"]
+        ydl.process_ie_result.assert_not_called()
+
+    def test_longest_entries_submitted_first(self, tmp_path, ydl_cls):
+        _, ydl = ydl_cls
+        ydl.extract_info.return_value = {"title": "Mix", "entries": [
+            {"url": "https://youtu.be/short", "duration": 120},
+            {"url": "https://youtu.be/unknown"},
+            {"url": "https://youtu.be/long", "duration": 3600},
+        ]}
+
+        with patch("toolcrate.downloaders.audio.os.cpu_count", return_value=8), \
+                patch("toolcrate.downloaders.audio.ThreadPoolExecutor") as pool:
+            pool.return_value.__enter__.return_value.map.return_value = [True, True, True]
+            AudioDownloader(str(tmp_path), concurrency=4).download("https://www.youtube.com/playlist?list=x")
+
+        submitted = list(pool.return_value.__enter__.return_value.map.call_args.args[1])
+        assert submitted == ["https://youtu.be/long", "https://youtu.be/short", "https://youtu.be/unknown"]
+
+    def test_pooled_transcodes_are_single_threaded(self, tmp_path, ydl_cls):
+        cls, ydl = ydl_cls
+        ydl.extract_info.return_value = {"title": "Mix", "entries": [{"url": "https://youtu.be/1"}]}
+        ydl.download.return_value = 0
+
+        with patch("toolcrate.downloaders.audio.os.cpu_count", return_value=8):
+            AudioDownloader(str(tmp_path), concurrency=4).download("https://www.youtube.com/playlist?list=x")
+
+        opts = cls.call_args_list[-1].args[0]
+        assert opts["postprocessor_args"] == {"extractaudio+ffmpeg_o": ["-threads", "1"]}
+        assert opts["outtmpl"].startswith(str(tmp_path / "Mix"))
+
+    def test_all_entries_failing_returns_none(self, tmp_path, ydl_cls):
+        _, ydl = ydl_cls
+        ydl.extract_info.return_value = {"title": "Mix", "entries": [{"url": "https://youtu.be/1"}]}
+        ydl.download.side_effect = Exception("403")
+
+        with patch("toolcrate.downloaders.audio.os.cpu_count", return_value=8):
+            downloader = AudioDownloader(str(tmp_path), concurrency=4)
+
+        assert downloader.download("https://www.youtube.com/playlist?list=x") is None
+
+    def test_concurrency_capped_by_cpu_count(self, tmp_path):
+        with patch("toolcrate.downloaders.audio.os.cpu_count", return_value=2):
+            assert AudioDownloader(str(tmp_path), concurrency=16).concurrency == 2
@@ -1,6 +1,9 @@
 """Unit tests for the CLI module of toolcrate."""
 
+import subprocess
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
 from click.testing import CliRunner
 
@@ -47,6 +50,29 @@ class TestCLI(unittest.TestCase):
         self.assertIn("--help", result.output)
         self.assertIn("info", result.output)
 
+    def test_shazam_batch_reports_exit_code_per_item(self):
+        """Test the shazam-tool batch worker protocol."""
+        def fake_run(cmd, **kwargs):
+            return subprocess.CompletedProcess(cmd, 0 if cmd[2] == "good" else 4)
+
+        with patch("toolcrate.cli.main.binary_manager.find_managed", return_value=Path("/opt/shazam-tool")), \
+                patch("toolcrate.cli.main.subprocess.run", side_effect=fake_run) as run:
+            result = self.runner.invoke(main, ["shazam-tool", "batch", "download", "--analyze"], input="good\n\nbad\n")
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, "0\n4\n")
+        self.assertEqual(run.call_args_list[0].args[0], ["/opt/shazam-tool", "download", "good", "--analyze"])
+        self.assertIs(run.call_args.kwargs["stdin"], subprocess.DEVNULL)
+
+    def test_diagnose_checks_docker_on_path_without_spawning_it(self):
+        """Test the docker install check is a PATH lookup."""
+        with patch("toolcrate.cli.wrappers.shutil.which", return_value=None), \
+                patch("toolcrate.cli.main.subprocess.run") as run:
+            result = self.runner.invoke(main, ["slsk-tool", "diagnose"])
+
+        self.assertIn("Docker is not installed", result.output)
+        run.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
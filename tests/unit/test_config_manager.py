@@ -0,0 +1,341 @@
+"""Unit tests for the YAML configuration manager."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+from ruamel.yaml.representer import RepresenterError
+
+from toolcrate.config.manager import ConfigManager, _to_container_path
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Write a minimal toolcrate.yaml and return its path."""
+    path = tmp_path / "config" / "toolcrate.yaml"
+    path.parent.mkdir()
+    path.write_text(yaml.dump({
+        'slsk_batchdl': {
+            'username': 'user',
+            'password': 'secret',
+            'parent_dir': '/home/me/toolcrate/data/library',
+            'concurrent_processes': 2,
+            'fast_search': True,
+            'skip_existing': False,
+        },
+        'spotify': {'client_id': 'sid'},
+        'youtube': {'api_key': 'ykey'},
+        'wishlist': {'settings': {'desperate_search': True}},
+        'mounts': {
+            'config': {'host_path': './config'},
+            'data': {'host_path': './data'},
+        },
+    }))
+    return path
+
+
+def _age(path, seconds=10):
+    """Push path's mtime into the past so freshly written outputs look newer."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+class TestUpToDateSkip:
+    @pytest.mark.parametrize("method,filename", [
+        ("generate_sldl_conf", "sldl.conf"),
+        ("generate_wishlist_sldl_conf", "sldl-wishlist.conf"),
+        ("generate_docker_compose", "docker-compose.yml"),
+    ])
+    def test_skips_when_output_newer_than_config(self, config_file, capsys, method, filename):
+        _age(config_file)
+        getattr(ConfigManager(str(config_file)), method)()
+        output = config_file.parent / filename
+        with open(output, 'a') as f:
+            f.write("# sentinel\n")
+
+        getattr(ConfigManager(str(config_file)), method)()
+
+        assert output.read_text().endswith("# sentinel\n")
+        assert "already up to date" in capsys.readouterr().out
+
+    def test_regenerates_when_config_newer(self, config_file):
+        output = config_file.parent / "sldl.conf"
+        output.write_text("stale")
+        _age(output)
+
+        ConfigManager(str(config_file)).generate_sldl_conf()
+
+        assert "username = user" in output.read_text()
+
+    def test_force_regenerates(self, config_file):
+        _age(config_file)
+        output = config_file.parent / "sldl.conf"
+        ConfigManager(str(config_file)).generate_sldl_conf()
+        with open(output, 'a') as f:
+            f.write("# sentinel\n")
+
+        ConfigManager(str(config_file)).generate_sldl_conf(force=True)
+
+        assert "# sentinel" not in output.read_text()
+
+    def test_docker_mode_switch_regenerates(self, config_file, monkeypatch):
+        _age(config_file)
+        monkeypatch.delenv('TOOLCRATE_USE_DOCKER', raising=False)
+        ConfigManager(str(config_file)).generate_sldl_conf()
+
+        monkeypatch.setenv('TOOLCRATE_USE_DOCKER', '1')
+        ConfigManager(str(config_file)).generate_sldl_conf()
+
+        content = (config_file.parent / "sldl.conf").read_text()
+        assert "path = /data/library" in content
+
+
+class TestSaveConfig:
+    def test_round_trips_config(self, config_file):
+        manager = ConfigManager(str(config_file))
+        manager.load_config()
+        manager.config['slsk_batchdl']['username'] = 'renamed'
+
+        with pytest.warns(UserWarning):
+            manager.save_config()
+
+        assert yaml.safe_load(config_file.read_text())['slsk_batchdl']['username'] == 'renamed'
+
+    def test_update_cron_section_keeps_other_sections(self, config_file):
+        config_file.write_text(config_file.read_text() + "cron:\n  enabled: false\n")
+        manager = ConfigManager(str(config_file))
+        manager.load_config()
+
+        manager.update_cron_section({'enabled': True, 'jobs': []})
+
+        saved = yaml.safe_load(config_file.read_text())
+        assert saved['cron'] == {'enabled': True, 'jobs': []}
+        assert saved['spotify'] == {'client_id': 'sid'}
+
+
+class TestSldlConfLayouts:
+    def test_main_conf(self, config_file, monkeypatch):
+        monkeypatch.delenv('TOOLCRATE_USE_DOCKER', raising=False)
+        ConfigManager(str(config_file)).generate_sldl_conf(force=True)
+
+        content = (config_file.parent / "sldl.conf").read_text()
+        assert "path = /home/me/toolcrate/data/library\n" in content
+        assert "fast-search = true\n" in content
+        assert "no-skip-existing = true\n" in content
+        assert "desperate" not in content
+        assert "spotify-id = sid\n" in content
+
+    def test_wishlist_conf_overrides_and_explicit_booleans(self, config_file, monkeypatch):
+        monkeypatch.delenv('TOOLCRATE_USE_DOCKER', raising=False)
+        ConfigManager(str(config_file)).generate_wishlist_sldl_conf(force=True)
+
+        content = (config_file.parent / "sldl-wishlist.conf").read_text()
+        assert content.startswith("# sldl-wishlist.conf")
+        assert "path = /home/me/toolcrate/data/library\n" in content
+        assert "desperate = true\n" in content
+        assert "skip-existing = false\n" in content
+        assert "no-skip-existing" not in content
+        assert "youtube-key = ykey\n" in content
+
+
+class TestUpdateCronSection:
+    def test_preserves_comments_and_other_sections(self, tmp_path):
+        config_file = tmp_path / "toolcrate.yaml"
+        config_file.write_text(
+            "# ToolCrate settings\n"
+            "general:\n"
+            "  data_directory: \"/data\"  # quoted on purpose\n"
+            "cron:\n"
+            "  enabled: false\n"
+            "  jobs: []\n"
+            "# trailing section\n"
+            "mounts:\n"
+            "  data:\n"
+            "    host_path: ./data\n"
+        )
+        manager = ConfigManager(str(config_file))
+        manager.load_config()
+
+        manager.update_cron_section({
+            'enabled': True,
+            'jobs': [{'name': 'nightly', 'schedule': '0 2 * * *'}],
+        })
+
+        content = config_file.read_text()
+        assert content.startswith("# ToolCrate settings\n")
+        assert 'data_directory: "/data"  # quoted on purpose' in content
+        assert "  jobs:\n    - name: nightly\n" in content
+        saved = yaml.safe_load(content)
+        assert saved['cron']['enabled'] is True
+        assert saved['mounts'] == {'data': {'host_path': './data'}}
+        assert manager.config['cron']['jobs'][0]['name'] == 'nightly'
+
+    def test_adds_missing_cron_section(self, config_file):
+        manager = ConfigManager(str(config_file))
+        manager.load_config()
+
+        manager.update_cron_section({'enabled': True})
+
+        assert yaml.safe_load(config_file.read_text())['cron'] == {'enabled': True}
+
+
+    def test_failed_dump_leaves_file_intact(self, config_file):
+        original = config_file.read_text()
+        manager = ConfigManager(str(config_file))
+
+        class Unrepresentable:
+            pass
+
+        def reraise():
+            # Surface the round-trip dump's own error instead of running the fallback save
+            raise
+
+        with patch.object(manager, 'save_config', side_effect=reraise), \
+                pytest.raises(RepresenterError, match="cannot represent an object"):
+            manager.update_cron_section({'enabled': True, 'bad': Unrepresentable()})
+
+        assert config_file.read_text() == original
+        assert list(config_file.parent.iterdir()) == [config_file]
+
+        # The shared round-trip instance must still render the next update
+        manager.update_cron_section({'enabled': False})
+        assert yaml.safe_load(config_file.read_text())['cron'] == {'enabled': False}
+
+    def test_fallback_save_loads_config_first(self, config_file):
+        manager = ConfigManager(str(config_file))
+
+        with patch('toolcrate.config.manager._round_trip_yaml', side_effect=RuntimeError("no ruamel")), \
+                pytest.warns(UserWarning):
+            manager.update_cron_section({'enabled': True})
+
+        saved = yaml.safe_load(config_file.read_text())
+        assert saved['cron'] == {'enabled': True}
+        assert saved['spotify'] == {'client_id': 'sid'}
+
+
+class TestValidateConfig:
+    def _manager(self, tmp_path, config):
+        path = tmp_path / "toolcrate.yaml"
+        path.write_text(yaml.dump(config))
+        return ConfigManager(str(path))
+
+    def _complete(self, tmp_path):
+        return {
+            'general': {'data_directory': str(tmp_path)},
+            'slsk_batchdl': {'username': 'u', 'password': 'p', 'listen_port': 49998},
+            'spotify': {}, 'youtube': {}, 'wishlist': {}, 'cron': {}, 'mounts': {},
+        }
+
+    def test_valid_config(self, tmp_path, capsys):
+        assert self._manager(tmp_path, self._complete(tmp_path)).validate_config()
+        assert "Configuration is valid" in capsys.readouterr().out
+
+    def test_missing_sections_and_bad_integers(self, tmp_path, capsys):
+        config = self._complete(tmp_path)
+        del config['cron']
+        config['slsk_batchdl']['search_timeout'] = "slow"
+
+        assert not self._manager(tmp_path, config).validate_config()
+
+        out = capsys.readouterr().out
+        assert "Missing required section: cron" in out
+        assert "Field search_timeout must be an integer" in out
+
+    def test_null_integer_is_rejected(self, tmp_path, capsys):
+        config = self._complete(tmp_path)
+        config['slsk_batchdl']['concurrent_processes'] = None
+
+        assert not self._manager(tmp_path, config).validate_config()
+        assert "Field concurrent_processes must be an integer" in capsys.readouterr().out
+
+    def test_warnings_do_not_fail_validation(self, tmp_path, capsys):
+        config = self._complete(tmp_path)
+        config['slsk_batchdl'] = {}
+        config['general']['log_directory'] = str(tmp_path / "missing")
+
+        assert self._manager(tmp_path, config).validate_config()
+
+        out = capsys.readouterr().out
+        assert "Soulseek username not configured" in out
+        assert "Directory does not exist" in out
+
+
+class TestMissingPaths:
+    def test_groups_by_parent(self, tmp_path):
+        (tmp_path / "data").mkdir()
+        (tmp_path / "nested").mkdir()
+        paths = [tmp_path / "data", tmp_path / "logs", tmp_path / "nested" / "x", tmp_path / "gone" / "y"]
+
+        assert ConfigManager._missing_paths(paths) == paths[1:]
+
+    def test_dot_paths_fall_back_to_exists(self, tmp_path):
+        assert ConfigManager._missing_paths([tmp_path / ".."]) == []
+
+
+@pytest.mark.parametrize("host,container", [
+    ("/home/me/toolcrate/data/library", "/data/library"),
+    ("/home/me/toolcrate/logs/sldl.log", "/data/sldl.log"),
+    ("/config/sldl.conf", "/config/sldl.conf"),
+    ("/mnt/music/playlists", "/data/playlists"),
+])
+def test_to_container_path(host, container):
+    assert _to_container_path(host) == container
+
+
+class TestYamlImplementation:
+    def test_uses_libyaml_when_available(self):
+        from toolcrate.config.manager import _safe_dumper, _safe_loader
+
+        assert _safe_loader(yaml) is getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        assert _safe_dumper(yaml) is getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+    def test_falls_back_to_pure_python(self, monkeypatch):
+        from toolcrate.config.manager import _safe_dumper, _safe_loader
+
+        monkeypatch.delattr(yaml, 'CSafeLoader', raising=False)
+        monkeypatch.delattr(yaml, 'CSafeDumper', raising=False)
+
+        assert _safe_loader(yaml) is yaml.SafeLoader
+        assert _safe_dumper(yaml) is yaml.SafeDumper
+
+
+def test_show_streams_yaml_to_stdout(config_file, monkeypatch, capsys):
+    from toolcrate.config.manager import main
+
+    monkeypatch.setattr('sys.argv', ['toolcrate-config', '--config', str(config_file), 'show'])
+    main()
+
+    out = capsys.readouterr().out
+    assert yaml.safe_load(out) == ConfigManager(str(config_file)).load_config()
+    assert out.endswith("\n\n")
+
+
+class TestLoadConfigCache:
+    def test_unchanged_file_is_not_reparsed(self, config_file):
+        ConfigManager(str(config_file)).load_config()
+
+        with patch('toolcrate.config.manager._import_yaml') as mock_import:
+            config = ConfigManager(str(config_file)).load_config()
+
+        mock_import.assert_not_called()
+        assert config['slsk_batchdl']['username'] == 'user'
+
+    def test_callers_get_independent_copies(self, config_file):
+        first = ConfigManager(str(config_file)).load_config()
+        first['slsk_batchdl']['username'] = 'mutated'
+
+        assert ConfigManager(str(config_file)).load_config()['slsk_batchdl']['username'] == 'user'
+
+    def test_modified_file_is_reparsed(self, config_file):
+        ConfigManager(str(config_file)).load_config()
+        config_file.write_text(yaml.dump({'slsk_batchdl': {'username': 'someone-else'}}))
+
+        assert ConfigManager(str(config_file)).load_config()['slsk_batchdl']['username'] == 'someone-else'
+
+    def test_own_writes_invalidate(self, config_file):
+        manager = ConfigManager(str(config_file))
+        manager.load_config()
+        manager.update_cron_section({'enabled': True})
+
+        assert ConfigManager(str(config_file)).load_config()['cron'] == {'enabled': True}
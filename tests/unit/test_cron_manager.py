@@ -0,0 +1,221 @@
+"""Unit tests for the crontab helpers in toolcrate.scripts.cron_manager."""
+
+import os
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from toolcrate.scripts import cron_manager
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    cron_manager.reset_caches()
+    yield
+    cron_manager.reset_caches()
+
+
+class FakeCrontab:
+    """Stands in for the crontab binary, recording every invocation."""
+
+    def __init__(self, content=None):
+        self.content = content
+        self.calls = []
+
+    def __call__(self, cmd, input=None, **kwargs):
+        self.calls.append(cmd)
+        if cmd == ["crontab", "-l"]:
+            if self.content is None:
+                return subprocess.CompletedProcess(cmd, 1, stdout=b"", stderr=b"no crontab for user")
+            return subprocess.CompletedProcess(cmd, 0, stdout=self.content.encode(), stderr=b"")
+        assert cmd == ["crontab", "-"]
+        self.content = input.decode()
+        return subprocess.CompletedProcess(cmd, 0)
+
+    @property
+    def reads(self):
+        return self.calls.count(["crontab", "-l"])
+
+
+@pytest.fixture
+def crontab():
+    fake = FakeCrontab("0 2 * * * /usr/bin/backup\n")
+    with patch("toolcrate.scripts.cron_manager.subprocess.run", side_effect=fake), \
+            patch("toolcrate.scripts.cron_manager.shutil.which", return_value="/usr/bin/toolcrate"):
+        yield fake
+
+
+@pytest.fixture
+def conf(tmp_path):
+    path = tmp_path / "toolcrate.conf"
+    path.write_text("# comment\nwishlist = ~/lists/wishlist.txt\nextra=1\n")
+    return path
+
+
+class TestReadConfigFile:
+    def test_parses_and_expands_paths(self, conf):
+        config = cron_manager.read_config_file(conf)
+
+        assert config["wishlist"] == os.path.expanduser("~/lists/wishlist.txt")
+        assert config["extra"] == "1"
+        assert config["dj-sets"] == os.path.expanduser("~/Music/downloads/sldl/dj-sets.txt")
+
+    def test_parses_loose_formatting(self, tmp_path):
+        path = tmp_path / "toolcrate.conf"
+        path.write_text("  a = two words  \n# b=1\n  #c=2\n\nd = x=y\r\nno separator\nmy key=v\ne=\n")
+
+        config = cron_manager.read_config_file(path)
+
+        assert {k: config[k] for k in ("a", "d", "my key", "e")} == {"a": "two words", "d": "x=y", "my key": "v", "e": ""}
+        assert not {"b", "#b", "c", "#c", "no separator"} & config.keys()
+
+    def test_unchanged_file_is_not_reopened(self, conf):
+        first = cron_manager.read_config_file(conf)
+        first["extra"] = "mutated"
+
+        with patch("pathlib.Path.read_text", side_effect=AssertionError("re-read")):
+            second = cron_manager.read_config_file(str(conf))
+
+        assert second["extra"] == "1"
+
+    def test_changed_file_is_reparsed(self, conf):
+        cron_manager.read_config_file(conf)
+        conf.write_text("extra=22\n")
+
+        assert cron_manager.read_config_file(conf)["extra"] == "22"
+
+    def test_missing_file_uses_defaults(self, tmp_path):
+        config = cron_manager.read_config_file(tmp_path / "missing.conf")
+
+        assert config["wishlist"] == os.path.expanduser("~/Music/downloads/sldl/wishlist.txt")
+
+
+def test_find_command_path_is_cached():
+    with patch("toolcrate.scripts.cron_manager.shutil.which", return_value="/usr/bin/toolcrate") as which:
+        assert cron_manager.find_command_path("toolcrate") == "/usr/bin/toolcrate"
+        assert cron_manager.find_command_path("toolcrate") == "/usr/bin/toolcrate"
+
+        which.assert_called_once_with("toolcrate")
+
+        cron_manager.reset_caches()
+        cron_manager.find_command_path("toolcrate")
+
+    assert which.call_count == 2
+
+
+def test_project_config_walk_is_cached(tmp_path):
+    (tmp_path / "toolcrate.conf").write_text("extra=1\n")
+    nested = tmp_path / "a" / "b"
+    nested.mkdir(parents=True)
+
+    assert cron_manager._find_project_config(str(nested)) == tmp_path / "toolcrate.conf"
+    with patch("pathlib.Path.exists", side_effect=AssertionError("walked again")):
+        assert cron_manager._find_project_config(str(nested)) == tmp_path / "toolcrate.conf"
+
+
+class TestCronJobs:
+    def test_add_reads_crontab_once(self, crontab):
+        assert cron_manager.add_identify_tracks_cron("wishlist", "daily") is True
+
+        assert crontab.reads == 1
+        assert crontab.content == (
+            "0 2 * * * /usr/bin/backup\n"
+            "# toolcrate-identify-wishlist\n"
+            "0 0 * * * /usr/bin/toolcrate identify-tracks --file-type wishlist download"
+            " > /tmp/toolcrate-identify-wishlist.log 2>&1\n"
+        )
+
+    def test_install_pipes_via_stdin(self, crontab):
+        with patch("tempfile.NamedTemporaryFile", side_effect=AssertionError("temp file")):
+            assert cron_manager.add_identify_tracks_cron("dj-sets", "*/5 * * * *") is True
+
+        assert crontab.calls[-1] == ["crontab", "-"]
+        assert "*/5 * * * * /usr/bin/toolcrate identify-tracks --file-type dj-sets" in crontab.content
+
+    def test_add_existing_job_is_refused(self, crontab):
+        cron_manager.add_download_wishlist_cron()
+        crontab.calls.clear()
+
+        assert cron_manager.add_download_wishlist_cron() is False
+        assert crontab.calls == [["crontab", "-l"]]
+
+    def test_add_without_existing_crontab(self, crontab):
+        crontab.content = None
+
+        assert cron_manager.add_download_wishlist_cron("weekly") is True
+        assert crontab.content.startswith("# toolcrate-download-wishlist\n0 3 * * 0 ")
+
+    def test_remove_reads_crontab_once(self, crontab):
+        cron_manager.add_identify_tracks_cron("dj-sets")
+        crontab.calls.clear()
+
+        assert cron_manager.remove_scheduled_job("identify-tracks-dj-sets") is True
+
+        assert crontab.reads == 1
+        assert crontab.content == "0 2 * * * /usr/bin/backup\n"
+
+    def test_remove_keeps_surrounding_lines(self, crontab):
+        crontab.content = "# toolcrate-download-wishlist\n0 0 * * * toolcrate download-wishlist\n@reboot /usr/bin/up\n"
+
+        assert cron_manager.remove_scheduled_job("download-wishlist") is True
+        assert crontab.content == "@reboot /usr/bin/up\n"
+
+        crontab.content = "# toolcrate-download-wishlist\n0 0 * * * toolcrate download-wishlist\n"
+        assert cron_manager.remove_scheduled_job("download-wishlist") is True
+        assert crontab.content == ""
+
+    def test_non_utf8_crontab_round_trips(self):
+        latin1 = "0 1 * * * /usr/bin/sync ~/Musique/Café\n".encode("latin-1")
+        installed = []
+
+        def run(cmd, input=None, **kwargs):
+            if cmd == ["crontab", "-"]:
+                installed.append(input)
+            return subprocess.CompletedProcess(cmd, 0, stdout=latin1 + b"# toolcrate-download-wishlist\n30 * * * * x\n")
+
+        with patch("toolcrate.scripts.cron_manager.subprocess.run", side_effect=run):
+            assert cron_manager.remove_scheduled_job("download-wishlist") is True
+
+        assert installed == [latin1]
+
+    def test_remove_missing_job(self, crontab):
+        assert cron_manager.remove_scheduled_job("download-wishlist") is False
+        assert crontab.calls == [["crontab", "-l"]]
+
+    def test_list_without_toolcrate_jobs(self, crontab, capsys):
+        assert cron_manager.list_scheduled_jobs() is True
+
+        assert capsys.readouterr().out == "No toolcrate scheduled jobs found.\n"
+
+    def test_list_shows_toolcrate_jobs(self, crontab, capsys):
+        cron_manager.add_download_wishlist_cron()
+        capsys.readouterr()
+
+        assert cron_manager.list_scheduled_jobs() is True
+
+        out = capsys.readouterr().out
+        assert "Type: Download wishlist items" in out
+        assert "No toolcrate scheduled jobs found." not in out
+
+    def test_list_pairs_markers_with_commands(self, crontab, capsys):
+        cron_manager.add_identify_tracks_cron("wishlist", "daily")
+        cron_manager.add_download_wishlist_cron()
+        capsys.readouterr()
+
+        cron_manager.list_scheduled_jobs()
+
+        out = capsys.readouterr().out
+        assert out.count("Type: ") == 2
+        assert "Job Type (for removal): identify-tracks --file-type wishlist\nSchedule: 0 0 * * *\n" in out
+        assert "Job Type (for removal): download-wishlist\nSchedule: 30 * * * *\n" in out
+
+    def test_check_several_jobs_reads_crontab_once(self, crontab):
+        cron_manager.add_download_wishlist_cron()
+        crontab.calls.clear()
+
+        found = cron_manager.check_crontab_for_jobs(
+            ["# toolcrate-download-wishlist", "# toolcrate-identify-wishlist"])
+
+        assert found == {"# toolcrate-download-wishlist": True, "# toolcrate-identify-wishlist": False}
+        assert crontab.reads == 1
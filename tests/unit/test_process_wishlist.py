@@ -0,0 +1,229 @@
+"""Unit tests for toolcrate.scripts.process_wishlist."""
+
+import argparse
+import subprocess
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from toolcrate.scripts import process_wishlist
+from toolcrate.scripts._config import invalidate_config_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    invalidate_config_cache()
+    yield
+    invalidate_config_cache()
+
+
+class TestReadConfigFile:
+    def test_unchanged_file_is_not_reopened(self, tmp_path):
+        conf = tmp_path / "toolcrate.conf"
+        conf.write_text("dj-sets = /sets.txt\n")
+
+        assert process_wishlist.read_config_file(conf)["dj-sets"] == "/sets.txt"
+        with patch("pathlib.Path.read_text", side_effect=AssertionError("re-read")):
+            assert process_wishlist.read_config_file(conf)["dj-sets"] == "/sets.txt"
+
+    def test_changed_file_is_reparsed(self, tmp_path):
+        conf = tmp_path / "toolcrate.conf"
+        conf.write_text("dj-sets = /sets.txt\n")
+        process_wishlist.read_config_file(conf)
+
+        conf.write_text("dj-sets = /other-sets.txt\n")
+
+        assert process_wishlist.read_config_file(conf)["dj-sets"] == "/other-sets.txt"
+
+    def test_cache_shared_with_cron_manager(self, tmp_path):
+        from toolcrate.scripts import cron_manager
+
+        conf = tmp_path / "toolcrate.conf"
+        conf.write_text("dj-sets = /sets.txt\n")
+        cron_manager.read_config_file(conf)
+
+        with patch("pathlib.Path.read_text", side_effect=AssertionError("re-read")):
+            assert process_wishlist.read_config_file(conf)["dj-sets"] == "/sets.txt"
+
+
+def _local_popen(script):
+    """Popen replacement that runs a python snippet instead of toolcrate shazam-tool."""
+    real_popen = subprocess.Popen
+    calls = []
+
+    def popen(args, **kwargs):
+        calls.append((args, kwargs))
+        return real_popen([sys.executable, "-c", script], **kwargs)
+    popen.calls = calls
+    return popen
+
+
+@pytest.fixture
+def wishlist(tmp_path, monkeypatch):
+    """A two-item wishlist in a temp dir that process_file is pointed at."""
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "wishlist.txt"
+    path.write_text("# header\nfirst item\n\nsecond item\n")
+    monkeypatch.setattr(process_wishlist, "read_config_file", lambda: {"wishlist": str(path), "dj-sets": ""})
+    monkeypatch.setattr(process_wishlist.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(process_wishlist, "_batch_supported", lambda: False)
+    handlers = list(process_wishlist.logger.handlers)
+    yield path
+    # process_file attaches a per-run file handler
+    for handler in set(process_wishlist.logger.handlers) - set(handlers):
+        process_wishlist.logger.removeHandler(handler)
+        handler.close()
+
+
+def _args(**overrides):
+    return argparse.Namespace(**{"file_type": "wishlist", "command": "download", "delay": 0, "extra_args": [], **overrides})
+
+
+class TestProcessFile:
+    def test_stdout_discarded_unless_debug(self, wishlist):
+        popen = _local_popen("print('noise')")
+
+        with patch("toolcrate.scripts.process_wishlist.subprocess.Popen", side_effect=popen):
+            assert process_wishlist.process_file(_args()) == 0
+
+        assert [call[0][-1] for call in popen.calls] == ["first item", "second item"]
+        assert all(call[1]["stdout"] is subprocess.DEVNULL for call in popen.calls)
+
+    def test_stdout_streamed_to_debug_log(self, wishlist):
+        popen = _local_popen("print('line one'); print('line two')")
+
+        with patch("toolcrate.scripts.process_wishlist.subprocess.Popen", side_effect=popen), \
+                patch.object(process_wishlist, "logger") as log:
+            log.isEnabledFor.return_value = True
+            process_wishlist.process_file(_args())
+
+        log.debug.assert_any_call("Command output: line two")
+
+    def test_stderr_logged_on_failure(self, wishlist):
+        popen = _local_popen("import sys; sys.stderr.write('rate limited\\n'); sys.exit(2)")
+
+        with patch("toolcrate.scripts.process_wishlist.subprocess.Popen", side_effect=popen), \
+                patch.object(process_wishlist, "logger") as log:
+            log.isEnabledFor.return_value = False
+            process_wishlist.process_file(_args())
+
+        log.error.assert_any_call("Error: rate limited\n")
+
+    def test_progress_counts_only_items(self, wishlist):
+        with patch("toolcrate.scripts.process_wishlist.subprocess.Popen", side_effect=_local_popen("pass")), \
+                patch.object(process_wishlist, "logger") as log:
+            process_wishlist.process_file(_args())
+
+        log.info.assert_any_call("Found 2 items in wishlist")
+        log.info.assert_any_call("Processing item 2/2: second item")
+
+
+class TestAdaptiveDelay:
+    def _run(self, wishlist, monkeypatch, script, **args):
+        wishlist.write_text("one\ntwo\nthree\n")
+        sleeps = []
+        monkeypatch.setattr(process_wishlist.time, "sleep", sleeps.append)
+        with patch("toolcrate.scripts.process_wishlist.subprocess.Popen", side_effect=_local_popen(script)):
+            process_wishlist.process_file(_args(**args))
+        return sleeps
+
+    def test_no_sleep_without_throttling(self, wishlist, monkeypatch):
+        assert self._run(wishlist, monkeypatch, "print('ok')", delay=5) == []
+
+    def test_backoff_doubles_while_rate_limited(self, wishlist, monkeypatch, tmp_path):
+        # The first two calls are throttled, later ones succeed
+        counter = tmp_path / "calls"
+        script = (
+            f"import pathlib, sys\np = pathlib.Path({str(counter)!r})\n"
+            "n = int(p.read_text()) if p.exists() else 0\np.write_text(str(n + 1))\n"
+            "if n < 2:\n    sys.stderr.write('HTTP Error 429: Too Many Requests')\n    sys.exit(1)\n"
+        )
+
+        assert self._run(wishlist, monkeypatch, script, delay=5) == [5, 10]
+
+    def test_plain_failures_do_not_back_off(self, wishlist, monkeypatch):
+        assert self._run(wishlist, monkeypatch, "import sys; sys.exit('file not found')", delay=5) == []
+
+
+_FAKE_WORKER = """
+import sys
+for line in sys.stdin:
+    item = line.strip()
+    sys.stderr.write(f"tool output for {item}\\n")
+    sys.stderr.flush()
+    print(3 if item == "second item" else 0, flush=True)
+"""
+
+# Runs the real `toolcrate shazam-tool batch` command against the tool given in argv[1]
+_CLI_WORKER = """
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from toolcrate.cli.main import main
+with patch("toolcrate.cli.main.binary_manager.find_managed", return_value=Path(sys.argv[1])):
+    main(sys.argv[2:], prog_name="toolcrate")
+"""
+
+
+class TestBatchWorker:
+    def test_items_fed_to_one_worker(self, wishlist, monkeypatch):
+        monkeypatch.setattr(process_wishlist, "_batch_supported", lambda: True)
+        popen = _local_popen(_FAKE_WORKER)
+
+        with patch("toolcrate.scripts.process_wishlist.subprocess.Popen", side_effect=popen), \
+                patch.object(process_wishlist, "logger") as log:
+            log.isEnabledFor.return_value = False
+            process_wishlist.process_file(_args(extra_args=["--analyze"]))
+
+        assert [call[0] for call in popen.calls] == [["toolcrate", "shazam-tool", "batch", "download", "--analyze"]]
+        log.info.assert_any_call("Successfully processed: first item")
+        log.error.assert_any_call("Failed to process: second item")
+        log.error.assert_any_call("Error: tool output for second item\n")
+
+    def test_falls_back_when_worker_dies(self, wishlist, monkeypatch):
+        monkeypatch.setattr(process_wishlist, "_batch_supported", lambda: True)
+        wishlist.write_text("first item\nsecond item\nthird item\n")
+        real_popen = subprocess.Popen
+        started = []
+        # Answers the first item, then takes the second and exits without a status
+        dying_worker = "import sys\nsys.stdin.readline()\nprint(0, flush=True)\nsys.stdin.readline()\n"
+
+        def popen(args, **kwargs):
+            started.append(args)
+            script = dying_worker if "batch" in args else "print('ok')"
+            return real_popen([sys.executable, "-c", script], **kwargs)
+
+        with patch("toolcrate.scripts.process_wishlist.subprocess.Popen", side_effect=popen), \
+                patch.object(process_wishlist, "logger") as log:
+            log.isEnabledFor.return_value = False
+            process_wishlist.process_file(_args())
+
+        # The second item reached the worker, so it is failed rather than run again
+        assert [args[-1] for args in started] == ["download", "third item"]
+        log.info.assert_any_call("Successfully processed: first item")
+        log.error.assert_any_call("Failed to process: second item")
+        log.info.assert_any_call("Successfully processed: third item")
+
+    def test_tool_reading_stdin_does_not_stall_worker(self, tmp_path):
+        tool = tmp_path / "shazam-tool"
+        tool.write_text(f"#!{sys.executable}\nimport sys\nsys.stdin.read()\n")
+        tool.chmod(0o755)
+        real_popen = subprocess.Popen
+
+        def popen(args, **kwargs):
+            return real_popen([sys.executable, "-c", _CLI_WORKER, str(tool), *args[1:]], **kwargs)
+
+        with patch("toolcrate.scripts.process_wishlist.subprocess.Popen", side_effect=popen):
+            worker = process_wishlist._ShazamWorker("download", [], show_output=False)
+        results = []
+        runner = threading.Thread(target=lambda: results.extend(worker.run(item) for item in ("first", "second")))
+        runner.start()
+        runner.join(timeout=30)
+        try:
+            assert not runner.is_alive(), "worker stalled on a tool reading stdin"
+            assert [result.returncode for result in results] == [0, 0]
+        finally:
+            worker.proc.kill()
+            worker.close()
@@ -0,0 +1,315 @@
+"""Unit tests for the download queue processor."""
+
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from toolcrate.queue.processor import QueueProcessor
+
+
+@pytest.fixture
+def make_processor(tmp_path, monkeypatch):
+    """Build a QueueProcessor over a temporary config dir with the given queue config."""
+    def _make(queue_config=None, lines=(), sldl_running=True):
+        config_manager = MagicMock()
+        config_manager.config_dir = tmp_path
+        config_manager.config = {'queue': queue_config or {}}
+        processor = QueueProcessor(config_manager)
+        processor.queue_file_path.write_text("".join(f"{line}\n" for line in lines))
+        if sldl_running is not None:
+            # Skip the docker probe; pass None to exercise the real one
+            monkeypatch.setattr(processor, '_sldl_running', lambda: sldl_running)
+        return processor
+    return _make
+
+
+class TestProcessAllEntries:
+    def test_runs_entries_concurrently(self, make_processor):
+        processor = make_processor({'settings': {'max_concurrency': 3}}, ["a", "b", "c"])
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_entry(entry):
+            barrier.wait()  # deadlocks unless all three run at once
+            return True
+
+        with patch.object(processor, 'process_queue_entry', side_effect=fake_entry):
+            results = processor.process_all_entries()
+
+        assert results['status'] == 'completed'
+        assert results['processed'] == 3
+        assert processor.queue_file_path.read_text() == ""
+
+    def test_runs_entries_one_at_a_time_by_default(self, make_processor):
+        processor = make_processor(lines=["a", "b", "c"])
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def fake_entry(entry):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return True
+
+        with patch.object(processor, 'process_queue_entry', side_effect=fake_entry):
+            assert processor.process_all_entries()['processed'] == 3
+
+        assert peak[0] == 1
+
+    def test_results_keep_queue_order_and_failures_stay_queued(self, make_processor):
+        processor = make_processor({'settings': {'max_concurrency': 2}}, ["# comment", "slow", "bad", "fast"])
+
+        def fake_entry(entry):
+            if entry == "slow":
+                time.sleep(0.05)
+            return entry != "bad"
+
+        with patch.object(processor, 'process_queue_entry', side_effect=fake_entry):
+            results = processor.process_all_entries()
+
+        assert [r['entry'] for r in results['results']] == ["slow", "bad", "fast"]
+        assert [r['success'] for r in results['results']] == [True, False, True]
+        assert results['failed'] == 1
+        assert processor.queue_file_path.read_text() == "# comment\nbad\n"
+        backup = processor.backup_file_path.read_text()
+        assert "slow\n" in backup and "fast\n" in backup and "bad" not in backup
+
+    def test_backup_file_opened_once_per_run(self, make_processor):
+        processor = make_processor(lines=["a", "b", "c"])
+        real_open = open
+        opened = []
+
+        def tracking_open(path, *args, **kwargs):
+            opened.append(path)
+            return real_open(path, *args, **kwargs)
+
+        with patch.object(processor, 'process_queue_entry', return_value=True), \
+                patch('builtins.open', side_effect=tracking_open):
+            processor.process_all_entries()
+
+        assert opened.count(processor.backup_file_path) == 1
+        assert processor.backup_file_path.read_text().count("# Processed at") == 3
+
+    def test_backup_timestamp_format(self, make_processor):
+        processor = make_processor(lines=["a"])
+
+        with patch.object(processor, 'process_queue_entry', return_value=True):
+            processor.process_all_entries()
+
+        assert re.fullmatch(r"# Processed at \d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\na\n\n", processor.backup_file_path.read_text())
+
+    def test_backup_disabled(self, make_processor):
+        processor = make_processor({'backup_processed': False}, ["a"])
+
+        with patch.object(processor, 'process_queue_entry', return_value=True):
+            assert processor.process_all_entries()['processed'] == 1
+
+        assert not processor.backup_file_path.exists()
+
+    def test_empty_queue(self, make_processor):
+        processor = make_processor(lines=["# nothing here"])
+
+        assert processor.process_all_entries()['status'] == 'empty'
+
+
+class TestDockerProbe:
+    def test_stopped_container_leaves_queue_untouched(self, make_processor):
+        processor = make_processor(lines=["a", "b"], sldl_running=None)
+        container = _fake_container()
+        container.status = 'exited'
+
+        with patch.object(processor, '_connect_sldl_container', return_value=(MagicMock(), container)), \
+                patch.object(processor, 'process_queue_entry') as process_entry:
+            results = processor.process_all_entries()
+
+        assert results['status'] == 'docker_unavailable'
+        process_entry.assert_not_called()
+        assert processor.queue_file_path.read_text() == "a\nb\n"
+
+    @pytest.mark.parametrize("returncode, stdout, expected", [(0, "true\n", True), (0, "false\n", False), (1, "", False)])
+    def test_cli_probe(self, make_processor, returncode, stdout, expected):
+        processor = make_processor(sldl_running=None)
+        completed = subprocess.CompletedProcess([], returncode, stdout=stdout, stderr="")
+
+        with patch('toolcrate.queue.processor.subprocess.run', return_value=completed) as run:
+            assert processor._sldl_running() is expected
+
+        assert run.call_args.args[0] == ["docker", "inspect", "-f", "{{.State.Running}}", "sldl"]
+
+    def test_cli_probe_without_docker_binary(self, make_processor):
+        processor = make_processor(sldl_running=None)
+
+        with patch('toolcrate.queue.processor.subprocess.run', side_effect=FileNotFoundError("docker")):
+            assert processor._sldl_running() is False
+
+
+class TestBuildSldlCommand:
+    def test_flags_follow_entry(self, make_processor):
+        processor = make_processor({'download_dir': '/dl', 'settings': {'desperate_search': True, 'search_timeout': 30}})
+
+        assert processor.build_sldl_command("a b") == [
+            "sldl", "-c", "/config/sldl.conf", "a b", "-p", "/dl",
+            "--skip-existing", "--desperate", "--yt-dlp", "--search-timeout", "30",
+        ]
+
+    def test_returns_independent_lists(self, make_processor):
+        processor = make_processor({'settings': {'skip_existing': False, 'use_ytdlp': False}})
+
+        first = processor.build_sldl_command("x")
+        first.append("--mutated")
+
+        assert processor.build_sldl_command("y") == ["sldl", "-c", "/config/sldl.conf", "y", "-p", "/data/downloads"]
+
+
+class TestLock:
+    def test_second_acquire_fails_while_held(self, make_processor):
+        processor = make_processor()
+
+        first = processor.acquire_lock()
+        try:
+            assert first is not None
+            assert processor.is_locked()
+            assert processor.acquire_lock() is None
+            assert "Queue processing started at" in processor.lock_file_path.read_text()
+        finally:
+            processor.release_lock(first)
+
+        assert not processor.is_locked()
+
+    def test_lock_file_kept_and_reusable_after_release(self, make_processor):
+        processor = make_processor()
+
+        processor.release_lock(processor.acquire_lock())
+        assert processor.lock_file_path.exists()
+
+        second = processor.acquire_lock()
+        assert second is not None
+        processor.release_lock(second)
+        assert processor.lock_file_path.read_text().count("Queue processing started at") == 1
+
+
+class TestRemoveProcessedEntries:
+    def test_keeps_comments_blank_lines_and_unprocessed(self, make_processor):
+        processor = make_processor(lines=["# header", "", "a", "b", "  c  ", "d"])
+
+        processor.remove_processed_entries(["a", "c"])
+
+        assert processor.queue_file_path.read_text() == "# header\n\nb\nd\n"
+        assert [p.name for p in processor.queue_file_path.parent.iterdir() if p.name.startswith('.download-queue.txt.')] == []
+
+    def test_preserves_queue_file_mode(self, make_processor):
+        processor = make_processor(lines=["a", "b"])
+        processor.queue_file_path.chmod(0o664)
+
+        processor.remove_processed_entries(["a"])
+
+        assert processor.queue_file_path.stat().st_mode & 0o777 == 0o664
+
+    def test_failed_replace_leaves_queue_untouched(self, make_processor):
+        processor = make_processor(lines=["a", "b"])
+
+        with patch('toolcrate.queue.processor.os.replace', side_effect=OSError("disk full")):
+            processor.remove_processed_entries(["a"])
+
+        assert processor.queue_file_path.read_text() == "a\nb\n"
+        assert [p.name for p in processor.queue_file_path.parent.iterdir() if p.name.startswith('.download-queue.txt.')] == []
+
+
+def _fake_container(exit_code=0, chunks=()):
+    """A Docker SDK container mock whose exec streams the given byte chunks."""
+    container = MagicMock()
+    api = container.client.api
+    api.exec_create.return_value = {'Id': 'exec-1'}
+    api.exec_start.return_value = iter(chunks)
+    api.exec_inspect.return_value = {'ExitCode': exit_code}
+    return container
+
+
+def _local_popen(script):
+    """Popen replacement that runs a python snippet instead of docker exec."""
+    real_popen = subprocess.Popen
+
+    def popen(args, **kwargs):
+        return real_popen([sys.executable, '-c', script], **kwargs)
+    return popen
+
+
+class TestSldlExecution:
+    def test_uses_container_session_when_connected(self, make_processor):
+        processor = make_processor()
+        processor._sldl_container = _fake_container(chunks=[b"done\n"])
+
+        with patch('toolcrate._sldl_exec.subprocess.Popen') as popen:
+            assert processor.process_queue_entry("artist - title") is True
+
+        popen.assert_not_called()
+        cmd = processor._sldl_container.client.api.exec_create.call_args.args[1]
+        assert cmd[:2] == ["timeout", "3600"]
+        assert cmd[2:] == processor.build_sldl_command("artist - title")
+
+    def test_container_timeout_fails_entry(self, make_processor):
+        processor = make_processor()
+        processor._sldl_container = _fake_container(exit_code=124)
+
+        assert processor.process_queue_entry("slow") is False
+
+    def test_container_output_split_into_lines(self, make_processor):
+        processor = make_processor()
+        processor._sldl_container = _fake_container(exit_code=1, chunks=[b"one\ntw", b"o\n\xc3", b"\xa9"])
+
+        returncode, tail = processor._exec_sldl(["sldl"], "x")
+
+        assert returncode == 1
+        assert list(tail) == ["one", "two", "\u00e9"]
+
+    def test_failure_logs_copy_pasteable_command(self, make_processor):
+        processor = make_processor()
+        processor._sldl_container = _fake_container(exit_code=1)
+
+        with patch('toolcrate.queue.processor.logger') as log:
+            assert processor.process_queue_entry("artist - title") is False
+
+        log.error.assert_any_call("Command executed: %s", shlex.join(
+            ["docker", "exec", "-i", "sldl"] + processor.build_sldl_command("artist - title")))
+
+    def test_cli_streams_and_keeps_bounded_tail(self, make_processor):
+        processor = make_processor()
+        script = "import sys\nfor i in range(500): print(i)\nprint('oops', file=sys.stderr)\nsys.exit(3)"
+
+        with patch('toolcrate._sldl_exec.subprocess.Popen', side_effect=_local_popen(script)) as popen, \
+                patch('toolcrate.queue.processor.logger') as log:
+            returncode, tail = processor._exec_sldl(["sldl"], "x")
+
+        assert popen.call_args.args[0][:4] == ["docker", "exec", "-i", "sldl"]
+        assert returncode == 3
+        assert len(tail) == 200
+        assert tail[0] == "301" and tail[-1] == "oops"
+        log.info.assert_any_call("[%s] %s", "x", "0")
+
+    def test_cli_timeout_kills_process(self, make_processor):
+        processor = make_processor()
+
+        with patch('toolcrate.queue.processor._ENTRY_TIMEOUT', 0.2), \
+                patch('toolcrate._sldl_exec.subprocess.Popen', side_effect=_local_popen("import time; time.sleep(30)")):
+            assert processor.process_queue_entry("stuck") is False
+
+    def test_connects_once_per_batch(self, make_processor):
+        processor = make_processor(lines=["a", "b", "c"])
+        client, container = MagicMock(), _fake_container()
+
+        with patch.object(processor, '_connect_sldl_container', return_value=(client, container)) as connect:
+            results = processor.process_all_entries()
+
+        assert results['processed'] == 3
+        connect.assert_called_once_with()
+        assert container.client.api.exec_start.call_count == 3
+        client.close.assert_called_once_with()
+        assert processor._sldl_container is None
@@ -0,0 +1,29 @@
+"""Unit tests for the lazy exports of the toolcrate.scripts package."""
+
+import subprocess
+import sys
+
+import pytest
+
+import toolcrate.scripts
+
+
+def test_package_import_does_not_load_cron_manager():
+    code = (
+        "import sys, toolcrate.scripts.process_wishlist\n"
+        "assert 'toolcrate.scripts.cron_manager' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_export_resolves_to_cron_manager_function():
+    from toolcrate.scripts import cron_manager
+
+    assert toolcrate.scripts.add_identify_tracks_cron is cron_manager.add_identify_tracks_cron
+    assert 'add_identify_tracks_cron' in vars(toolcrate.scripts)
+    assert 'list_identify_tracks_crons' in dir(toolcrate.scripts)
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        _ = toolcrate.scripts.not_a_function
@@ -0,0 +1,32 @@
+"""Tests for the shared sldl container execution helpers."""
+
+import logging
+from unittest.mock import patch
+
+from toolcrate._sldl_exec import connect_sldl_container, iter_lines
+
+logger = logging.getLogger(__name__)
+
+
+class TestIterLines:
+    def test_resplits_chunks_into_lines(self):
+        assert list(iter_lines([b"one\ntw", b"o\n\xc3", b"\xa9\nlast"])) == ["one", "two", "é", "last"]
+
+    def test_no_trailing_empty_line(self):
+        assert list(iter_lines([b"a\n", b""])) == ["a"]
+
+    def test_splits_carriage_return_progress(self):
+        chunks = [b"Downloading 10%\rDownloading 55%\rDownl", b"oading 100%\r", b"\nDone\r\nnext"]
+
+        assert list(iter_lines(chunks)) == [
+            "Downloading 10%", "Downloading 55%", "Downloading 100%", "Done", "next",
+        ]
+
+    def test_trailing_carriage_return_ends_the_last_line(self):
+        assert list(iter_lines([b"a\r"])) == ["a"]
+
+
+class TestConnectSldlContainer:
+    def test_falls_back_without_docker_sdk(self):
+        with patch.dict('sys.modules', {'docker': None}):
+            assert connect_sldl_container(None, logger) == (None, None)
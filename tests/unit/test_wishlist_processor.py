@@ -0,0 +1,407 @@
+"""Unit tests for the wishlist processor."""
+
+import logging
+import logging.handlers
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from toolcrate._sldl_exec import OUTPUT_LOG_FORMAT
+from toolcrate.wishlist.processor import WishlistProcessor, _ProgressFlushingHandler
+
+
+@pytest.fixture
+def make_processor(tmp_path):
+    """Build a WishlistProcessor over a temporary wishlist with the given wishlist config."""
+    def _make(wishlist_config=None, lines=()):
+        wishlist_path = tmp_path / "wishlist.txt"
+        wishlist_path.write_text("".join(f"{line}\n" for line in lines))
+        config_manager = MagicMock()
+        config_manager.config_dir = tmp_path
+        config_manager.config = {'wishlist': {'file_path': str(wishlist_path), **(wishlist_config or {})}}
+        return WishlistProcessor(config_manager)
+    return _make
+
+
+class TestProcessAllEntries:
+    def test_runs_entries_concurrently(self, make_processor):
+        processor = make_processor({'settings': {'max_concurrency': 3}}, ["a", "b", "c"])
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_entry(entry):
+            barrier.wait()  # deadlocks unless all three run at once
+            return True
+
+        with patch.object(processor, 'process_wishlist_entry', side_effect=fake_entry), \
+                patch.object(processor, '_show_log_summary'):
+            results = processor.process_all_entries()
+
+        assert results['status'] == 'completed'
+        assert results['processed'] == 3
+
+    def test_results_keep_wishlist_order(self, make_processor):
+        processor = make_processor({'settings': {'max_concurrency': 2}}, ["# comment", "slow", "bad", "fast"])
+
+        def fake_entry(entry):
+            if entry == "slow":
+                time.sleep(0.05)
+            return entry != "bad"
+
+        with patch.object(processor, 'process_wishlist_entry', side_effect=fake_entry), \
+                patch.object(processor, '_show_log_summary'):
+            results = processor.process_all_entries(verbose_results=True)
+
+        assert [r['entry'] for r in results['results']] == ["slow", "bad", "fast"]
+        assert [r['success'] for r in results['results']] == [True, False, True]
+        assert (results['processed'], results['failed'], results['total']) == (2, 1, 3)
+
+    def test_per_entry_results_are_opt_in(self, make_processor):
+        processor = make_processor(lines=["a", "b"])
+
+        with patch.object(processor, 'process_wishlist_entry', return_value=True), \
+                patch.object(processor, '_show_log_summary'):
+            results = processor.process_all_entries()
+
+        assert results['results'] == []
+        assert (results['processed'], results['total']) == (2, 2)
+
+    def test_empty_wishlist_skips_config_generation(self, make_processor):
+        processor = make_processor(lines=["# only comments", ""])
+
+        results = processor.process_all_entries()
+
+        assert results['status'] == 'empty'
+        processor.config_manager.generate_wishlist_sldl_conf.assert_not_called()
+
+    def test_runs_entries_one_at_a_time_by_default(self, make_processor):
+        processor = make_processor(lines=["a", "b", "c"])
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def fake_entry(entry):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return True
+
+        with patch.object(processor, 'process_wishlist_entry', side_effect=fake_entry), \
+                patch.object(processor, '_show_log_summary'):
+            assert processor.process_all_entries()['processed'] == 3
+
+        assert peak[0] == 1
+
+    def test_buffered_progress_is_flushed_per_entry(self, make_processor, caplog, monkeypatch):
+        processor = make_processor(lines=["first", "second"])
+        seen = []
+        target = logging.Handler()
+        target.emit = lambda record: seen.append(record.getMessage())
+        log_buffer = _ProgressFlushingHandler(capacity=512, flushLevel=logging.WARNING, target=target)
+        log = logging.getLogger('toolcrate.wishlist.processor')
+        snapshots = {}
+
+        def fake_exec(cmd, entry):
+            log.info(OUTPUT_LOG_FORMAT, entry, "sldl output")
+            snapshots[entry] = list(seen)
+            return 0, []
+
+        caplog.set_level(logging.INFO, logger='toolcrate.wishlist.processor')
+        # Other tests' logging config may have disabled existing loggers
+        monkeypatch.setattr(log, 'disabled', False)
+        logging.getLogger().addHandler(log_buffer)
+        try:
+            with patch.object(processor, '_exec_sldl', side_effect=fake_exec), \
+                    patch.object(processor, '_show_log_summary'):
+                processor.process_all_entries()
+        finally:
+            logging.getLogger().removeHandler(log_buffer)
+
+        # sldl output waits in the buffer; the next progress record writes it out
+        assert "[first] sldl output" not in snapshots["first"]
+        assert "Processing wishlist entry: first" in snapshots["first"]
+        assert "[first] sldl output" in snapshots["second"]
+        assert "Successfully processed wishlist entry: first" in snapshots["second"]
+
+
+class TestReadEntries:
+    def test_skips_blank_lines_and_comments(self, make_processor):
+        processor = make_processor(lines=["# header", "", "  a  ", "#b", "c"])
+
+        entries = processor.iter_wishlist_entries()
+
+        assert next(entries) == "a"
+        assert list(entries) == ["c"]
+        assert processor.read_wishlist_entries() == ["a", "c"]
+
+    def test_creates_missing_wishlist_once(self, make_processor, tmp_path):
+        processor = make_processor({'file_path': 'lists/wishlist.txt'})
+        config_dir = tmp_path / "config"
+        processor.config_manager.config_dir = config_dir
+
+        path = processor.ensure_wishlist_file_exists()
+
+        assert path == tmp_path / "lists" / "wishlist.txt"
+        assert path.read_text().startswith("# ToolCrate Wishlist File\n")
+        with patch.object(type(path), 'exists') as exists:
+            assert processor.ensure_wishlist_file_exists() is path
+        exists.assert_not_called()
+
+
+class TestBuildSldlCommand:
+    def test_flags_follow_entry(self, make_processor):
+        processor = make_processor({
+            'download_dir': '/lib',
+            'index_in_playlist_folder': False,
+            'settings': {'search_timeout': 12000, 'max_retries_per_track': 50},
+        })
+
+        assert processor.build_sldl_command("a b") == [
+            "sldl", "-c", "/config/sldl-wishlist.conf", "a b", "-p", "/lib",
+            "--index-path", "/data/wishlist-index.sldl",
+            "--no-skip-existing", "--skip-check-pref-cond", "--desperate", "--yt-dlp",
+            "--search-timeout", "12000", "--max-retries", "50",
+        ]
+
+    def test_returns_independent_lists(self, make_processor):
+        processor = make_processor({'settings': {
+            'skip_existing': True, 'skip_check_pref_cond': False, 'desperate_search': False, 'use_ytdlp': False,
+        }})
+
+        first = processor.build_sldl_command("x")
+        first.append("--mutated")
+
+        assert processor.build_sldl_command("y") == [
+            "sldl", "-c", "/config/sldl-wishlist.conf", "y", "-p", "/data/library",
+        ]
+
+
+    def test_concurrent_entries_get_their_own_index(self, make_processor):
+        processor = make_processor({'index_in_playlist_folder': False, 'settings': {'max_concurrency': 2}})
+
+        a, b = processor.build_sldl_command("a"), processor.build_sldl_command("b")
+
+        assert a.count("--index-path") == b.count("--index-path") == 1
+        index_a = a[a.index("--index-path") + 1]
+        assert index_a.startswith("/data/wishlist-index-") and index_a.endswith(".sldl")
+        assert index_a != b[b.index("--index-path") + 1]
+        assert processor.build_sldl_command("a") == a
+
+    def test_batch_mode_keeps_the_global_index(self, make_processor):
+        processor = make_processor({
+            'index_in_playlist_folder': False, 'batch_mode': True, 'settings': {'max_concurrency': 2},
+        })
+
+        cmd = processor.build_sldl_command("a")
+
+        assert cmd[cmd.index("--index-path") + 1] == "/data/wishlist-index.sldl"
+
+def _local_popen(script):
+    """Popen replacement that runs a python snippet instead of docker exec."""
+    real_popen = subprocess.Popen
+
+    def popen(args, **kwargs):
+        return real_popen([sys.executable, '-c', script], **kwargs)
+    return popen
+
+
+def _fake_container(exit_code=0, chunks=()):
+    """A Docker SDK container mock whose exec streams the given byte chunks."""
+    container = MagicMock()
+    api = container.client.api
+    api.exec_create.return_value = {'Id': 'exec-1'}
+    api.exec_start.return_value = iter(chunks)
+    api.exec_inspect.return_value = {'ExitCode': exit_code}
+    return container
+
+
+class TestProcessWishlistEntry:
+    def test_streams_output_and_keeps_bounded_tail(self, make_processor):
+        processor = make_processor()
+        script = "import sys\nfor i in range(500): print(i)\nprint('oops', file=sys.stderr)\nsys.exit(3)"
+
+        with patch('toolcrate._sldl_exec.subprocess.Popen', side_effect=_local_popen(script)) as popen, \
+                patch('toolcrate.wishlist.processor.logger') as log:
+            assert processor.process_wishlist_entry("x") is False
+
+        assert popen.call_args.args[0][:4] == ["docker", "exec", "-i", "sldl"]
+        log.info.assert_any_call("[%s] %s", "x", "0")
+        log.error.assert_any_call("Return code: %s", 3)
+        tail_call = next(c for c in log.error.call_args_list if c.args[0].startswith("Last %d lines"))
+        assert tail_call.args[1] == 200
+        assert tail_call.args[2].split("\n")[-1] == "oops"
+
+    def test_failure_logs_copy_pasteable_command(self, make_processor):
+        processor = make_processor()
+
+        with patch.object(processor, '_exec_sldl', return_value=(1, [])), \
+                patch('toolcrate.wishlist.processor.logger') as log:
+            assert processor.process_wishlist_entry("artist - title") is False
+
+        log.error.assert_any_call("Command executed: %s", shlex.join(
+            ["docker", "exec", "-i", "sldl"] + processor.build_sldl_command("artist - title")))
+
+    def test_cli_output_split_into_lines(self, make_processor):
+        processor = make_processor()
+        script = "import sys\nsys.stdout.buffer.write(b'one\\r\\n\\xc3\\xa9\\nno newline')"
+
+        with patch('toolcrate._sldl_exec.subprocess.Popen', side_effect=_local_popen(script)):
+            returncode, tail = processor._exec_sldl(["sldl"], "x")
+
+        assert returncode == 0
+        assert list(tail) == ["one", "\u00e9", "no newline"]
+
+    def test_timeout_kills_process(self, make_processor):
+        processor = make_processor()
+
+        with patch('toolcrate.wishlist.processor._ENTRY_TIMEOUT', 0.2), \
+                patch('toolcrate._sldl_exec.subprocess.Popen', side_effect=_local_popen("import time; time.sleep(30)")):
+            assert processor.process_wishlist_entry("stuck") is False
+
+    def test_uses_container_session_when_connected(self, make_processor):
+        processor = make_processor()
+        processor._sldl_container = _fake_container(chunks=[b"one\ntw", b"o\n"])
+
+        with patch('toolcrate._sldl_exec.subprocess.Popen') as popen, \
+                patch('toolcrate.wishlist.processor.logger') as log:
+            assert processor.process_wishlist_entry("artist - title") is True
+
+        popen.assert_not_called()
+        cmd = processor._sldl_container.client.api.exec_create.call_args.args[1]
+        assert cmd[:2] == ["timeout", "3600"]
+        assert cmd[2:] == processor.build_sldl_command("artist - title")
+        log.info.assert_any_call("[%s] %s", "artist - title", "two")
+
+    def test_container_timeout_fails_entry(self, make_processor):
+        processor = make_processor()
+        processor._sldl_container = _fake_container(exit_code=124)
+
+        assert processor.process_wishlist_entry("slow") is False
+
+    def test_connects_once_per_run(self, make_processor):
+        processor = make_processor(lines=["a", "b", "c"])
+        client, container = MagicMock(), _fake_container()
+
+        with patch.object(processor, '_connect_sldl_container', return_value=(client, container)) as connect, \
+                patch.object(processor, '_show_log_summary'):
+            results = processor.process_all_entries()
+
+        connect.assert_called_once()
+        client.close.assert_called_once()
+        assert processor._sldl_container is None
+        assert results['processed'] == 3
+
+
+class TestBatchMode:
+    def test_runs_one_sldl_list_invocation(self, make_processor, tmp_path):
+        processor = make_processor({'batch_mode': True}, ["a", "# comment", "b"])
+        seen = {}
+
+        def fake_run(cmd, entry, timeout=None):
+            seen['cmd'] = cmd
+            seen['list'] = (tmp_path / "wishlist-batch.txt").read_text()
+            return 0, []
+
+        with patch.object(processor, '_exec_sldl', side_effect=fake_run) as run, \
+                patch.object(processor, '_show_log_summary'):
+            results = processor.process_all_entries()
+
+        run.assert_called_once()
+        assert seen['cmd'][:3] == ["sldl", "-c", "/config/sldl-wishlist.conf"]
+        assert "/config/wishlist-batch.txt" in seen['cmd']
+        assert seen['cmd'][-2:] == ["--input-type", "list"]
+        assert seen['list'] == '"a"\n"b"\n'
+        assert not (tmp_path / "wishlist-batch.txt").exists()
+        assert (results['processed'], results['failed']) == (2, 0)
+
+    def test_search_entries_are_quoted_as_one_input(self, make_processor, tmp_path):
+        processor = make_processor({'batch_mode': True}, [
+            "Artist - Title",
+            'artist:"X" album:"Y"',
+            '"Already Quoted" "format=flac"',
+        ])
+        seen = {}
+
+        def fake_run(cmd, entry, timeout=None):
+            seen['list'] = (tmp_path / "wishlist-batch.txt").read_text()
+            return 0, []
+
+        with patch.object(processor, '_exec_sldl', side_effect=fake_run), \
+                patch.object(processor, '_show_log_summary'):
+            processor.process_all_entries()
+
+        assert seen['list'].splitlines() == [
+            '"Artist - Title"',
+            '"artist:\\"X\\" album:\\"Y\\""',
+            '"Already Quoted" "format=flac"',
+        ]
+
+    def test_failed_batch_fails_every_entry(self, make_processor):
+        processor = make_processor({'batch_mode': True}, ["a", "b"])
+
+        with patch.object(processor, '_exec_sldl', return_value=(1, ["boom"])), \
+                patch.object(processor, '_show_log_summary'):
+            results = processor.process_all_entries()
+
+        assert (results['processed'], results['failed']) == (0, 2)
+
+
+class TestLogSummary:
+    def test_reads_only_the_tail_of_a_large_log(self, make_processor, tmp_path, monkeypatch):
+        processor = make_processor()
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "data").mkdir()
+        (tmp_path / "data" / "sldl.log").write_text(
+            "Failed: old\n" * 20000
+            + "Succeded: C:\\..\\Artist - Song.flac [320kbps]\n"
+            + "Completed: 1 succeeded, 0 failed\n"
+        )
+
+        with patch('toolcrate.wishlist.processor.logger') as log:
+            processor._show_log_summary()
+
+        log.info.assert_any_call("📊 Final summary: %s", "1 succeeded, 0 failed")
+        log.info.assert_any_call("   %s", "✅ Artist - Song.flac")
+        log.info.assert_any_call("📈 Session stats: %d succeeded, %d failed", 1, 48)
+
+    def test_empty_log_is_ignored(self, make_processor, tmp_path, monkeypatch):
+        processor = make_processor()
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "data").mkdir()
+        (tmp_path / "data" / "sldl.log").write_text("")
+
+        with patch('toolcrate.wishlist.processor.logger') as log:
+            processor._show_log_summary()
+
+        log.info.assert_not_called()
+
+    def test_classifies_summary_lines(self, make_processor, tmp_path, monkeypatch):
+        processor = make_processor()
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "data").mkdir()
+        (tmp_path / "data" / "sldl.log").write_text(
+            "Searching: something\n"
+            "Succeeded: X:\\..\\One.mp3\n"
+            "  Succeded: X:\\..\\Two.flac [1411kbps]  \n"
+            "Succeeded: no path separator\n"
+            "SearchAndDownloadException: nope\n"
+            "Completed: without a count\n"
+            "Completed: 2 succeeded, 1 failed\n"
+        )
+
+        with patch('toolcrate.wishlist.processor.logger') as log:
+            processor._show_log_summary()
+
+        assert [c.args[0] % c.args[1:] for c in log.info.call_args_list] == [
+            "📊 Final summary: 2 succeeded, 1 failed",
+            "🎵 Recent successful downloads:",
+            "   ✅ One.mp3",
+            "   ✅ Two.flac",
+            "📈 Session stats: 2 succeeded, 1 failed",
+        ]
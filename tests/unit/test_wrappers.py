@@ -1,5 +1,6 @@
 """Unit tests for the wrapper utility functions."""
 
+import subprocess
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -45,8 +46,8 @@ class TestWrapperUtils(unittest.TestCase):
         self.assertTrue(check_docker_image("sample-image"))
         mock_run.assert_called_once_with(
             ["docker", "image", "inspect", "sample-image"],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             check=False,
         )
 
@@ -61,8 +62,8 @@ class TestWrapperUtils(unittest.TestCase):
         self.assertFalse(check_docker_image("missing-image"))
         mock_run.assert_called_once_with(
             ["docker", "image", "inspect", "missing-image"],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             check=False,
         )
 